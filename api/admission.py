@@ -0,0 +1,160 @@
+"""어드미션 컨트롤 - 동시 실행 수 제한 + 대기열 + 세션별 직렬화
+
+- 워커당 최대 max_concurrent개의 에이전트 실행만 동시에 진행
+- 초과 요청은 최대 max_queue개까지 대기, 가득 차면 429
+- queue_timeout_seconds 안에 차례가 오지 않으면 503
+- 같은 session_id의 요청은 순서대로 하나씩 실행 (같은 thread 체크포인트 경합 방지)
+"""
+
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, List
+
+
+class AdmissionRejected(Exception):
+    """대기열 초과/대기 시간 초과로 요청 거절"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """승인된 요청 하나 - release()는 여러 번 불러도 한 번만 반납"""
+
+    def __init__(self, controller: "AdmissionController", session_id: str):
+        self.controller = controller
+        self.session_id = session_id
+        self.started_at = time.monotonic()
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self.controller._release(self)
+
+
+class AdmissionController:
+    """워커 단위 어드미션 컨트롤 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 32,
+        queue_timeout_seconds: float = 15.0,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._session_locks: Dict[str, List[Any]] = {}  # session_id → [Lock, 참조 수]
+        self._running = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = {"queue_full": 0, "timeout": 0}
+        self._wait_times: deque = deque(maxlen=256)
+        self._run_times: deque = deque(maxlen=256)
+
+    def _retry_after(self) -> int:
+        """대기열이 빠지는 데 걸릴 시간 추정 (초)"""
+        avg_run = sum(self._run_times) / len(self._run_times) if self._run_times else 5.0
+        return max(1, round(avg_run * (self._waiting + 1) / self.max_concurrent))
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        entry = self._session_locks.setdefault(session_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        return entry[0]
+
+    def _drop_session_lock(self, session_id: str):
+        entry = self._session_locks.get(session_id)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._session_locks[session_id]
+
+    @staticmethod
+    async def _acquire(primitive, deadline: float):
+        """비어 있으면 즉시(양보 없이) 획득, 아니면 deadline까지 대기"""
+        if not primitive.locked():
+            await primitive.acquire()
+            return
+        await asyncio.wait_for(primitive.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+
+    async def enter(self, session_id: str) -> Ticket:
+        """
+        실행 차례를 기다립니다. 세션 락 → 전역 슬롯 순서로 획득합니다.
+
+        Returns:
+            Ticket (실행이 끝나면 release() 호출)
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나(429) 대기 시간 초과(503)
+        """
+        queued_at = time.monotonic()
+        deadline = queued_at + self.queue_timeout_seconds
+        lock = self._session_lock(session_id)
+
+        # 바로 실행할 수 없는 요청만 대기열에 포함
+        queued = lock.locked() or self._slots.locked()
+        if queued and self._waiting >= self.max_queue:
+            self._drop_session_lock(session_id)
+            self._rejected["queue_full"] += 1
+            raise AdmissionRejected(429, "요청이 많아 대기열이 가득 찼습니다.", self._retry_after())
+        self._waiting += queued
+        lock_held = False
+        try:
+            await self._acquire(lock, deadline)
+            lock_held = True
+            await self._acquire(self._slots, deadline)
+        except asyncio.TimeoutError:
+            if lock_held:
+                lock.release()
+            self._drop_session_lock(session_id)
+            self._rejected["timeout"] += 1
+            raise AdmissionRejected(503, "서버가 바쁩니다. 잠시 후 다시 시도해주세요.", self._retry_after())
+        except BaseException:
+            if lock_held:
+                lock.release()
+            self._drop_session_lock(session_id)
+            raise
+        finally:
+            self._waiting -= queued
+
+        self._wait_times.append(time.monotonic() - queued_at)
+        self._running += 1
+        self._admitted += 1
+        return Ticket(self, session_id)
+
+    def _release(self, ticket: Ticket):
+        self._run_times.append(time.monotonic() - ticket.started_at)
+        self._running -= 1
+        self._slots.release()
+        entry = self._session_locks.get(ticket.session_id)
+        if entry is not None:
+            entry[0].release()
+        self._drop_session_lock(ticket.session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 메트릭"""
+        waits = sorted(self._wait_times)
+        return {
+            "running": self._running,
+            "queue_depth": self._waiting,
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            },
+            "limits": {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout_seconds,
+            },
+        }
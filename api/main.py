@@ -19,16 +19,58 @@ if env_file.exists():
 
 import re
 import uuid
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Optional, List
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-import json
 
-from src.agent import KoreanFoodAgent
+from src.agent import KoreanFoodAgent, get_shared_checkpointer
+from src.runtime import RunContext, get_cancel_stats
+from src.tool_budget import get_tool_budget_stats
+from src.router import get_routing_stats
+from src.services import (
+    get_page_cache, get_response_cache, get_image_blobs, get_summarizer, get_answer_cache,
+)
+from src.services.recipe_store import get_recipe_store
+from api.sessions import SessionManager
+from api.admission import AdmissionController, AdmissionRejected
+from api.streaming import GraphStream, MediaTagParser, TextCoalescer, TICK, coalesce_text, sse_event
+
+# 동기 도구(requests, Playwright)를 실행할 스레드 풀 크기
+TOOL_THREAD_POOL_SIZE = int(os.getenv("TOOL_THREAD_POOL_SIZE", "16"))
+
+# 채팅 턴 하나의 최대 시간(초). 도구는 ANSWER_RESERVE_SECONDS를 남기고 끝내야 함
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "60"))
+ANSWER_RESERVE_SECONDS = float(os.getenv("ANSWER_RESERVE_SECONDS", "15"))
+
+
+# SSE 텍스트 청크 병합 기준 (글자 수 / 최대 지연 ms)
+STREAM_COALESCE_CHARS = int(os.getenv("STREAM_COALESCE_CHARS", "64"))
+STREAM_COALESCE_MS = float(os.getenv("STREAM_COALESCE_MS", "30"))
+
 
-app = FastAPI(title="Korean Food Agent API", version="1.0.0")
+def new_run_context() -> RunContext:
+    """API 경계에서 턴 마감 시간을 정한 RunContext 생성"""
+    return RunContext.with_budget(REQUEST_DEADLINE_SECONDS, ANSWER_RESERVE_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """루프 기본 executor를 크기 제한 풀로 교체 + 유휴 세션 정리 작업 시작"""
+    executor = ThreadPoolExecutor(max_workers=TOOL_THREAD_POOL_SIZE, thread_name_prefix="tool")
+    asyncio.get_running_loop().set_default_executor(executor)
+    sweeper = asyncio.create_task(_sweep_sessions())
+    yield
+    sweeper.cancel()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Korean Food Agent API", version="1.0.0", lifespan=lifespan)
 
 # CORS 설정 - 프론트엔드에서 접근 허용
 app.add_middleware(
@@ -39,15 +81,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 세션별 에이전트 관리
-agents: dict[str, KoreanFoodAgent] = {}
+# 세션별 에이전트 관리 (유휴 TTL / 최대 세션 수 / 메모리 상한)
+sessions = SessionManager(
+    # 그래프/LLM은 공유되므로 세션 생성은 thread_id 할당 수준의 비용
+    factory=lambda session_id: KoreanFoodAgent(provider="gemini", thread_id=session_id),
+    max_sessions=int(os.getenv("SESSION_MAX_COUNT", "1000")),
+    idle_ttl_seconds=int(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800")),
+    max_total_bytes=int(os.getenv("SESSION_MAX_MEMORY_MB", "512")) * 1024 * 1024,
+)
+SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+
+# 동시 에이전트 실행 수 제한 + 대기열 (워커별)
+admission = AdmissionController(
+    max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", "8")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "32")),
+    queue_timeout_seconds=float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "15")),
+)
+
+
+async def _admit(session_id: str):
+    """실행 차례 대기 - 거절되면 Retry-After와 함께 429/503"""
+    try:
+        return await admission.enter(session_id)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
 
-def get_or_create_agent(session_id: str) -> KoreanFoodAgent:
-    """세션 ID로 에이전트 가져오거나 생성"""
-    if session_id not in agents:
-        agents[session_id] = KoreanFoodAgent(provider="gemini")
-    return agents[session_id]
+async def _sweep_sessions():
+    """유휴 세션 + 보존 기간이 지난 체크포인트/대화 이미지/레시피 주기적 정리"""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        sessions.sweep()
+        prune_expired = getattr(get_shared_checkpointer(), "prune_expired", None)
+        if prune_expired:
+            try:
+                await asyncio.to_thread(prune_expired)
+            except Exception as e:
+                print(f"[Checkpoint] 정리 실패: {e}")
+        try:
+            await asyncio.to_thread(get_image_blobs().prune_expired)
+        except Exception as e:
+            print(f"[ImageBlobs] 정리 실패: {e}")
+        try:
+            await asyncio.to_thread(get_recipe_store().prune_expired)
+        except Exception as e:
+            print(f"[RecipeStore] 정리 실패: {e}")
 
 
 class ImageData(BaseModel):
@@ -83,11 +165,42 @@ def save_base64_image(image_data: ImageData) -> str:
     return temp_file.name
 
 
+def remove_temp_files(paths: List[str]):
+    """턴에서 만든 임시 이미지 파일 삭제"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+async def _finish_cancelled_turn(agent: KoreanFoodAgent, stream: GraphStream, release):
+    """연결이 끊긴 턴 정리 - 취소된 요청 태스크 밖에서 실행"""
+    try:
+        await stream.aclose()
+        await agent.aclose_cancelled_turn()
+    except Exception as e:
+        print(f"[API] 취소된 턴 정리 실패: {e}")
+    finally:
+        release()
+
+
 class ChatResponse(BaseModel):
     response: str
     session_id: str
     map_url: Optional[str] = None
     images: list[str] = []
+    cards: list[dict] = []  # 도구가 보낸 구조화 결과 (식당 카드, 레시피 요약 등)
+    tool_outputs: list[dict] = []  # 도구별 출력 토큰 (예산 / 원본 / 최종)
+    routing: list[dict] = []  # 빠른 경로 / 모델 선택 결정
+
+
+def published_map_url(run_context: RunContext) -> Optional[str]:
+    """도구가 보낸 식당 카드 중 마지막 지도 좌표 (LLM 응답에 [MAP:] 태그가 없을 때 사용)"""
+    for event in reversed(run_context.published):
+        if event.get("type") == "restaurant_cards" and event.get("map_url"):
+            return event["map_url"]
+    return None
 
 
 def extract_media_tags(text: str) -> tuple[str, Optional[str], list[str]]:
@@ -124,12 +237,14 @@ async def root():
 async def chat(request: ChatRequest):
     """동기 채팅 API"""
     session_id = request.session_id or str(uuid.uuid4())
-    agent = get_or_create_agent(session_id)
+    ticket = await _admit(session_id)
+    agent = sessions.acquire(session_id)
+    run_context = new_run_context()
 
     try:
         # 이미지가 있으면 임시 파일로 저장하고 경로를 메시지에 추가
         message = request.message
-        temp_files = []
+        temp_files = run_context.temp_files
 
         if request.images:
             for img in request.images:
@@ -140,65 +255,129 @@ async def chat(request: ChatRequest):
             image_paths = " ".join(temp_files)
             message = f"{image_paths} {message}"
 
-        response = agent.chat(message)
+        try:
+            response = await asyncio.wait_for(
+                agent.achat(message, run_context=run_context),
+                timeout=REQUEST_DEADLINE_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            run_context.cancel()
+            await agent.aclose_cancelled_turn()
+            raise HTTPException(status_code=504, detail="응답 시간이 초과되었습니다.")
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 - 남은 도구 작업 중단
+            run_context.cancel()
+            raise
         text, map_url, images = extract_media_tags(response)
 
-        # 임시 파일 정리
-        for temp_path in temp_files:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-
         return ChatResponse(
             response=text,
             session_id=session_id,
-            map_url=map_url,
-            images=images
+            map_url=map_url or published_map_url(run_context),
+            images=images,
+            cards=list(run_context.published),
+            tool_outputs=list(run_context.tool_outputs),
+            routing=list(run_context.routing),
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # 임시 파일 정리 (도구가 만든 EXIF 보정 이미지 포함)
+        remove_temp_files(run_context.temp_files)
+        sessions.release(session_id)
+        ticket.release()
 
 
 @app.post("/chat/stream")
 async def chat_stream(request: ChatRequest):
     """스트리밍 채팅 API"""
     session_id = request.session_id or str(uuid.uuid4())
-    agent = get_or_create_agent(session_id)
+    ticket = await _admit(session_id)
+    agent = sessions.acquire(session_id)
+    run_context = new_run_context()
+    released = False
+    started = False
+
+    def release():
+        """스트림 종료 시 임시 파일 삭제 + 세션/실행 슬롯 반납"""
+        nonlocal released
+        if not released:
+            released = True
+            remove_temp_files(run_context.temp_files)
+            sessions.release(session_id)
+        ticket.release()
+
+    def release_if_not_started():
+        """generate()가 시작되기 전에 연결이 끊긴 경우 (BackgroundTask)"""
+        if not started:
+            release()
 
     # 이미지가 있으면 임시 파일로 저장
     message = request.message
-    temp_files = []
+    temp_files = run_context.temp_files
 
     if request.images:
-        for img in request.images:
-            temp_path = save_base64_image(img)
-            temp_files.append(temp_path)
+        try:
+            for img in request.images:
+                temp_path = save_base64_image(img)
+                temp_files.append(temp_path)
+        except Exception:
+            release()
+            raise
 
         # 이미지 경로를 메시지 앞에 추가
         image_paths = " ".join(temp_files)
         message = f"{image_paths} {message}"
 
-    def generate():
+    async def generate():
+        nonlocal started
+        started = True
+        # 마감 시간이 지나면 그래프 실행과 도구 작업을 취소
+        stream = GraphStream(
+            agent.astream(message, run_context=run_context),
+            timeout_seconds=REQUEST_DEADLINE_SECONDS,
+            on_timeout=run_context.cancel,
+        )
+        disconnected = False
+        coalescer = TextCoalescer(STREAM_COALESCE_CHARS, STREAM_COALESCE_MS / 1000)
+        tags = MediaTagParser()
         try:
             current_tool = None
             final_text = ""
 
             # 세션 ID 전송
-            yield f"data: {json.dumps({'type': 'session', 'session_id': session_id})}\n\n"
+            yield sse_event({'type': 'session', 'session_id': session_id})
+
+            async for item in stream:
+                # 텍스트 버퍼 flush 시점
+                if item is TICK:
+                    frame = coalescer.flush()
+                    if frame:
+                        yield frame
+                    continue
 
-            for item in agent.stream(message):
                 # 여러 stream_mode 사용 시 (mode, chunk) 튜플 형식
                 if isinstance(item, tuple) and len(item) == 2:
                     mode, chunk = item
 
-                    # Custom 이벤트 처리 (도구 진행 상황)
+                    # Custom 이벤트 처리 (도구 진행 상황 / 구조화 결과) - 버퍼를 거치지 않음
                     if mode == "custom":
-                        if isinstance(chunk, dict):
+                        if isinstance(chunk, dict) and chunk.get("type"):
+                            # publish()로 보낸 카드 - LLM 답변을 기다리지 않고 바로 전달
+                            frame = coalescer.flush()
+                            if frame:
+                                yield frame
+                            yield sse_event(chunk)
+                        elif isinstance(chunk, dict):
                             tool_name = chunk.get("tool", "")
                             status_msg = chunk.get("status", "")
                             if tool_name and status_msg:
-                                yield f"data: {json.dumps({'type': 'tool_progress', 'tool': tool_name, 'status': status_msg})}\n\n"
+                                frame = coalescer.flush()
+                                if frame:
+                                    yield frame
+                                yield sse_event({'type': 'tool_progress', 'tool': tool_name, 'status': status_msg})
                         continue
 
                     # Messages 모드일 때만 아래 로직 실행
@@ -211,43 +390,82 @@ async def chat_stream(request: ChatRequest):
                 else:
                     chunk = item
 
-                # 도구 호출 감지
-                if hasattr(chunk, 'tool_call_chunks') and chunk.tool_call_chunks:
-                    for tc in chunk.tool_call_chunks:
+                # 도구 호출 감지 (LLM 스트림은 tool_call_chunks, 빠른 경로 라우터는 완성된 tool_calls)
+                calls = getattr(chunk, 'tool_call_chunks', None) or getattr(chunk, 'tool_calls', None)
+                if calls:
+                    for tc in calls:
                         tool_name = tc.get("name", "")
                         if tool_name and tool_name != current_tool:
                             current_tool = tool_name
-                            yield f"data: {json.dumps({'type': 'tool', 'tool': tool_name, 'status': 'start'})}\n\n"
+                            frame = coalescer.flush()
+                            if frame:
+                                yield frame
+                            yield sse_event({'type': 'tool', 'tool': tool_name, 'status': 'start'})
 
                 # 도구 완료
                 elif hasattr(chunk, 'type') and chunk.type == "tool":
                     if current_tool:
-                        yield f"data: {json.dumps({'type': 'tool', 'tool': current_tool, 'status': 'done'})}\n\n"
+                        yield sse_event({'type': 'tool', 'tool': current_tool, 'status': 'done'})
                     current_tool = None
 
-                # AI 응답 텍스트
+                # AI 응답 텍스트 - 모아서 전송
                 elif hasattr(chunk, 'content') and chunk.content:
                     if not (hasattr(chunk, 'tool_calls') and chunk.tool_calls):
+                        texts = []
                         if isinstance(chunk.content, str):
-                            final_text += chunk.content
-                            yield f"data: {json.dumps({'type': 'text', 'content': chunk.content})}\n\n"
+                            texts.append(chunk.content)
                         elif isinstance(chunk.content, list):
                             for item_content in chunk.content:
                                 if isinstance(item_content, dict) and item_content.get('type') == 'text':
-                                    txt = item_content.get('text', '')
-                                    final_text += txt
-                                    yield f"data: {json.dumps({'type': 'text', 'content': txt})}\n\n"
+                                    texts.append(item_content.get('text', ''))
+                        for txt in texts:
+                            final_text += txt
+                            # [MAP:]/[IMAGE:] 태그는 본문에서 빼고 닫히는 즉시 이벤트로 전송
+                            was_pending = coalescer.pending
+                            for frame in coalesce_text(coalescer, tags, txt):
+                                yield frame
+                            if coalescer.pending and not was_pending:
+                                # 버퍼가 새로 찼을 때만 flush 타이머 예약
+                                stream.schedule_tick(coalescer.max_delay_seconds)
+
+            for frame in (coalescer.add(tags.flush()), coalescer.flush()):
+                if frame:
+                    yield frame
 
             # 최종 미디어 태그 추출 결과
             text, map_url, images = extract_media_tags(final_text)
-            yield f"data: {json.dumps({'type': 'done', 'map_url': map_url, 'images': images})}\n\n"
-
+            yield sse_event({
+                'type': 'done',
+                'map_url': map_url or published_map_url(run_context),
+                'images': images,
+                'tool_outputs': run_context.tool_outputs,
+                'routing': run_context.routing,
+            })
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # 클라이언트 연결 종료 - 그래프 실행과 남은 도구 작업(HTTP, 브라우저) 취소
+            disconnected = True
+            raise
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            frame = coalescer.flush()
+            if frame:
+                yield frame
+            yield sse_event({'type': 'error', 'message': str(e)})
+        finally:
+            if disconnected or stream.timed_out:
+                run_context.cancel()
+                # 취소된 태스크 안에서는 await할 수 없으므로 별도 태스크에서 정리 후 반납
+                asyncio.get_running_loop().create_task(
+                    _finish_cancelled_turn(agent, stream, release)
+                )
+            else:
+                await stream.aclose()
+                release()
 
     return StreamingResponse(
         generate(),
         media_type="text/event-stream",
+        background=BackgroundTask(release_if_not_started),
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -257,19 +475,52 @@ async def chat_stream(request: ChatRequest):
 @app.post("/session/clear")
 async def clear_session(session_id: str):
     """세션 초기화"""
-    if session_id in agents:
-        agents[session_id].clear_history()
+    agent = sessions.get(session_id)
+    if agent:
+        agent.clear_history()
+    else:
+        delete_thread = getattr(get_shared_checkpointer(), "delete_thread", None)
+        if delete_thread:
+            await asyncio.to_thread(delete_thread, session_id)
     return {"status": "ok", "session_id": session_id}
 
 
 @app.delete("/session/{session_id}")
 async def delete_session(session_id: str):
     """세션 삭제"""
-    if session_id in agents:
-        del agents[session_id]
+    if not sessions.delete(session_id):
+        # 다른 워커에서 만든 세션 - 영속 체크포인터에서 직접 삭제
+        delete_thread = getattr(get_shared_checkpointer(), "delete_thread", None)
+        if delete_thread:
+            await asyncio.to_thread(delete_thread, session_id)
     return {"status": "ok"}
 
 
+@app.delete("/cache/answers")
+async def invalidate_answers(tool: Optional[str] = None):
+    """답변 캐시 무효화 (tool을 주면 그 도구의 답변만, 예: search_restaurant_info)"""
+    return {"status": "ok", "invalidated": get_answer_cache().invalidate(tool)}
+
+
+@app.get("/metrics")
+async def metrics():
+    """세션/캐시 메트릭"""
+    return {
+        "sessions": sessions.stats(),
+        "admission": admission.stats(),
+        "cancellation": get_cancel_stats(),
+        "page_cache": get_page_cache().stats(),
+        "recipe_store": get_recipe_store().stats(),
+        "api_cache": get_response_cache().stats(),
+        "image_blobs": get_image_blobs().stats(),
+        "summarizer_cache": get_summarizer().cache.stats(),
+        "summarizer_endpoints": get_summarizer().pool.stats(),
+        "tool_budgets": get_tool_budget_stats(),
+        "routing": get_routing_stats(),
+        "answer_cache": get_answer_cache().stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
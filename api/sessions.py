@@ -0,0 +1,162 @@
+"""세션 관리 - 유휴 TTL, 최대 세션 수, 메모리 상한 기반 LRU 축출"""
+
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Dict, Any, List
+
+from src.agent import KoreanFoodAgent
+
+
+@dataclass
+class Session:
+    """세션 하나 (에이전트 + 사용 정보)"""
+    session_id: str
+    agent: KoreanFoodAgent
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    approx_bytes: int = 0
+    active: int = 0  # 처리 중인 요청 수 (0일 때만 축출)
+
+
+class SessionManager:
+    """세션별 에이전트 관리
+
+    - idle_ttl_seconds 동안 요청이 없으면 축출
+    - max_sessions 초과 시 가장 오래 안 쓴 세션부터 축출
+    - 세션별 대화 히스토리 메모리를 추정해서 합계가 max_total_bytes를 넘으면 축출
+    - 처리 중인 세션(active > 0)은 축출하지 않음
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], KoreanFoodAgent],
+        max_sessions: int = 1000,
+        idle_ttl_seconds: int = 1800,
+        max_total_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_total_bytes = max_total_bytes
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions: Dict[str, int] = {"idle": 0, "capacity": 0, "memory": 0}
+        self._created = 0
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def get(self, session_id: str) -> Optional[KoreanFoodAgent]:
+        """기존 세션의 에이전트 (없으면 None)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session.agent if session else None
+
+    def acquire(self, session_id: str) -> KoreanFoodAgent:
+        """요청 시작 - 세션을 가져오거나 만들고 사용 중으로 표시"""
+        self.sweep()
+        evicted: List[Session] = []
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id=session_id, agent=self.factory(session_id))
+                self._sessions[session_id] = session
+                self._created += 1
+                evicted = self._evict_lru_locked(
+                    lambda: len(self._sessions) > self.max_sessions, "capacity"
+                )
+            session.active += 1
+            session.last_access = time.time()
+            self._sessions.move_to_end(session_id)
+        self._close(evicted)
+        return session.agent
+
+    def release(self, session_id: str):
+        """요청 종료 - 메모리 추정치 갱신 후 상한 초과 시 축출"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.active = max(0, session.active - 1)
+            session.last_access = time.time()
+
+        try:
+            approx = session.agent.estimate_memory_bytes()
+        except Exception:
+            approx = session.approx_bytes
+
+        with self._lock:
+            session.approx_bytes = approx
+            evicted = self._evict_lru_locked(
+                lambda: self._total_bytes_locked() > self.max_total_bytes, "memory"
+            )
+        self._close(evicted)
+
+    def delete(self, session_id: str) -> bool:
+        """세션 삭제 (대화 히스토리도 삭제)"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session:
+            session.agent.close(forget=True)
+        return session is not None
+
+    def sweep(self) -> int:
+        """유휴 TTL이 지난 세션 축출"""
+        deadline = time.time() - self.idle_ttl_seconds
+        with self._lock:
+            expired = [
+                s for s in self._sessions.values()
+                if s.active == 0 and s.last_access < deadline
+            ]
+            for session in expired:
+                del self._sessions[session.session_id]
+            self._evictions["idle"] += len(expired)
+        self._close(expired)
+        return len(expired)
+
+    @staticmethod
+    def _close(sessions: List[Session]):
+        """축출한 세션 정리 (락 밖에서 호출 - 체크포인터 정리가 다른 요청의 세션 조회를 막지 않도록)"""
+        for session in sessions:
+            session.agent.close()
+
+    def _total_bytes_locked(self) -> int:
+        return sum(s.approx_bytes for s in self._sessions.values())
+
+    def _evict_lru_locked(self, over_limit: Callable[[], bool], reason: str) -> List[Session]:
+        """
+        over_limit()이 False가 될 때까지 오래 안 쓴 세션부터 목록에서 제거
+
+        Returns:
+            제거한 세션 (정리는 호출 측에서 락을 푼 뒤 _close()로)
+        """
+        evicted: List[Session] = []
+        for session_id in list(self._sessions):
+            if not over_limit():
+                break
+            session = self._sessions[session_id]
+            if session.active > 0:
+                continue
+            del self._sessions[session_id]
+            evicted.append(session)
+        self._evictions[reason] += len(evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """세션 메트릭"""
+        with self._lock:
+            return {
+                "live": len(self._sessions),
+                "active": sum(1 for s in self._sessions.values() if s.active > 0),
+                "created": self._created,
+                "approx_bytes": self._total_bytes_locked(),
+                "evictions": dict(self._evictions),
+                "limits": {
+                    "max_sessions": self.max_sessions,
+                    "idle_ttl_seconds": self.idle_ttl_seconds,
+                    "max_total_bytes": self.max_total_bytes,
+                },
+            }
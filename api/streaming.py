@@ -0,0 +1,268 @@
+"""SSE 스트리밍 유틸리티 - 마감 시간이 있는 그래프 스트림 + 텍스트 청크 병합 + 미디어 태그 파서"""
+
+import json
+import time
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+
+def sse_event(payload: Dict[str, Any]) -> bytes:
+    """SSE 프레임 인코딩 (한글은 \\uXXXX 대신 UTF-8 그대로 - 바이트 절반)"""
+    return b"data: " + json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n\n"
+
+
+_TEXT_FRAME_PREFIX = b'data: {"type": "text", "content": '
+_TEXT_FRAME_SUFFIX = b"}\n\n"
+
+
+def text_frame(text: str) -> bytes:
+    """text 이벤트 프레임 (고정 부분은 미리 인코딩, 내용만 직렬화)"""
+    return _TEXT_FRAME_PREFIX + json.dumps(text, ensure_ascii=False).encode("utf-8") + _TEXT_FRAME_SUFFIX
+
+
+class TextCoalescer:
+    """LLM 텍스트 청크를 모아서 한 프레임으로 전송
+
+    - 모인 글자 수가 max_chars 이상이면 바로 flush
+    - 첫 청크가 들어온 뒤 max_delay_seconds가 지나면 flush (GraphStream 틱으로 처리)
+    - 도구/진행 이벤트 전에는 호출 측에서 flush()해서 순서 유지
+    """
+
+    def __init__(self, max_chars: int = 64, max_delay_seconds: float = 0.03):
+        self.max_chars = max_chars
+        self.max_delay_seconds = max_delay_seconds
+        self._parts: List[str] = []
+        self._size = 0
+        self._first_at: Optional[float] = None
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._parts)
+
+    def add(self, text: str) -> Optional[bytes]:
+        """
+        텍스트 추가. flush 조건을 만족하면 프레임 반환
+
+        Returns:
+            전송할 프레임 또는 None (버퍼에 보관)
+        """
+        if not text:
+            return None
+        if not self._parts:
+            self._first_at = time.monotonic()
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.max_chars or self.overdue():
+            return self.flush()
+        return None
+
+    def overdue(self) -> bool:
+        return self._first_at is not None and time.monotonic() - self._first_at >= self.max_delay_seconds
+
+    def flush(self) -> Optional[bytes]:
+        """버퍼 내용을 프레임으로 반환 (비어 있으면 None)"""
+        if not self._parts:
+            return None
+        frame = text_frame("".join(self._parts))
+        self._parts.clear()
+        self._size = 0
+        self._first_at = None
+        return frame
+
+
+# 스트림에서 바로 이벤트로 분리하는 태그 / 본문에서 지우기만 하는 태그
+_MEDIA_OPENERS = ("[MAP:", "[IMAGE:")
+_DROP_TAGS = ("[검색 결과 이미지]",)
+# 여는 태그 뒤로 이 길이 안에 ']'가 없으면 태그가 아닌 것으로 보고 텍스트로 내보냄
+MAX_TAG_CHARS = 4000
+
+
+class MediaTagParser:
+    """토큰 스트림에서 [MAP:...], [IMAGE:url] 태그를 분리하는 점진적 파서
+
+    - 태그의 앞부분일 수 있는 꼬리("[", "[MA", "[IMAGE:http..." 등)는 다음 청크까지 보류
+    - 태그가 닫히는 즉시 map / image 이벤트 반환, 본문 텍스트에서는 제거
+    - extract_media_tags와 같은 규칙: 지도는 첫 태그만 사용, 이미지는 http(s) URL만
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._skip_space = False  # 지운 태그 뒤 공백이 다음 청크로 넘어온 경우
+        self.map_url: Optional[str] = None
+        self.images: List[str] = []
+
+    def feed(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        청크 하나를 처리합니다.
+
+        Returns:
+            (태그를 뺀 텍스트, 새로 닫힌 태그 이벤트 목록)
+        """
+        if self._skip_space:
+            text = text.lstrip()
+            self._skip_space = not text
+        buf = self._pending + text
+        self._pending = ""
+        out: List[str] = []
+        events: List[Dict[str, Any]] = []
+        i = 0
+        while True:
+            start = buf.find("[", i)
+            if start < 0:
+                out.append(buf[i:])
+                break
+            out.append(buf[i:start])
+            rest = buf[start:]
+
+            opener = next((o for o in _MEDIA_OPENERS if rest.startswith(o)), None)
+            if opener is None:
+                drop = next((d for d in _DROP_TAGS if rest.startswith(d)), None)
+                if drop:
+                    i = start + len(drop)
+                    while i < len(buf) and buf[i].isspace():
+                        i += 1
+                    self._skip_space = i == len(buf)
+                elif any(o.startswith(rest) for o in _MEDIA_OPENERS + _DROP_TAGS):
+                    self._pending = rest  # 태그 앞부분일 수 있음
+                    break
+                else:
+                    out.append("[")
+                    i = start + 1
+                continue
+
+            end = buf.find("]", start)
+            if end < 0:
+                if len(rest) > MAX_TAG_CHARS:
+                    out.append(rest)
+                else:
+                    self._pending = rest
+                break
+
+            value = buf[start + len(opener):end]
+            event = self._on_tag(opener, value)
+            if event is None and opener == "[IMAGE:" and not value.startswith(("http://", "https://")):
+                out.append(buf[start:end + 1])  # 이미지 URL이 아니면 본문 그대로
+            elif event:
+                events.append(event)
+            i = end + 1
+
+        return "".join(out), events
+
+    def _on_tag(self, opener: str, value: str) -> Optional[Dict[str, Any]]:
+        if opener == "[MAP:":
+            if self.map_url is None:
+                self.map_url = value
+                return {"type": "map", "map_url": value}
+            return None
+        if value.startswith(("http://", "https://")):
+            self.images.append(value)
+            return {"type": "image", "url": value}
+        return None
+
+    def flush(self) -> str:
+        """스트림 끝 - 닫히지 않은 보류 텍스트 반환"""
+        tail, self._pending = self._pending, ""
+        return tail
+
+
+def coalesce_text(coalescer: TextCoalescer, tags: MediaTagParser, text: str) -> List[bytes]:
+    """
+    LLM 텍스트 청크 하나를 전송할 프레임으로 변환
+
+    태그가 닫혔으면 그 앞까지의 텍스트를 먼저 보내고 태그 이벤트를 보냅니다.
+    (add()가 크기 기준으로 이미 만든 프레임도 버리지 않음)
+    """
+    clean, media_events = tags.feed(text)
+    frames = [coalescer.add(clean)]
+    if media_events:
+        frames.append(coalescer.flush())
+        frames.extend(sse_event(event) for event in media_events)
+    return [frame for frame in frames if frame]
+
+
+class StreamDeadlineExceeded(Exception):
+    """턴 마감 시간이 지나서 스트림을 중단함"""
+
+
+_ITEM, _END, _ERROR, _TIMEOUT, _TICK = range(5)
+
+# schedule_tick() 이후 반복에서 나오는 값 (텍스트 버퍼 flush 시점)
+TICK = object()
+
+
+class GraphStream:
+    """그래프 스트림을 별도 태스크에서 읽고, 마감 시간이 지나면 끊는 래퍼
+
+    청크마다 wait_for를 걸지 않고 타이머 하나로 마감을 처리합니다.
+    마감이 지나면 on_timeout()을 호출하고(도구 작업 취소) 그래프 태스크를 취소한 뒤
+    반복에서 StreamDeadlineExceeded를 발생시킵니다.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[Any],
+        timeout_seconds: Optional[float] = None,
+        on_timeout: Optional[Callable[[], None]] = None,
+    ):
+        self.stream = stream
+        self.timeout_seconds = timeout_seconds
+        self.on_timeout = on_timeout
+        self.timed_out = False
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._producer: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def _pump(self):
+        try:
+            async for item in self.stream:
+                self._queue.put_nowait((_ITEM, item))
+            self._queue.put_nowait((_END, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._queue.put_nowait((_ERROR, e))
+
+    def _expire(self):
+        self.timed_out = True
+        if self.on_timeout:
+            self.on_timeout()
+        if self._producer:
+            self._producer.cancel()
+        self._queue.put_nowait((_TIMEOUT, None))
+
+    def schedule_tick(self, delay: float):
+        """delay초 뒤 반복에서 TICK을 내보냄 (청크마다 타이머를 두지 않기 위함)"""
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, (_TICK, None))
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        self._producer = loop.create_task(self._pump())
+        if self.timeout_seconds:
+            self._timer = loop.call_later(self.timeout_seconds, self._expire)
+
+    async def __aiter__(self):
+        if self._producer is None:
+            self._start()
+        while True:
+            kind, value = await self._queue.get()
+            if kind == _ITEM:
+                yield value
+            elif kind == _TICK:
+                yield TICK
+            elif kind == _END:
+                return
+            elif kind == _ERROR:
+                raise value
+            else:
+                raise StreamDeadlineExceeded(f"{self.timeout_seconds}초 안에 응답을 마치지 못했습니다.")
+
+    async def aclose(self):
+        """타이머 해제 + 그래프 태스크 취소 후 종료까지 대기"""
+        if self._timer:
+            self._timer.cancel()
+        if self._producer and not self._producer.done():
+            self._producer.cancel()
+        if self._producer:
+            await asyncio.gather(self._producer, return_exceptions=True)
+        else:
+            await self.stream.aclose()
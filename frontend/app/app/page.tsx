@@ -5,7 +5,7 @@ import { ChatMessage } from '@/components/chat-message';
 import { ChatInput } from '@/components/chat-input';
 import { ThemeToggle } from '@/components/theme-toggle';
 import { streamChatMessage, clearSession, StreamEvent } from '@/lib/api';
-import type { Message } from '@/lib/types';
+import type { Message, RecipeSummary } from '@/lib/types';
 import { Loader2, Sparkles, RefreshCw } from 'lucide-react';
 import { useToast } from '@/hooks/use-toast';
 import { Toaster } from '@/components/ui/toaster';
@@ -76,6 +76,27 @@ export default function ChatPage() {
       let aiContent = '';
       let mapUrl: string | undefined;
       let aiImages: string[] = [];
+      let recipes: RecipeSummary[] | undefined;
+
+      // 스트리밍 중인 AI 메시지 갱신 (없으면 생성)
+      const updateStreaming = (patch: Partial<Message>) => {
+        setMessages((prev) => {
+          const existing = prev.find((m) => m.id === 'ai-streaming');
+          if (existing) {
+            return prev.map((m) => (m.id === 'ai-streaming' ? { ...m, ...patch } : m));
+          }
+          return [
+            ...prev,
+            {
+              id: 'ai-streaming',
+              role: 'assistant' as const,
+              content: '',
+              timestamp: new Date(),
+              ...patch,
+            },
+          ];
+        });
+      };
 
       for await (const event of streamChatMessage(message, images)) {
         switch (event.type) {
@@ -99,30 +120,43 @@ export default function ChatPage() {
           case 'text':
             if (event.content) {
               aiContent += event.content;
-              setMessages((prev) => {
-                const existing = prev.find((m) => m.id === 'ai-streaming');
-                if (existing) {
-                  return prev.map((m) =>
-                    m.id === 'ai-streaming' ? { ...m, content: filterContent(aiContent) } : m
-                  );
-                } else {
-                  return [
-                    ...prev,
-                    {
-                      id: 'ai-streaming',
-                      role: 'assistant' as const,
-                      content: filterContent(aiContent),
-                      timestamp: new Date(),
-                    },
-                  ];
-                }
-              });
+              updateStreaming({ content: filterContent(aiContent) });
+            }
+            break;
+
+          case 'map':
+            // 태그가 닫히는 즉시 지도 표시 (답변 텍스트는 계속 스트리밍)
+            if (event.map_url) {
+              mapUrl = event.map_url;
+              updateStreaming({ mapUrl });
+            }
+            break;
+
+          case 'image':
+            if (event.url) {
+              aiImages = [...aiImages, event.url];
+              updateStreaming({ images: aiImages });
+            }
+            break;
+
+          case 'restaurant_cards':
+            // 도구가 보낸 식당 카드 - LLM 답변 전에 지도/카드 먼저 표시
+            if (event.map_url) {
+              mapUrl = event.map_url;
+              updateStreaming({ mapUrl });
+            }
+            break;
+
+          case 'recipe_summaries':
+            if (event.recipes && event.recipes.length > 0) {
+              recipes = event.recipes;
+              updateStreaming({ recipes });
             }
             break;
 
           case 'done':
-            mapUrl = event.map_url;
-            aiImages = event.images || [];
+            mapUrl = event.map_url ?? mapUrl;
+            aiImages = event.images || aiImages;
             setToolStatus('');
             break;
 
@@ -141,6 +175,7 @@ export default function ChatPage() {
             content: filterContent(aiContent),
             mapUrl,
             images: aiImages,
+            recipes,
             timestamp: new Date(),
           },
         ];
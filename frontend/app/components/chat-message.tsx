@@ -4,6 +4,7 @@ import { cn } from '@/lib/utils';
 import type { Message } from '@/lib/types';
 import { ImageGallery } from './image-gallery';
 import { RestaurantCard } from './restaurant-card';
+import { RecipeCard } from './recipe-card';
 import { MapEmbed } from './map-embed';
 import { Bot, User } from 'lucide-react';
 import ReactMarkdown from 'react-markdown';
@@ -80,6 +81,15 @@ export function ChatMessage({ message }: ChatMessageProps) {
           </div>
         )}
 
+        {/* 레시피 카드 */}
+        {message.recipes && message.recipes.length > 0 && (
+          <div className="w-full max-w-md space-y-2">
+            {message.recipes.map((recipe) => (
+              <RecipeCard key={recipe.url} recipe={recipe} />
+            ))}
+          </div>
+        )}
+
         {/* 지도 */}
         {message.mapUrl && (
           <div className="w-full max-w-md">
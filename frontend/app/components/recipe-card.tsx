@@ -0,0 +1,54 @@
+'use client';
+
+import { Clock, ExternalLink, ListOrdered, Users } from 'lucide-react';
+import { Card, CardContent } from '@/components/ui/card';
+import type { RecipeSummary } from '@/lib/types';
+
+interface RecipeCardProps {
+  recipe: RecipeSummary;
+}
+
+export function RecipeCard({ recipe }: RecipeCardProps) {
+  return (
+    <Card className="overflow-hidden border-primary/20">
+      <CardContent className="p-4 space-y-3">
+        <a
+          href={recipe.url}
+          target="_blank"
+          rel="noopener noreferrer"
+          className="flex items-start justify-between gap-2 font-bold text-foreground hover:text-primary"
+        >
+          <span className="text-balance">{recipe.name}</span>
+          <ExternalLink className="h-4 w-4 mt-1 flex-shrink-0 text-muted-foreground" />
+        </a>
+
+        <div className="flex flex-wrap gap-3 text-sm text-muted-foreground">
+          {recipe.servings && (
+            <span className="flex items-center gap-1">
+              <Users className="h-4 w-4" />
+              {recipe.servings}
+            </span>
+          )}
+          {recipe.total_time && (
+            <span className="flex items-center gap-1">
+              <Clock className="h-4 w-4" />
+              {recipe.total_time}
+            </span>
+          )}
+          {recipe.step_count > 0 && (
+            <span className="flex items-center gap-1">
+              <ListOrdered className="h-4 w-4" />
+              {recipe.step_count}단계
+            </span>
+          )}
+        </div>
+
+        {recipe.ingredients.length > 0 && (
+          <p className="text-sm text-foreground leading-relaxed pt-2 border-t border-border">
+            {recipe.ingredients.join(', ')}
+          </p>
+        )}
+      </CardContent>
+    </Card>
+  );
+}
@@ -1,4 +1,4 @@
-import type { ChatResponse } from './types';
+import type { ChatResponse, PlaceCard, RecipeSummary } from './types';
 
 // 브라우저에서 실행 시 window.location 기반으로 API URL 결정
 function getApiBaseUrl(): string {
@@ -44,13 +44,26 @@ export async function sendChatMessage(message: string): Promise<ChatResponse> {
 }
 
 export interface StreamEvent {
-  type: 'session' | 'tool' | 'tool_progress' | 'text' | 'done' | 'error';
+  type:
+    | 'session'
+    | 'tool'
+    | 'tool_progress'
+    | 'text'
+    | 'map'
+    | 'image'
+    | 'restaurant_cards'
+    | 'recipe_summaries'
+    | 'done'
+    | 'error';
   session_id?: string;
   tool?: string;
   status?: string;
   content?: string;
   map_url?: string;
+  url?: string;
   images?: string[];
+  restaurants?: PlaceCard[];
+  recipes?: RecipeSummary[];
   message?: string;
 }
 
@@ -113,14 +126,17 @@ export async function* streamChatMessage(
   }
 
   const decoder = new TextDecoder();
+  // 네트워크 청크 경계에서 잘린 줄은 다음 청크와 합쳐서 파싱
+  let buffer = '';
 
   try {
     while (true) {
       const { done, value } = await reader.read();
       if (done) break;
 
-      const chunk = decoder.decode(value, { stream: true });
-      const lines = chunk.split('\n');
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() ?? '';
 
       for (const line of lines) {
         if (line.startsWith('data: ')) {
@@ -5,6 +5,7 @@ export interface Message {
   images?: string[];
   restaurant?: RestaurantInfo;
   mapUrl?: string;
+  recipes?: RecipeSummary[];
   timestamp: Date;
 }
 
@@ -18,6 +19,26 @@ export interface RestaurantInfo {
   imageUrl?: string;
 }
 
+// 도구가 보내는 구조화 결과 (LLM 답변 전에 먼저 표시)
+export interface PlaceCard {
+  name: string;
+  address?: string;
+  phone?: string;
+  category?: string;
+  place_url?: string;
+  lat?: string;
+  lng?: string;
+}
+
+export interface RecipeSummary {
+  name: string;
+  url: string;
+  servings?: string;
+  total_time?: string;
+  ingredients: string[];
+  step_count: number;
+}
+
 export interface ChatRequest {
   message: string;
   session_id?: string;
@@ -28,4 +49,5 @@ export interface ChatResponse {
   session_id: string;
   map_url?: string;
   images?: string[];
+  cards?: Record<string, unknown>[];
 }
@@ -15,7 +15,14 @@ from typing import List, Dict, Any
 # 프로젝트 루트 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from langchain_core.messages import ToolMessage
+
 from src.agent import KoreanFoodAgent
+from src.config import settings
+from src.services import get_page_cache
+from src.services.answer_cache import get_answer_cache
+from src.services.recipe_store import get_recipe_store
+from src.services.response_cache import get_response_cache
 from src.services.summarizer import get_summarizer, LocalSummarizer
 
 
@@ -49,7 +56,11 @@ def run_single_benchmark(
 ) -> BenchmarkResult:
     """단일 벤치마크 실행"""
 
-    summarizer = get_summarizer() if use_summarizer else None
+    # 압축 단계는 그래프 안에서 get_summarizer()를 쓰므로 싱글톤의 enabled로 전환
+    get_summarizer().enabled = use_summarizer
+
+    config = agent._get_config()
+    before = len(agent.agent.get_state(config).values.get("messages", []))
 
     # 시간 측정 시작
     start_total = time.time()
@@ -59,6 +70,23 @@ def run_single_benchmark(
 
     total_latency = (time.time() - start_total) * 1000
 
+    # 이번 턴 도구 결과 크기 (압축 단계가 response_metadata에 기록)
+    messages = agent.agent.get_state(config).values.get("messages", [])[before:]
+    tool_result_length = 0
+    summarized_length = 0
+    summarizer_latency = 0.0
+    for message in messages:
+        if not isinstance(message, ToolMessage):
+            continue
+        info = message.response_metadata.get("compression")
+        if info:
+            tool_result_length += info["original_chars"]
+            summarized_length += info["compressed_chars"]
+            summarizer_latency += info["latency_ms"]
+        else:
+            tool_result_length += len(str(message.content))
+            summarized_length += len(str(message.content))
+
     # 결과 생성
     return BenchmarkResult(
         test_name=test_name,
@@ -66,15 +94,29 @@ def run_single_benchmark(
         mode="with_summarizer" if use_summarizer else "baseline",
         total_latency_ms=total_latency,
         tool_latency_ms=0,  # TODO: 도구별 측정 추가 필요
-        summarizer_latency_ms=0,  # TODO: 요약 시간 측정 추가 필요
+        summarizer_latency_ms=summarizer_latency,
         llm_latency_ms=0,  # TODO: LLM 호출 시간 측정 추가 필요
-        tool_result_length=0,
-        summarized_length=0,
-        compression_ratio=1.0,
+        tool_result_length=tool_result_length,
+        summarized_length=summarized_length,
+        compression_ratio=summarized_length / tool_result_length if tool_result_length else 1.0,
         response_preview=response[:200] + "..." if len(response) > 200 else response,
     )
 
 
+def disable_caches():
+    """
+    답변/페이지/API 응답 캐시와 레시피 저장소를 끕니다.
+
+    두 번째 패스가 첫 번째 패스와 같은 질문을 반복하므로, 캐시가 켜져 있으면
+    요약 단계 대신 캐시 적중 시간을 재게 됩니다 (이전 실행의 디스크 캐시도 마찬가지).
+    """
+    settings.answer_cache_enabled = False
+    get_answer_cache().invalidate()
+    get_page_cache().enabled = False
+    get_response_cache().enabled = False
+    get_recipe_store().enabled = False
+
+
 def run_benchmark_suite():
     """벤치마크 스위트 실행"""
 
@@ -92,11 +134,13 @@ def run_benchmark_suite():
 
     results: List[BenchmarkResult] = []
 
+    # 두 패스 모두 매번 도구/LLM을 실제로 호출하도록 캐시 끔
+    disable_caches()
+
     # Baseline (요약 없음)
     print("\n[1/2] Baseline 테스트 (요약 없음)")
     print("-" * 40)
 
-    os.environ["ENABLE_LOCAL_SUMMARIZER"] = "false"
     agent_baseline = KoreanFoodAgent(provider="gemini")
 
     for test_name, query in test_cases:
@@ -116,10 +160,9 @@ def run_benchmark_suite():
     print("\n[2/2] Summarizer 테스트 (로컬 LLM 요약)")
     print("-" * 40)
 
-    os.environ["ENABLE_LOCAL_SUMMARIZER"] = "true"
-
     # vLLM 서버 확인
     summarizer = get_summarizer()
+    summarizer.enabled = True
     if not summarizer.is_available():
         print("  ⚠️ vLLM 서버가 실행 중이 아닙니다. Summarizer 테스트 스킵.")
     else:
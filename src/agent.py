@@ -3,17 +3,30 @@
 import os
 import re
 import uuid
-import base64
+import asyncio
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk, SystemMessage, ToolMessage
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.graph import StateGraph, START, END
+from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from .config import settings, ModelProvider
+from .checkpoint import create_checkpointer, resolve_checkpointer
+from .runtime import RunContext, RUN_CONTEXT_KEY
+from .history import FoodAgentState, chain_hooks, image_ref_block, make_history_hook, prepare_llm_messages
+from .compression import make_compression_hook
+from .router import (
+    ROUTE_AGENT, ROUTE_CHAT, ROUTE_TOOL, TIER_FAST, TIER_STRONG, CHAT_PROMPT, ModelChoice, Route,
+    choose_model, classify, fast_path_messages, record_routing, tool_call_message,
+)
+from .services.image_blobs import get_image_blobs
+from .services.answer_cache import CachedAnswer, get_answer_cache
 from .tools import ALL_TOOLS
 
 
@@ -59,9 +72,8 @@ SYSTEM_PROMPT = """당신은 한국 음식 전문가 AI 어시스턴트입니다
 ## 응답 형식
 도구 결과에 다음 태그가 있으면, 사용자 질문에 따라 필요할 때 응답에 포함하세요:
 - [IMAGE:url]: 음식 사진이 도움될 때 응답 앞에 포함
-- [MAP:...]: 위치/맛집 질문일 때 도구 결과의 태그를 수정 없이 그대로 복사해서 응답 끝에 포함
 - 🗺️ 지도 링크: 식당별로 [카카오맵](URL) 텍스트 링크로 포함
-- 중요: 응답에서 언급한 식당 개수와 [MAP:] 태그의 식당 개수가 반드시 일치해야 함
+- 식당 카드와 지도는 화면에 자동으로 표시되므로 [MAP:] 태그나 좌표를 응답에 쓰지 마세요
 
 ## URL 사용 규칙 (매우 중요!)
 - 카카오맵 링크는 반드시 도구 결과에 있는 URL(http://place.map.kakao.com/...)만 사용
@@ -101,51 +113,205 @@ def get_llm(provider: Optional[str] = None, model_name: Optional[str] = None) ->
         raise ValueError(f"지원하지 않는 모델 제공자: {provider}")
 
 
+def get_fast_llm() -> Optional[BaseChatModel]:
+    """모델 라우팅용 빠른 모델 (FAST_MODEL이 없으면 None - 라우팅 끔)"""
+    if not settings.fast_model:
+        return None
+    return get_llm(settings.fast_model_provider, settings.fast_model)
+
+
+def _build_prompt(state: Dict[str, Any]) -> List[BaseMessage]:
+    """시스템 프롬프트 (+ 이전 대화 요약) + 히스토리 (현재 턴 이미지만 인라인으로 펼침)"""
+    system = SYSTEM_PROMPT
+    if state.get("summary"):
+        system += f"\n## 이전 대화 요약\n{state['summary']}\n"
+    return [SystemMessage(content=system)] + prepare_llm_messages(state["messages"])
+
+
+# 도구 호출 반복 한도에 가까워졌을 때 답변
+NEED_MORE_STEPS = "요청을 처리하려면 더 많은 단계가 필요합니다. 질문을 나눠서 다시 물어봐 주세요."
+
+
 def create_food_agent(
     provider: Optional[str] = None,
     model_name: Optional[str] = None,
-    checkpointer: Optional[MemorySaver] = None
+    checkpointer: Union[BaseCheckpointSaver, str, None] = None
 ):
     """
     한국 음식 에이전트를 생성합니다.
 
+    ReAct 루프(agent ↔ tools) 앞에 빠른 경로 라우터를 둡니다.
+        START → route ─ chat ──→ pre_model_hook → chat → END
+                      ├ tool ──→ tools → pre_model_hook → answer → END
+                      └ agent ─→ pre_model_hook → agent ⇄ tools
+
+    FAST_MODEL이 설정돼 있으면 LLM 호출마다 빠른 모델/이 모델(강한 모델) 중 하나를 고릅니다.
+
     Args:
         provider: 모델 제공자 (openai, gemini)
         model_name: 사용할 모델 이름
-        checkpointer: 메모리 체크포인터 (대화 히스토리 자동 관리)
+        checkpointer: 체크포인터 인스턴스 또는 종류 ("memory", "sqlite")
 
     Returns:
         LangGraph 에이전트
     """
     llm = get_llm(provider, model_name)
+    fast_llm = get_fast_llm()
+    models = {TIER_STRONG: (llm, llm.bind_tools(ALL_TOOLS), _resolve_model(provider, model_name)[1])}
+    if fast_llm is not None:
+        models[TIER_FAST] = (fast_llm, fast_llm.bind_tools(ALL_TOOLS), settings.fast_model)
+
+    def pick_model(state: Dict[str, Any], node: str, with_tools: bool = False) -> BaseChatModel:
+        """이번 호출에 쓸 모델 선택 + 기록"""
+        if fast_llm is None:
+            choice = ModelChoice(TIER_STRONG, "routing_off")
+        else:
+            choice = choose_model(
+                state, node,
+                tool_token_threshold=settings.routing_tool_token_threshold,
+                long_message_chars=settings.routing_long_message_chars,
+            )
+        chat_model, tool_model, name = models[choice.tier]
+        record_routing(node, choice.tier, choice.reason, model=name)
+        return tool_model if with_tools else chat_model
+
+    def route_turn(state: Dict[str, Any]) -> Dict[str, Any]:
+        """턴 시작 - 경로 결정 (tool이면 도구 호출 메시지를 LLM 없이 만듦)"""
+        if settings.fast_path_enabled:
+            route = classify(state["messages"][-1])
+        else:
+            route = Route(ROUTE_AGENT, reason="fast_path_off")
+        record_routing("route", route.kind, route.reason)
+        if route.kind == ROUTE_TOOL:
+            return {"route": route.kind, "messages": [tool_call_message(route)]}
+        return {"route": route.kind}
+
+    def _agent_response(state: Dict[str, Any], response: AIMessage) -> Dict[str, Any]:
+        if response.tool_calls and state.get("remaining_steps", 25) < 2:
+            return {"messages": [AIMessage(id=response.id, content=NEED_MORE_STEPS)]}
+        return {"messages": [response]}
+
+    def call_agent(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        model = pick_model(state, "agent", with_tools=True)
+        return _agent_response(state, model.invoke(_build_prompt(state), config))
+
+    async def acall_agent(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        model = pick_model(state, "agent", with_tools=True)
+        return _agent_response(state, await model.ainvoke(_build_prompt(state), config))
+
+    def _fast_input(state: Dict[str, Any]) -> List[BaseMessage]:
+        """chat: 짧은 프롬프트 / answer: 전체 응답 규칙 + 이번 턴 도구 결과"""
+        if state.get("route") == ROUTE_CHAT:
+            return fast_path_messages(CHAT_PROMPT, state["messages"], state.get("summary", ""))
+        return fast_path_messages(
+            SYSTEM_PROMPT, state["messages"], state.get("summary", ""), with_tool_results=True
+        )
 
-    agent = create_react_agent(
-        model=llm,
-        tools=ALL_TOOLS,
-        prompt=SYSTEM_PROMPT,
-        checkpointer=checkpointer,
-    )
+    def _fast_node(state: Dict[str, Any]) -> str:
+        return "chat" if state.get("route") == ROUTE_CHAT else "answer"
+
+    def call_fast(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        model = pick_model(state, _fast_node(state))
+        return {"messages": [model.invoke(_fast_input(state), config)]}
+
+    async def acall_fast(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        model = pick_model(state, _fast_node(state))
+        return {"messages": [await model.ainvoke(_fast_input(state), config)]}
+
+    def after_route(state: Dict[str, Any]) -> str:
+        return "tools" if state.get("route") == ROUTE_TOOL else "pre_model_hook"
+
+    def after_hooks(state: Dict[str, Any]) -> str:
+        return {ROUTE_CHAT: "chat", ROUTE_TOOL: "answer"}.get(state.get("route"), "agent")
+
+    graph = StateGraph(FoodAgentState)
+    graph.add_node("route", route_turn)
+    # 모델 호출 전: 긴 도구 결과 요약 → 히스토리가 예산을 넘으면 이전 턴을 요약으로 접음
+    graph.add_node("pre_model_hook", chain_hooks(
+        make_compression_hook(),
+        make_history_hook(
+            fast_llm or llm,  # 이전 대화 요약은 빠른 모델로 충분
+            token_budget=settings.history_token_budget,
+            keep_turns=settings.history_keep_turns,
+            summary_max_chars=settings.history_summary_max_chars,
+        ),
+    ))
+    graph.add_node("agent", RunnableLambda(call_agent, afunc=acall_agent, name="agent"))
+    graph.add_node("tools", ToolNode(ALL_TOOLS))
+    graph.add_node("chat", RunnableLambda(call_fast, afunc=acall_fast, name="chat"))
+    graph.add_node("answer", RunnableLambda(call_fast, afunc=acall_fast, name="answer"))
+
+    graph.add_edge(START, "route")
+    graph.add_conditional_edges("route", after_route, ["tools", "pre_model_hook"])
+    graph.add_conditional_edges("pre_model_hook", after_hooks, ["chat", "answer", "agent"])
+    graph.add_conditional_edges("agent", tools_condition, ["tools", END])
+    graph.add_edge("tools", "pre_model_hook")
+    graph.add_edge("chat", END)
+    graph.add_edge("answer", END)
+
+    return graph.compile(checkpointer=resolve_checkpointer(checkpointer))
+
+
+# (provider, model) → 컴파일된 그래프. LLM 클라이언트와 그래프는 세션 간 공유
+_shared_agents: Dict[Tuple[str, str], Any] = {}
+_shared_lock = threading.Lock()
+_shared_checkpointer: Optional[BaseCheckpointSaver] = None
+
+
+def _resolve_model(provider: Optional[str], model_name: Optional[str]) -> Tuple[str, str]:
+    """provider/model 기본값을 채운 캐시 키"""
+    provider = provider.value if isinstance(provider, ModelProvider) else provider
+    provider = provider or settings.model_provider.value
+    if not model_name:
+        model_name = settings.openai_model if provider == ModelProvider.OPENAI.value else settings.gemini_model
+    return provider, model_name
+
+
+def get_shared_checkpointer() -> BaseCheckpointSaver:
+    """모든 세션이 공유하는 체크포인터 (세션은 thread_id로 구분, CHECKPOINTER 환경 변수로 선택)"""
+    global _shared_checkpointer
+    with _shared_lock:
+        if _shared_checkpointer is None:
+            _shared_checkpointer = create_checkpointer()
+        return _shared_checkpointer
+
+
+def get_shared_agent(provider: Optional[str] = None, model_name: Optional[str] = None):
+    """
+    (provider, model)별로 한 번만 컴파일한 에이전트 그래프를 반환합니다.
 
-    return agent
+    Args:
+        provider: 모델 제공자 (openai, gemini)
+        model_name: 사용할 모델 이름
+
+    Returns:
+        공유 체크포인터를 쓰는 LangGraph 에이전트
+    """
+    key = _resolve_model(provider, model_name)
+    checkpointer = get_shared_checkpointer()
+    with _shared_lock:
+        agent = _shared_agents.get(key)
+        if agent is None:
+            agent = create_food_agent(key[0], key[1], checkpointer)
+            _shared_agents[key] = agent
+        return agent
 
 
-def load_image_as_base64(image_path: str) -> Optional[str]:
+def load_image_bytes(image_path: str) -> Optional[bytes]:
     """
-    이미지 파일을 base64로 인코딩합니다.
+    이미지 파일을 읽습니다.
 
     Args:
         image_path: 이미지 파일 경로
 
     Returns:
-        base64 인코딩된 이미지 문자열
+        이미지 바이트 (파일이 없으면 None)
     """
     if not os.path.exists(image_path):
         return None
 
     with open(image_path, "rb") as f:
-        image_data = f.read()
-
-    return base64.b64encode(image_data).decode("utf-8")
+        return f.read()
 
 
 def get_image_mime_type(image_path: str) -> str:
@@ -193,21 +359,16 @@ def create_multimodal_content(message: str, image_paths: List[str]) -> List[Dict
         image_paths: 이미지 경로 리스트
 
     Returns:
-        멀티모달 콘텐츠 리스트
+        멀티모달 콘텐츠 리스트 (이미지는 image_ref 블록 - LLM 호출 시 인라인으로 변환)
     """
     content = []
 
-    # 이미지 추가
+    # 이미지는 저장소에 한 번만 저장하고 참조만 추가 (체크포인트에 base64를 남기지 않음)
     for image_path in image_paths:
-        base64_image = load_image_as_base64(image_path)
-        if base64_image:
+        image_data = load_image_bytes(image_path)
+        if image_data:
             mime_type = get_image_mime_type(image_path)
-            content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:{mime_type};base64,{base64_image}"
-                }
-            })
+            content.append(image_ref_block(get_image_blobs().put(image_data, mime_type), mime_type))
 
     # 텍스트 추가 (경로 유지 - 도구에서 사용)
     content.append({
@@ -218,37 +379,197 @@ def create_multimodal_content(message: str, image_paths: List[str]) -> List[Dict
     return content
 
 
+# 실패/부분 결과로 끝난 도구 출력 (답변 캐시에 저장하지 않음)
+_TOOL_FAILURE_RE = re.compile(r"검색 실패|검색 결과가 없습니다|검색 결과 없음|크롤링 실패|페이지 로드 실패|시간 제한|^Error")
+
+
 class KoreanFoodAgent:
-    """한국 음식 에이전트 클래스 (MemorySaver로 자동 히스토리 관리)"""
+    """한국 음식 에이전트 클래스
+
+    그래프/LLM/체크포인터는 (provider, model)별로 공유하고,
+    인스턴스는 thread_id만 들고 있는 가벼운 세션 핸들입니다.
+    """
 
     def __init__(
         self,
         provider: Optional[str] = None,
-        model_name: Optional[str] = None
+        model_name: Optional[str] = None,
+        thread_id: Optional[str] = None,
     ):
         """
         Args:
             provider: 모델 제공자 (openai, gemini)
             model_name: 사용할 모델 이름
+            thread_id: 대화 thread ID (없으면 새로 생성)
         """
         self.provider = provider or settings.model_provider.value
         self.model_name = model_name
-        self.checkpointer = MemorySaver()
-        self.agent = create_food_agent(provider, model_name, self.checkpointer)
-        self.thread_id = "default"
+        self.checkpointer = get_shared_checkpointer()
+        self.agent = get_shared_agent(self.provider, model_name)
+        self.thread_id = thread_id or str(uuid.uuid4())
+
+    @property
+    def persistent(self) -> bool:
+        """대화가 프로세스 밖(SQLite 등)에 저장되는지 여부"""
+        return getattr(self.checkpointer, "persistent", False)
 
     def new_conversation(self):
-        """새 대화를 시작합니다 (새 thread_id 생성)."""
-        self.thread_id = str(uuid.uuid4())
+        """새 대화를 시작합니다 (이전 히스토리는 삭제)."""
+        self._delete_thread(self.thread_id)
+        # 영속 체크포인터는 다른 워커도 같은 thread_id를 쓰므로 ID 유지
+        if not self.persistent:
+            self.thread_id = str(uuid.uuid4())
+
+    def _delete_thread(self, thread_id: str):
+        """체크포인터에서 thread 히스토리 삭제 (지원하는 경우)"""
+        delete_thread = getattr(self.checkpointer, "delete_thread", None)
+        if delete_thread is None:
+            return
+        try:
+            delete_thread(thread_id)
+        except Exception as e:
+            print(f"[Agent] 히스토리 삭제 실패: {e}")
+
+    def close(self, forget: bool = False):
+        """
+        세션 종료 시 대화 히스토리를 정리합니다.
+
+        Args:
+            forget: True면 영속 체크포인터의 히스토리도 삭제
+                    (False면 보존 정책에 맡김 - 다른 워커/재시작 후에도 이어서 대화)
+        """
+        if forget or not self.persistent:
+            self._delete_thread(self.thread_id)
+
+    def estimate_memory_bytes(self) -> int:
+        """
+        공유 체크포인터에서 이 thread가 차지하는 메모리 (바이트)
+
+        체크포인터가 저장할 때 센 값을 조회만 하므로 세션 수와 무관하게 O(1)
+        (영속 체크포인터나 크기를 세지 않는 체크포인터는 0)
+        """
+        thread_bytes = getattr(self.checkpointer, "thread_bytes", None)
+        return thread_bytes(self.thread_id) if thread_bytes else 0
 
     def clear_history(self):
         """대화 히스토리를 초기화합니다 (새 thread_id로 전환)."""
         self.new_conversation()
 
-    def _get_config(self):
-        """현재 thread_id로 config 생성."""
+    def _get_config(self, run_context: Optional[RunContext] = None):
+        """현재 thread_id + 턴 단위 RunContext로 config 생성."""
+        return {
+            "configurable": {
+                "thread_id": self.thread_id,
+                RUN_CONTEXT_KEY: run_context or RunContext(),
+            }
+        }
+
+    def _thread_config(self) -> Dict[str, Any]:
+        """상태 조회/수정용 config (RunContext 없이 thread_id만)"""
         return {"configurable": {"thread_id": self.thread_id}}
 
+    @staticmethod
+    def _cacheable_route(human_message: HumanMessage) -> Optional[Route]:
+        """답변 캐시 대상 질문이면 라우터 결과 (이미지 없음, 이전 대화 참조 없음, 도구 하나)"""
+        if not settings.answer_cache_enabled:
+            return None
+        route = classify(human_message)
+        return route if route.kind == ROUTE_TOOL else None
+
+    @staticmethod
+    def _without_history(values: Optional[Dict[str, Any]], turns_before: int = 0) -> bool:
+        """
+        이전 대화(요약, 앞선 턴) 없이 답변하는 thread인지
+
+        answer 노드는 최근 턴과 요약도 함께 보므로, 캐시는 세션 간에 공유해도 되는
+        (히스토리 없이 만든) 답변만 저장하고 같은 조건의 턴에만 돌려줍니다.
+
+        Args:
+            values: thread 상태
+            turns_before: 허용할 사용자 메시지 수 (턴 실행 후 상태면 이번 턴 1개)
+        """
+        values = values or {}
+        if values.get("summary"):
+            return False
+        humans = sum(isinstance(m, HumanMessage) for m in values.get("messages", []))
+        return humans <= turns_before
+
+    def _answer_cache_route(self, human_message: HumanMessage) -> Optional[Route]:
+        """답변 캐시 대상 턴이면 라우터 결과 (질문 조건 + 이 thread에 이전 대화 없음)"""
+        route = self._cacheable_route(human_message)
+        if route is None or not self._without_history(self.agent.get_state(self._thread_config()).values):
+            return None
+        return route
+
+    async def _aanswer_cache_route(self, human_message: HumanMessage) -> Optional[Route]:
+        """_answer_cache_route()의 비동기 버전"""
+        route = self._cacheable_route(human_message)
+        if route is None:
+            return None
+        state = await self.agent.aget_state(self._thread_config())
+        return route if self._without_history(state.values) else None
+
+    @staticmethod
+    def _cached_answer(
+        route: Optional[Route], human_message: HumanMessage, run_context: RunContext
+    ) -> Optional[CachedAnswer]:
+        """답변 캐시 조회 - 적중하면 캐시된 카드 이벤트를 RunContext에도 기록"""
+        if route is None:
+            return None
+        entry = get_answer_cache().get(route.tool, human_message.content)
+        if entry is not None:
+            run_context.published.extend(entry.events)
+            record_routing("route", "cache", route.tool, ctx=run_context)
+        return entry
+
+    @staticmethod
+    def _cached_turn(human_message: HumanMessage, entry: CachedAnswer) -> Dict[str, Any]:
+        """캐시 적중 턴을 히스토리에 남길 상태 업데이트 (후속 질문이 이어지도록)"""
+        return {"messages": [human_message, AIMessage(content=entry.answer)], "route": ROUTE_TOOL}
+
+    def _remember_answer(
+        self,
+        route: Optional[Route],
+        human_message: HumanMessage,
+        values: Dict[str, Any],
+        run_context: RunContext,
+    ):
+        """히스토리 없이 라우터가 고른 도구 하나만 성공적으로 실행된 턴이면 최종 답변을 캐시에 저장"""
+        if route is None or not self._without_history(values, turns_before=1):
+            return
+        messages = values.get("messages", [])
+        turn_start = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1)
+        turn = messages[turn_start + 1:]
+        tool_results = [m for m in turn if isinstance(m, ToolMessage)]
+        if not tool_results or any(m.name != route.tool for m in tool_results):
+            return
+        if any(_TOOL_FAILURE_RE.search(str(m.content)) for m in tool_results):
+            return
+        if not turn or not isinstance(turn[-1], AIMessage) or turn[-1].tool_calls:
+            return
+        answer = self._extract_text(values)
+        if answer:
+            get_answer_cache().put(route.tool, human_message.content, answer, run_context.published)
+
+    async def _acached_answer(
+        self, route: Optional[Route], human_message: HumanMessage, run_context: RunContext
+    ) -> Optional[CachedAnswer]:
+        """_cached_answer()의 비동기 버전 (임베딩 계산이 이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        if route is None:
+            return None
+        return await asyncio.to_thread(self._cached_answer, route, human_message, run_context)
+
+    async def _aremember_answer(
+        self,
+        route: Optional[Route],
+        human_message: HumanMessage,
+        values: Dict[str, Any],
+        run_context: RunContext,
+    ):
+        """_remember_answer()의 비동기 버전 (스레드에서 실행)"""
+        if route is not None:
+            await asyncio.to_thread(self._remember_answer, route, human_message, values, run_context)
+
     def _prepare_message(self, message: str) -> HumanMessage:
         """메시지를 HumanMessage로 변환 (이미지 포함 가능)."""
         image_paths = extract_image_paths(message)
@@ -259,6 +580,22 @@ class KoreanFoodAgent:
 
         return HumanMessage(content=message)
 
+    @staticmethod
+    def _extract_text(result: Dict[str, Any]) -> str:
+        """그래프 실행 결과의 마지막 메시지에서 텍스트 추출."""
+        messages = result.get("messages", [])
+        if messages:
+            last_message = messages[-1]
+            content = last_message.content
+            if isinstance(content, list):
+                # 멀티모달 응답에서 텍스트 추출
+                for item in content:
+                    if isinstance(item, dict) and item.get('type') == 'text':
+                        return item.get('text', '')
+            return content if isinstance(content, str) else str(content)
+
+        return "응답을 생성하지 못했습니다."
+
     def chat(self, message: str) -> str:
         """
         사용자 메시지에 응답합니다. (멀티모달 지원, 자동 히스토리 관리)
@@ -270,24 +607,54 @@ class KoreanFoodAgent:
             에이전트 응답
         """
         human_message = self._prepare_message(message)
+        run_context = RunContext()
+
+        route = self._answer_cache_route(human_message)
+        cached = self._cached_answer(route, human_message, run_context)
+        if cached is not None:
+            self.agent.update_state(
+                self._thread_config(), self._cached_turn(human_message, cached), as_node="answer"
+            )
+            return cached.answer
 
         result = self.agent.invoke(
             {"messages": [human_message]},
-            config=self._get_config()
+            config=self._get_config(run_context)
         )
+        self._remember_answer(route, human_message, result, run_context)
 
-        messages = result.get("messages", [])
-        if messages:
-            last_message = messages[-1]
-            content = last_message.content
-            if isinstance(content, list):
-                # 멀티모달 응답에서 텍스트 추출
-                for item in content:
-                    if isinstance(item, dict) and item.get('type') == 'text':
-                        return item.get('text', '')
-            return content if isinstance(content, str) else str(content)
+        return self._extract_text(result)
 
-        return "응답을 생성하지 못했습니다."
+    async def achat(self, message: str, run_context: Optional[RunContext] = None) -> str:
+        """
+        chat()의 비동기 버전. 이벤트 루프를 막지 않습니다.
+        (동기 도구는 LangGraph가 루프의 기본 스레드 풀에서 실행)
+
+        Args:
+            message: 사용자 입력 메시지 (이미지 경로 포함 가능)
+            run_context: 턴 컨텍스트 (호출자가 취소하려면 직접 전달)
+
+        Returns:
+            에이전트 응답
+        """
+        human_message = await asyncio.to_thread(self._prepare_message, message)
+        run_context = run_context or RunContext()
+
+        route = await self._aanswer_cache_route(human_message)
+        cached = await self._acached_answer(route, human_message, run_context)
+        if cached is not None:
+            await self.agent.aupdate_state(
+                self._thread_config(), self._cached_turn(human_message, cached), as_node="answer"
+            )
+            return cached.answer
+
+        result = await self.agent.ainvoke(
+            {"messages": [human_message]},
+            config=self._get_config(run_context)
+        )
+        await self._aremember_answer(route, human_message, result, run_context)
+
+        return self._extract_text(result)
 
     def stream(self, message: str):
         """
@@ -300,14 +667,93 @@ class KoreanFoodAgent:
             (message_chunk, metadata) 튜플
         """
         human_message = self._prepare_message(message)
+        run_context = RunContext()
+
+        route = self._answer_cache_route(human_message)
+        cached = self._cached_answer(route, human_message, run_context)
+        if cached is not None:
+            self.agent.update_state(
+                self._thread_config(), self._cached_turn(human_message, cached), as_node="answer"
+            )
+            yield from self._cached_chunks(cached)
+            return
 
         for chunk in self.agent.stream(
             {"messages": [human_message]},
-            config=self._get_config(),
+            config=self._get_config(run_context),
             stream_mode=["messages", "custom"]  # custom 이벤트 활성화
         ):
             yield chunk
 
+        if route is not None:
+            values = self.agent.get_state(self._thread_config()).values
+            self._remember_answer(route, human_message, values, run_context)
+
+    @staticmethod
+    def _cached_chunks(entry: CachedAnswer):
+        """캐시된 답변을 그래프 스트림과 같은 (mode, chunk) 형식으로 - 카드 이벤트 → 답변 전체"""
+        for event in entry.events:
+            yield ("custom", event)
+        yield ("messages", (AIMessageChunk(content=entry.answer), {"langgraph_node": "answer", "cached": True}))
+
+    async def astream(self, message: str, run_context: Optional[RunContext] = None):
+        """
+        stream()의 비동기 버전.
+
+        Args:
+            message: 사용자 입력 메시지
+            run_context: 턴 컨텍스트 (호출자가 취소하려면 직접 전달)
+
+        Yields:
+            (mode, chunk) 튜플 - stream()과 같은 형식
+        """
+        human_message = await asyncio.to_thread(self._prepare_message, message)
+        run_context = run_context or RunContext()
+
+        route = await self._aanswer_cache_route(human_message)
+        cached = await self._acached_answer(route, human_message, run_context)
+        if cached is not None:
+            # 캐시 적중 - 그래프를 거치지 않고 바로 전송
+            await self.agent.aupdate_state(
+                self._thread_config(), self._cached_turn(human_message, cached), as_node="answer"
+            )
+            for chunk in self._cached_chunks(cached):
+                yield chunk
+            return
+
+        async for chunk in self.agent.astream(
+            {"messages": [human_message]},
+            config=self._get_config(run_context),
+            stream_mode=["messages", "custom"]
+        ):
+            yield chunk
+
+        if route is not None:
+            state = await self.agent.aget_state(self._thread_config())
+            await self._aremember_answer(route, human_message, state.values, run_context)
+
+    async def aclose_cancelled_turn(self):
+        """
+        취소된 턴 정리 - 응답 없이 끝난 도구 호출에 취소 결과를 채워서
+        다음 턴에 LLM이 짝이 맞지 않는 tool_calls를 받지 않게 합니다.
+        """
+        config = self._thread_config()
+        state = await self.agent.aget_state(config)
+        messages = (state.values or {}).get("messages", [])
+        if not messages or not isinstance(messages[-1], AIMessage):
+            return
+        tool_calls = messages[-1].tool_calls or []
+        if not tool_calls:
+            return
+        await self.agent.aupdate_state(
+            config,
+            {"messages": [
+                ToolMessage(content="사용자가 요청을 취소했습니다.", tool_call_id=tc["id"], name=tc["name"])
+                for tc in tool_calls
+            ]},
+            as_node="tools",
+        )
+
     def switch_model(self, provider: str, model_name: Optional[str] = None):
         """
         사용 모델을 전환합니다.
@@ -318,6 +764,6 @@ class KoreanFoodAgent:
         """
         self.provider = provider
         self.model_name = model_name
-        self.agent = create_food_agent(provider, model_name, self.checkpointer)
+        self.agent = get_shared_agent(provider, model_name)
         self.new_conversation()  # 모델 전환 시 새 대화 시작
         print(f"✅ 모델 전환 완료: {provider} - {model_name or '기본 모델'}")
@@ -0,0 +1,225 @@
+"""대화 체크포인터 - 메모리 / SQLite(WAL) 선택
+
+CHECKPOINTER=sqlite면 대화 상태를 로컬 SQLite 파일에 저장합니다.
+여러 uvicorn 워커(프로세스)가 같은 파일을 공유하므로 sticky session 없이
+어느 워커에서든 대화를 이어갈 수 있고, 재시작해도 대화가 남습니다.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Union
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    SQLITE_SAVER_AVAILABLE = True
+except ImportError:
+    SQLITE_SAVER_AVAILABLE = False
+    SqliteSaver = object
+
+from .services.storage import open_sqlite
+
+
+_ACTIVITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_activity (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_thread_activity_updated_at ON thread_activity (updated_at);
+"""
+
+
+def _stored_size(obj: Any) -> int:
+    """저장된 항목(직렬화된 bytes/str 튜플)의 크기 합"""
+    if obj is None:
+        return 0
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj)
+    if isinstance(obj, (list, tuple)):
+        return sum(_stored_size(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(_stored_size(value) for value in obj.values())
+    return 8
+
+
+class SizedMemorySaver(MemorySaver):
+    """thread별 메모리 사용량을 저장할 때 같이 세는 메모리 체크포인터
+
+    세션 매니저가 요청마다 크기를 조회하므로 공유 storage 전체를 순회하지 않고
+    put/put_writes에서 바뀐 항목의 크기 차이만 누적합니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._thread_bytes: Dict[str, int] = defaultdict(int)
+        self._size_lock = threading.Lock()
+
+    def _add_bytes(self, thread_id: str, delta: int):
+        if delta:
+            with self._size_lock:
+                self._thread_bytes[thread_id] += delta
+
+    def thread_bytes(self, thread_id: str) -> int:
+        """thread가 차지하는 체크포인트/쓰기 크기 (바이트)"""
+        with self._size_lock:
+            return self._thread_bytes.get(thread_id, 0)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        blob_keys = [(thread_id, checkpoint_ns, k, v) for k, v in new_versions.items()]
+        checkpoints = self.storage.get(thread_id, {}).get(checkpoint_ns, {})
+        before = _stored_size([self.blobs.get(key) for key in blob_keys])
+        before += _stored_size(checkpoints.get(checkpoint["id"]))
+
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        after = _stored_size([self.blobs.get(key) for key in blob_keys])
+        after += _stored_size(self.storage[thread_id][checkpoint_ns].get(checkpoint["id"]))
+        self._add_bytes(thread_id, after - before)
+        return result
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        outer_key = (thread_id, configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        before = _stored_size(self.writes.get(outer_key))
+        super().put_writes(config, writes, task_id, task_path)
+        self._add_bytes(thread_id, _stored_size(self.writes.get(outer_key)) - before)
+
+    def delete_thread(self, thread_id: str):
+        super().delete_thread(thread_id)
+        with self._size_lock:
+            self._thread_bytes.pop(thread_id, None)
+
+
+class RetentionSqliteSaver(SqliteSaver):
+    """보존 정책이 있는 SQLite 체크포인터
+
+    - thread(+namespace)별 최근 keep_last개 체크포인트만 유지 (저장할 때마다 정리)
+    - ttl_seconds 동안 갱신이 없는 thread는 prune_expired()에서 삭제
+    - 비동기 API는 동기 구현을 스레드에서 실행 (ainvoke/astream 지원)
+    """
+
+    # 프로세스 밖에 저장됨 - 세션 축출 시 대화를 지우지 않음
+    persistent = True
+
+    def __init__(self, conn, keep_last: int = 5, ttl_seconds: int = 7 * 24 * 3600):
+        super().__init__(conn)
+        self.keep_last = keep_last
+        self.ttl_seconds = ttl_seconds
+
+    def setup(self):
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(_ACTIVITY_SCHEMA)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            if self.keep_last > 0:
+                self._prune_thread(cur, thread_id, checkpoint_ns)
+        return result
+
+    def _prune_thread(self, cur, thread_id: str, checkpoint_ns: str):
+        """최근 keep_last개 이전 체크포인트와 그 pending write 삭제"""
+        cur.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND checkpoint_id NOT IN ("
+            "  SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "  ORDER BY checkpoint_id DESC LIMIT ?)",
+            (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last),
+        )
+        cur.execute(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND checkpoint_id NOT IN ("
+            "  SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?)",
+            (thread_id, checkpoint_ns, thread_id, checkpoint_ns),
+        )
+
+    def delete_thread(self, thread_id: str):
+        """thread의 모든 체크포인트 삭제"""
+        with self.cursor() as cur:
+            for table in ("checkpoints", "writes", "thread_activity"):
+                cur.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def prune_expired(self) -> int:
+        """ttl_seconds 동안 갱신이 없는 thread 삭제, 삭제한 thread 수 반환"""
+        if self.ttl_seconds <= 0:
+            return 0
+        with self.cursor() as cur:
+            cur.execute(
+                "SELECT thread_id FROM thread_activity WHERE updated_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            expired = [row[0] for row in cur.fetchall()]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+
+    # 비동기 API - SqliteSaver는 동기 전용이므로 스레드에서 실행
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, **kwargs):
+        items = await asyncio.to_thread(lambda: list(self.list(config, **kwargs)))
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, *args, **kwargs):
+        return await asyncio.to_thread(self.put_writes, *args, **kwargs)
+
+    async def adelete_thread(self, thread_id: str):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(kind: Optional[str] = None) -> BaseCheckpointSaver:
+    """
+    체크포인터를 생성합니다.
+
+    Args:
+        kind: "memory" 또는 "sqlite". None이면 CHECKPOINTER 환경 변수 사용.
+
+    Returns:
+        체크포인터 인스턴스 (SQLite 패키지가 없으면 메모리 체크포인터)
+    """
+    kind = (kind or os.getenv("CHECKPOINTER", "memory")).lower()
+    if kind == "memory":
+        return SizedMemorySaver()
+    if kind != "sqlite":
+        raise ValueError(f"지원하지 않는 체크포인터: {kind}")
+
+    if not SQLITE_SAVER_AVAILABLE:
+        print("[Checkpoint] langgraph-checkpoint-sqlite 미설치 - 메모리 체크포인터 사용")
+        return SizedMemorySaver()
+
+    conn = open_sqlite(os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite3"))
+    return RetentionSqliteSaver(
+        conn,
+        keep_last=int(os.getenv("CHECKPOINT_KEEP_LAST", "5")),
+        ttl_seconds=int(os.getenv("CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600))),
+    )
+
+
+def resolve_checkpointer(
+    checkpointer: Union[BaseCheckpointSaver, str, None],
+) -> Optional[BaseCheckpointSaver]:
+    """체크포인터 인스턴스 또는 종류 이름("memory"/"sqlite")을 인스턴스로 변환"""
+    if isinstance(checkpointer, str):
+        return create_checkpointer(checkpointer)
+    return checkpointer
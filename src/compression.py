@@ -0,0 +1,199 @@
+"""도구 결과 압축 단계 - 도구 실행 후, 메인 LLM 호출 전에 실행
+
+방금 끝난 도구 결과(마지막 AI 메시지 뒤의 ToolMessage) 중 min_length 이상인 것을
+도구별 방식(로컬 LLM 요약 / 추출 요약)으로 줄여서 같은 ID의 메시지로 교체합니다.
+원본/압축 크기는 ToolMessage.response_metadata["compression"]에 기록합니다.
+"""
+
+import os
+import re
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+from .services.summarizer import LocalSummarizer, SummaryResult, get_summarizer
+from .services.extractive import extract_summary
+from .services.kakao import REVIEW_KEYWORDS
+from .tools.image import FOOD_KEYWORDS
+
+
+# 도구별 압축 방식
+#   llm: 로컬 LLM 요약 (서버가 응답하지 않거나 실패하면 extractive로 대체)
+#   extractive: LLM 없이 핵심 문장만 추출
+#   none: 압축하지 않음 (결과가 짧고 image_id 등 값 자체가 중요)
+COMPRESSION_METHODS = ("llm", "extractive", "none")
+DEFAULT_TOOL_METHODS = {"save_food_image": "none", "update_food_image": "none"}
+
+# 추출 요약 점수용 도구별 키워드 (블로그 본문/후기 필터의 키워드 재사용)
+NUTRITION_KEYWORDS = ['칼로리', 'kcal', '탄수화물', '단백질', '지방', '나트륨', '당류', '1인분']
+RECIPE_KEYWORDS = ['재료', '큰술', '작은술', '컵', '넣', '볶', '끓', '썰', '분간']
+TOOL_KEYWORDS = {
+    "search_food_by_image": FOOD_KEYWORDS,
+    "search_restaurant_info": FOOD_KEYWORDS,
+    "get_restaurant_reviews": REVIEW_KEYWORDS,
+    "search_recipe_online": RECIPE_KEYWORDS,
+    "get_nutrition_info": NUTRITION_KEYWORDS,
+}
+DEFAULT_KEYWORDS = FOOD_KEYWORDS + REVIEW_KEYWORDS
+
+# 요약 후에도 그대로 남겨야 하는 태그/값 (LLM이 그대로 옮겨 쓰거나 다음 도구에 전달)
+_PRESERVE_RE = re.compile(
+    r"\[IMAGE:[^\]]+\]|image_id[:=]\s*[\w-]+|https?://place\.map\.kakao\.com/\d+"
+)
+_IMAGE_SECTION = "[검색 결과 이미지]"
+
+
+def tool_methods_from_env() -> Dict[str, str]:
+    """
+    도구별 압축 방식
+
+    - TOOL_COMPRESSION: "도구=방식" 쉼표 구분 (예: get_restaurant_reviews=extractive)
+    - SUMMARIZER_SKIP_TOOLS: 쉼표 구분 도구 이름 → none
+    """
+    methods = dict(DEFAULT_TOOL_METHODS)
+    for name in os.getenv("SUMMARIZER_SKIP_TOOLS", "").split(","):
+        if name.strip():
+            methods[name.strip()] = "none"
+    for pair in os.getenv("TOOL_COMPRESSION", "").split(","):
+        name, _, method = pair.partition("=")
+        if method.strip() in COMPRESSION_METHODS:
+            methods[name.strip()] = method.strip()
+    return methods
+
+
+def restore_preserved(original: str, summary: str) -> str:
+    """요약에서 빠진 [IMAGE:] 태그, image_id, 카카오맵 링크를 원문 순서대로 다시 붙임"""
+    missing = [tag for tag in dict.fromkeys(_PRESERVE_RE.findall(original)) if tag not in summary]
+    if not missing:
+        return summary
+    if any(tag.startswith("[IMAGE:") for tag in missing) and _IMAGE_SECTION not in summary:
+        missing.insert(
+            next(i for i, tag in enumerate(missing) if tag.startswith("[IMAGE:")), _IMAGE_SECTION
+        )
+    return summary.rstrip() + "\n\n" + "\n".join(missing)
+
+
+def pending_tool_messages(messages: List[Any]) -> List[ToolMessage]:
+    """마지막 AI 메시지 뒤의 아직 압축하지 않은 도구 결과"""
+    pending = []
+    for message in reversed(messages):
+        if isinstance(message, AIMessage):
+            break
+        if isinstance(message, ToolMessage) and "compression" not in message.response_metadata:
+            pending.append(message)
+    return list(reversed(pending))
+
+
+def _compressed(
+    message: ToolMessage,
+    summary: str,
+    method: str,
+    latency_ms: float,
+    cached: bool = False,
+) -> Optional[ToolMessage]:
+    """
+    압축 결과로 바꾼 ToolMessage (같은 ID)
+
+    Returns:
+        압축 결과가 원문보다 짧지 않으면 None
+    """
+    text = message.content
+    if len(summary) >= len(text):
+        return None
+
+    summary = restore_preserved(text, summary)
+    return message.model_copy(update={
+        "content": summary,
+        "response_metadata": {
+            **message.response_metadata,
+            "compression": {
+                "method": method,
+                "original_chars": len(text),
+                "compressed_chars": len(summary),
+                "latency_ms": round(latency_ms, 1),
+                "cached": cached,
+            },
+        },
+    })
+
+
+def extractive_compress(message: ToolMessage, target_chars: int) -> Optional[ToolMessage]:
+    """LLM 없이 핵심 문장만 남긴 ToolMessage (줄일 게 없으면 None)"""
+    start = time.perf_counter()
+    summary = extract_summary(
+        message.content, target_chars, TOOL_KEYWORDS.get(message.name, DEFAULT_KEYWORDS)
+    )
+    return _compressed(message, summary, "extractive", (time.perf_counter() - start) * 1000)
+
+
+def make_compression_hook(
+    summarizer_factory: Callable[[], LocalSummarizer] = get_summarizer,
+    tool_methods: Optional[Dict[str, str]] = None,
+    default_method: Optional[str] = None,
+    extractive_target_chars: Optional[int] = None,
+) -> RunnableLambda:
+    """
+    도구 결과 압축 노드 (pre_model_hook 체인의 첫 단계)
+
+    - llm 방식은 ENABLE_LOCAL_SUMMARIZER=false면 건너뛰고, 서버에 연결할 수 없거나
+      요약이 실패하면 추출 요약으로 대체합니다.
+    - 비동기 실행(ainvoke/astream)에서는 한 단계의 도구 결과 여러 개를 동시에 요약합니다.
+    """
+    tool_methods = tool_methods_from_env() if tool_methods is None else tool_methods
+    default_method = default_method or os.getenv("TOOL_COMPRESSION_DEFAULT", "llm")
+    target_chars = extractive_target_chars or int(os.getenv("EXTRACTIVE_TARGET_CHARS", "800"))
+
+    def _plan(state: Dict[str, Any], summarizer: LocalSummarizer) -> List[Tuple[ToolMessage, str]]:
+        """압축할 도구 결과와 방식"""
+        plan = []
+        for message in pending_tool_messages(state["messages"]):
+            if not isinstance(message.content, str) or not summarizer.should_summarize(message.content):
+                continue
+            method = tool_methods.get(message.name, default_method)
+            if method == "extractive" or (method == "llm" and summarizer.enabled):
+                plan.append((message, method))
+        return plan
+
+    def _update(plan: List[Tuple[ToolMessage, str]], results: List[Optional[SummaryResult]]) -> Dict[str, Any]:
+        replaced = []
+        for (message, method), result in zip(plan, results):
+            compressed = None
+            if result is not None and result.summary != message.content:
+                compressed = _compressed(message, result.summary, "llm", result.latency_ms, result.cached)
+            if compressed is None:
+                compressed = extractive_compress(message, target_chars)
+            if compressed is not None:
+                replaced.append(compressed)
+        return {"messages": replaced} if replaced else {}
+
+    def compress_tool_results(state: Dict[str, Any]) -> Dict[str, Any]:
+        summarizer = summarizer_factory()
+        plan = _plan(state, summarizer)
+        if not plan:
+            return {}
+        use_llm = any(method == "llm" for _, method in plan) and summarizer.is_available()
+        results = [
+            summarizer.summarize(m.name or "", m.content) if use_llm and method == "llm" else None
+            for m, method in plan
+        ]
+        return _update(plan, results)
+
+    async def acompress_tool_results(state: Dict[str, Any]) -> Dict[str, Any]:
+        summarizer = summarizer_factory()
+        plan = _plan(state, summarizer)
+        if not plan:
+            return {}
+        llm_indexes = [i for i, (_, method) in enumerate(plan) if method == "llm"]
+        results: List[Optional[SummaryResult]] = [None] * len(plan)
+        if llm_indexes and await asyncio.to_thread(summarizer.is_available):
+            summaries = await summarizer.asummarize_many(
+                [(plan[i][0].name or "", plan[i][0].content) for i in llm_indexes]
+            )
+            for i, summary in zip(llm_indexes, summaries):
+                results[i] = summary
+        return _update(plan, results)
+
+    return RunnableLambda(compress_tool_results, afunc=acompress_tool_results, name="compress_tool_results")
@@ -2,6 +2,7 @@
 
 import os
 from enum import Enum
+from typing import Dict
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -14,6 +15,26 @@ class ModelProvider(str, Enum):
     GEMINI = "gemini"
 
 
+# 도구별 출력 토큰 예산 기본값 (TOOL_TOKEN_BUDGETS로 덮어씀)
+DEFAULT_TOOL_TOKEN_BUDGETS = {
+    "search_food_by_image": 1500,
+    "search_restaurant_info": 1200,
+    "get_restaurant_reviews": 1000,
+    "search_recipe_online": 1800,
+    "get_nutrition_info": 1200,
+}
+
+
+def _tool_token_budgets() -> Dict[str, int]:
+    """TOOL_TOKEN_BUDGETS: "도구=토큰" 쉼표 구분 (예: get_nutrition_info=800)"""
+    budgets = dict(DEFAULT_TOOL_TOKEN_BUDGETS)
+    for pair in os.getenv("TOOL_TOKEN_BUDGETS", "").split(","):
+        name, _, tokens = pair.partition("=")
+        if name.strip() and tokens.strip().isdigit():
+            budgets[name.strip()] = int(tokens)
+    return budgets
+
+
 class Settings(BaseModel):
     """전체 애플리케이션 설정"""
 
@@ -28,6 +49,51 @@ class Settings(BaseModel):
     openai_model: str = Field(default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-4o"))
     gemini_model: str = Field(default_factory=lambda: os.getenv("GEMINI_MODEL", "gemini-2.0-flash"))
 
+    # 대화 히스토리 관리 - 토큰 예산을 넘으면 최근 N턴만 남기고 이전 대화는 요약으로 대체
+    history_token_budget: int = Field(
+        default_factory=lambda: int(os.getenv("HISTORY_TOKEN_BUDGET", "6000"))
+    )
+    history_keep_turns: int = Field(
+        default_factory=lambda: int(os.getenv("HISTORY_KEEP_TURNS", "3"))
+    )
+    history_summary_max_chars: int = Field(
+        default_factory=lambda: int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", "1500"))
+    )
+
+    # 빠른 경로 - 인사/도구 하나로 끝나는 질문은 ReAct 루프 없이 처리 (src/router.py)
+    fast_path_enabled: bool = Field(
+        default_factory=lambda: os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    )
+
+    # 답변 캐시 - 이미지/이전 대화 참조 없는 단일 도구 질문의 최종 답변 재사용 (services/answer_cache.py)
+    answer_cache_enabled: bool = Field(
+        default_factory=lambda: os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    )
+
+    # 모델 라우팅 - FAST_MODEL을 지정하면 간단한 호출은 빠른 모델, 이미지/후보 판별은 기본(강한) 모델
+    fast_model_provider: str = Field(
+        default_factory=lambda: os.getenv("FAST_MODEL_PROVIDER", "") or os.getenv("MODEL_PROVIDER", "gemini")
+    )
+    fast_model: str = Field(default_factory=lambda: os.getenv("FAST_MODEL", ""))
+    # 이번 턴 도구 결과가 이 토큰 수를 넘으면 강한 모델
+    routing_tool_token_threshold: int = Field(
+        default_factory=lambda: int(os.getenv("ROUTING_TOOL_TOKEN_THRESHOLD", "2500"))
+    )
+    # 사용자 메시지가 이 글자 수를 넘으면 강한 모델
+    routing_long_message_chars: int = Field(
+        default_factory=lambda: int(os.getenv("ROUTING_LONG_MESSAGE_CHARS", "200"))
+    )
+
+    # 도구 출력 토큰 예산 - 도구 결과를 섹션 우선순위대로 잘라서 LLM 입력 크기를 고정
+    tool_token_budgets: Dict[str, int] = Field(default_factory=_tool_token_budgets)
+    tool_token_budget_default: int = Field(
+        default_factory=lambda: int(os.getenv("TOOL_TOKEN_BUDGET_DEFAULT", "1200"))
+    )
+    # 한 턴의 모든 도구 출력 합계 예산
+    turn_tool_token_budget: int = Field(
+        default_factory=lambda: int(os.getenv("TURN_TOOL_TOKEN_BUDGET", "4000"))
+    )
+
 
 # 전역 설정 인스턴스
 settings = Settings()
@@ -0,0 +1,256 @@
+"""대화 히스토리 관리
+
+- 이미지: 체크포인트에는 이미지 대신 이미지 참조(image_ref, 내용 해시)만 저장합니다.
+  LLM을 호출할 때 현재 턴(마지막 사용자 메시지)의 이미지만 base64로 펼치고,
+  이전 턴의 이미지는 짧은 자리표시 텍스트로 바꿔서 매 턴 다시 보내지 않습니다.
+- 길이: 히스토리가 토큰 예산을 넘으면 최근 N턴만 그대로 두고
+  이전 턴(도구 결과 포함)은 체크포인트의 summary 필드에 누적 요약합니다.
+"""
+
+import base64
+from typing import Any, Callable, Dict, List, Sequence
+
+from typing_extensions import NotRequired
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.messages import (
+    AIMessage, BaseMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage,
+)
+from langgraph.graph.message import add_messages
+from langgraph.prebuilt.chat_agent_executor import AgentState
+
+try:
+    from langgraph.constants import TAG_NOSTREAM
+except ImportError:
+    TAG_NOSTREAM = "nostream"
+
+from .services.image_blobs import get_image_blobs
+from .tokens import estimate_message_tokens, estimate_tokens
+
+
+IMAGE_REF_TYPE = "image_ref"
+
+
+def image_ref_block(blob_id: str, mime_type: str) -> Dict[str, Any]:
+    """체크포인트에 저장할 이미지 참조 블록"""
+    return {"type": IMAGE_REF_TYPE, IMAGE_REF_TYPE: {"id": blob_id, "mime_type": mime_type}}
+
+
+def _is_image_block(block: Any) -> bool:
+    """이미지 참조 또는 (이전 버전에서 저장된) 인라인 base64 이미지"""
+    if not isinstance(block, dict):
+        return False
+    if block.get("type") == IMAGE_REF_TYPE:
+        return True
+    return block.get("type") == "image_url" and str(
+        (block.get("image_url") or {}).get("url", "")
+    ).startswith("data:")
+
+
+def _inline_image(ref: Dict[str, Any]) -> Dict[str, Any]:
+    """이미지 참조 → LLM용 data URL 블록"""
+    blob = get_image_blobs().get(ref["id"])
+    if blob is None:
+        return {"type": "text", "text": "[이미지를 불러올 수 없습니다]"}
+    data, mime_type = blob
+    return {
+        "type": "image_url",
+        "image_url": {"url": f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"},
+    }
+
+
+def _placeholder(block: Dict[str, Any]) -> Dict[str, Any]:
+    """이전 턴 이미지 자리표시"""
+    ref = block.get(IMAGE_REF_TYPE)
+    label = f" #{ref['id'][:8]}" if ref else ""
+    return {"type": "text", "text": f"[이전 대화의 이미지{label}]"}
+
+
+def _resolve_content(content: List[Any], current: bool) -> List[Any]:
+    resolved = []
+    for block in content:
+        if not _is_image_block(block):
+            resolved.append(block)
+        elif not current:
+            resolved.append(_placeholder(block))
+        elif block.get("type") == IMAGE_REF_TYPE:
+            resolved.append(_inline_image(block[IMAGE_REF_TYPE]))
+        else:
+            resolved.append(block)
+    return resolved
+
+
+def prepare_llm_messages(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """
+    LLM에 보낼 메시지 목록을 만듭니다 (체크포인트 상태는 바꾸지 않음).
+
+    Args:
+        messages: 그래프 상태의 전체 메시지
+
+    Returns:
+        현재 턴 이미지만 인라인, 이전 턴 이미지는 자리표시로 바꾼 메시지 목록
+    """
+    last_human = -1
+    for i, message in enumerate(messages):
+        if isinstance(message, HumanMessage):
+            last_human = i
+
+    prepared = []
+    for i, message in enumerate(messages):
+        content = message.content
+        if (
+            isinstance(message, HumanMessage)
+            and isinstance(content, list)
+            and any(_is_image_block(block) for block in content)
+        ):
+            message = message.model_copy(
+                update={"content": _resolve_content(content, current=i == last_human)}
+            )
+        prepared.append(message)
+    return prepared
+
+
+class FoodAgentState(AgentState):
+    """에이전트 상태 + 예산 밖으로 밀려난 이전 대화 요약 + 이번 턴 경로 (router.py)"""
+    summary: NotRequired[str]
+    route: NotRequired[str]
+
+
+SUMMARY_PROMPT = """다음은 사용자와 한국 음식 AI 어시스턴트의 이전 대화입니다.
+이후 대화에 필요한 정보만 한국어 글머리표로 요약하세요:
+- 사용자가 찾던 음식/식당/지역, 사용자가 확인해준 사실
+- 어시스턴트가 알려준 핵심 정보 (식당명, 카카오맵 링크, 칼로리 등 수치)
+- 이후 도구 호출에 필요한 값 (저장한 이미지 ID 등)
+기존 요약이 있으면 합쳐서 {max_chars}자 이내로 작성하세요."""
+
+# 요약 입력에 넣을 메시지별 최대 글자 수 (도구 결과는 앞부분만)
+_RENDER_CHARS = {"human": 400, "ai": 600, "tool": 300}
+
+
+def _text_of(content: Any) -> str:
+    """메시지 content에서 텍스트만 추출 (이미지는 표시만)"""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict):
+            parts.append(block.get("text", "") if block.get("type") == "text" else "[이미지]")
+    return " ".join(p for p in parts if p)
+
+
+def _render_turns(messages: Sequence[BaseMessage]) -> str:
+    """요약할 대화를 텍스트로 변환"""
+    lines = []
+    for message in messages:
+        text = " ".join(_text_of(message.content).split())
+        if isinstance(message, HumanMessage):
+            lines.append(f"사용자: {text[:_RENDER_CHARS['human']]}")
+        elif isinstance(message, ToolMessage):
+            lines.append(f"도구({message.name}): {text[:_RENDER_CHARS['tool']]}")
+        elif isinstance(message, AIMessage) and text:
+            lines.append(f"AI: {text[:_RENDER_CHARS['ai']]}")
+    return "\n".join(lines)
+
+
+def summarize_turns(
+    llm: BaseChatModel,
+    previous: str,
+    messages: Sequence[BaseMessage],
+    max_chars: int,
+) -> str:
+    """
+    이전 요약 + 밀려난 대화를 새 요약으로 합칩니다.
+
+    LLM 호출이 실패하면 사용자 질문만 이어 붙인 단순 요약을 반환합니다.
+    """
+    rendered = _render_turns(messages)
+    try:
+        response = llm.invoke(
+            [
+                SystemMessage(content=SUMMARY_PROMPT.format(max_chars=max_chars)),
+                HumanMessage(content=f"[기존 요약]\n{previous or '(없음)'}\n\n[대화]\n{rendered}"),
+            ],
+            # 요약 토큰이 사용자 스트림으로 나가지 않도록
+            config={"tags": [TAG_NOSTREAM]},
+        )
+        summary = _text_of(response.content).strip()
+        if summary:
+            return summary[:max_chars]
+    except Exception as e:
+        print(f"[History] 요약 실패, 단순 요약 사용: {e}")
+
+    questions = [
+        f"- 사용자: {' '.join(_text_of(m.content).split())[:80]}"
+        for m in messages if isinstance(m, HumanMessage)
+    ]
+    merged = "\n".join(filter(None, [previous, *questions]))
+    return merged[-max_chars:]
+
+
+def make_history_hook(
+    llm: BaseChatModel,
+    token_budget: int,
+    keep_turns: int,
+    summary_max_chars: int,
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    모델 호출 전 히스토리 정리 노드 (그래프의 pre_model_hook 체인)
+
+    히스토리가 token_budget을 넘으면 최근 keep_turns턴만 남기고 이전 메시지는
+    체크포인트에서 지운 뒤 summary에 합칩니다. 턴(사용자 메시지) 경계에서만 자르므로
+    도구 호출/결과 짝은 깨지지 않습니다.
+    """
+    keep_turns = max(1, keep_turns)
+
+    def manage_history(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"]
+        summary = state.get("summary", "")
+        if estimate_message_tokens(messages) + estimate_tokens(summary) <= token_budget:
+            return {}
+
+        turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+        if len(turn_starts) <= keep_turns:
+            return {}
+
+        folded = messages[:turn_starts[-keep_turns]]
+        return {
+            "summary": summarize_turns(llm, summary, folded, summary_max_chars),
+            "messages": [RemoveMessage(id=m.id) for m in folded],
+        }
+
+    return manage_history
+
+
+def chain_hooks(*hooks: Any) -> RunnableLambda:
+    """
+    pre_model_hook 여러 개(함수 또는 Runnable)를 순서대로 실행하는 훅 하나로 합칩니다.
+
+    뒤 훅은 앞 훅이 바꾼 메시지를 보고 판단합니다 (예: 도구 결과 압축 → 히스토리 예산 확인).
+    비동기 실행에서는 각 훅의 비동기 구현(ainvoke)을 사용합니다.
+    """
+    runnables = [hook if isinstance(hook, Runnable) else RunnableLambda(hook) for hook in hooks]
+
+    def _apply(state: Dict[str, Any], update: Dict[str, Any], updates: Dict[str, Any]):
+        update = dict(update or {})
+        messages = update.pop("messages", None)
+        if messages:
+            updates.setdefault("messages", []).extend(messages)
+            state["messages"] = add_messages(state["messages"], messages)
+        state.update(update)
+        updates.update(update)
+
+    def run_hooks(state: Dict[str, Any]) -> Dict[str, Any]:
+        state, updates = dict(state), {}
+        for hook in runnables:
+            _apply(state, hook.invoke(state), updates)
+        return updates
+
+    async def arun_hooks(state: Dict[str, Any]) -> Dict[str, Any]:
+        state, updates = dict(state), {}
+        for hook in runnables:
+            _apply(state, await hook.ainvoke(state), updates)
+        return updates
+
+    return RunnableLambda(run_hooks, afunc=arun_hooks, name="pre_model_hooks")
@@ -0,0 +1,336 @@
+"""라우팅 - 빠른 경로(턴 단위) + 모델 선택(LLM 호출 단위)
+
+턴이 시작될 때 규칙으로 경로를 정합니다.
+- chat: 인사/감사 같은 잡담 → 짧은 프롬프트로 바로 답변 (도구 스키마 없이 LLM 1회)
+- tool: 도구 하나로 끝나는 질문 ("김치찌개 칼로리") → 도구를 바로 실행한 뒤 답변 LLM 1회
+- agent: 그 외 (이미지, 이전 대화를 가리키는 후속 질문, 여러 대상/비교, 여러 의도) → 기존 ReAct 에이전트
+
+애매하면 항상 agent로 보냅니다. 빠른 경로는 도구 선택 LLM 호출을 한 번 줄이는 것이 목적이라
+잘못 보내는 비용이 더 큽니다.
+
+LLM을 호출할 때마다 빠른 모델(fast)과 강한 모델(strong) 중 하나를 고릅니다 (choose_model).
+이미지 추론, 이미지 검색 후보 판별, 비교/선택 질문, 큰 도구 결과는 strong, 나머지는 fast.
+결정은 RunContext.routing과 프로세스 통계(get_routing_stats)에 기록합니다.
+"""
+
+import re
+import uuid
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from .runtime import get_run_context
+from .tokens import estimate_tokens
+
+
+ROUTE_CHAT = "chat"
+ROUTE_TOOL = "tool"
+ROUTE_AGENT = "agent"
+
+# 빠른 경로로 보낼 최대 메시지 길이 (길면 조건이 여러 개일 가능성이 큼)
+MAX_FAST_PATH_CHARS = 40
+
+_GREETING_RE = re.compile(
+    r"^(?:안녕|하이|헬로|반가워|반갑습니다|고마워|고맙습니다|감사|땡큐|ㅎㅇ|굿모닝|잘\s*자|잘\s*가|"
+    r"좋은\s*(?:아침|하루|밤)|수고|(?:hi|hello|hey|thanks|thank\s*you|bye)\b)",
+    re.IGNORECASE,
+)
+# 도구 검색어 앞에서 뺄 인사 ("감사합니다 김치찌개 칼로리 알려줘")
+_LEADING_GREETING_RE = re.compile(
+    r"^(?:안녕(?:하세요)?|하이|헬로|반가워요?|반갑습니다|고마워요?|고맙습니다|감사(?:해요|합니다)?|땡큐|"
+    r"ㅎㅇ|굿모닝|hi|hello|hey|thanks|thank\s*you)(?=[\s,!.~]|$)[\s,!.~]*",
+    re.IGNORECASE,
+)
+# 잡담이라도 음식 이야기가 섞이면 에이전트로
+_FOOD_TALK_RE = re.compile(r"먹|음식|메뉴|맛|요리|식당|배고|점심|저녁|아침\s*뭐|추천")
+
+# 도구 하나로 끝나는 의도 (도구 이름, 패턴)
+TOOL_INTENTS = [
+    ("get_nutrition_info", re.compile(r"칼로리|열량|kcal|영양\s*(?:성분|정보)|탄수화물|단백질|나트륨", re.IGNORECASE)),
+    ("search_recipe_online", re.compile(r"레시피|만드는\s*(?:법|방법)|조리법|요리법|끓이는\s*(?:법|방법)")),
+    ("search_restaurant_info", re.compile(r"맛집|음식점|식당\s*추천")),
+]
+# 이전 대화/이미지를 가리키거나 다른 도구가 필요한 표현 → 에이전트
+_AGENT_ONLY_RE = re.compile(
+    r"후기|리뷰|사진|이미지|저장|그거|거기|이거|저거|그\s*(?:식당|음식|집|메뉴)|아까|방금|위에서|말한|차이|비교"
+)
+# 도구 검색어에서 뺄 요청 표현 ("알려줘", "추천해줘", 물음표 등)
+_REQUEST_SUFFIX_RE = re.compile(
+    r"(?:\s*(?:좀|는|은|를|을|이|가)?\s*(?:알려\s*(?:줘|주세요|줄래|주라)|추천\s*(?:해\s*(?:줘|주세요|줄래))?|"
+    r"찾아\s*(?:줘|주세요)|검색\s*(?:해\s*(?:줘|주세요))?|가르쳐\s*(?:줘|주세요)|궁금해요?|어때요?|"
+    r"얼마(?:야|예요|에요|나\s*돼\??)?|뭐야|있어\??|해\s*줘|[?!.~]+|요))+\s*$"
+)
+# 앞 대화를 이어받는 접속/담화 표현 ("그럼 단백질은?", "또 추천해줘") → 에이전트
+_FOLLOW_UP_RE = re.compile(r"(?:^|\s)(?:그럼|그러면|그리고|그건|그럼요|또|근데|그런데|그래서|그담|그다음)(?=\s|$)")
+# 비교/순위 표현 ("떡볶이보다 칼로리 낮은 메뉴") → 에이전트
+_COMPARISON_RE = re.compile(
+    r"보다|(?:^|\s)(?:더|덜|가장|제일)\s|낮은|높은|적은|많은|나은|vs|대비", re.IGNORECASE
+)
+# 대상 여러 개를 나열하는 구분자 ("김치찌개, 된장찌개")
+_LIST_SEPARATOR_RE = re.compile(r"[,/&+]|\s및\s")
+# 대상으로 치지 않는 일반 단어 (음식 이름이 아닌 때/끼니/사람 표현 포함)
+_GENERIC_WORDS = {
+    "음식", "메뉴", "요리", "정도", "보통", "평균", "대충", "어떤", "무슨", "이거", "그거", "뭐",
+    "오늘", "어제", "내일", "요즘", "평소", "하루", "아침", "점심", "저녁", "야식", "간식", "식사",
+    "끼니", "한끼", "내가", "제가", "우리", "근처", "주변", "여기",
+}
+# 분량 표현 ("1인분", "100g", "한 그릇") - 음식 이름이 아님
+_QUANTITY_RE = re.compile(
+    r"\d+(?:\.\d+)?(?:인분|그릇|접시|공기|조각|개|잔|g|그램|kg|ml)?|"
+    r"(?:한|두|세|네|반)?(?:인분|그릇|접시|공기|조각|개|잔|끼)",
+    re.IGNORECASE,
+)
+# 먹은 것을 가리키는 동사 ("먹은", "먹을", "드신") - 대상이 문장 밖에 있음
+_EATING_VERB_RE = re.compile(r"^(?:먹|드셨|드신|드실|마신|마셨)")
+_SUBJECT_PARTICLE_RE = re.compile(r"(?:은|는|이|가|을|를|의|도|만|에|에서|으로|로)$")
+_SUBJECT_RE = re.compile(r"[가-힣A-Za-z0-9]{2,}")
+
+
+@dataclass
+class Route:
+    """라우팅 결과"""
+    kind: str
+    tool: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+    reason: str = ""
+
+
+def _strip_request(text: str) -> str:
+    """검색어로 쓸 수 있게 앞의 인사와 끝의 요청 표현 제거"""
+    return _REQUEST_SUFFIX_RE.sub("", _LEADING_GREETING_RE.sub("", text)).strip()
+
+
+def _has_final_consonant(ch: str) -> bool:
+    code = ord(ch) - 0xAC00
+    return 0 <= code < 11172 and code % 28 != 0
+
+
+def _joins_nouns(token: str) -> bool:
+    """'김치찌개랑', '비빔밥과', '피자와', '라면하고'처럼 다음 명사와 이어주는 조사로 끝나는지"""
+    if token.endswith(("랑", "하고")) and len(token) > 2:
+        return True
+    # 와/과는 받침 규칙이 맞을 때만 (사과, 약과 같은 이름과 구분)
+    if len(token) >= 2 and token[-1] in "와과":
+        return _has_final_consonant(token[-2]) == (token[-1] == "과")
+    return False
+
+
+def _has_subject(text: str) -> bool:
+    """
+    의도 키워드를 뺀 나머지에 대상(음식/지역) 단어가 있는지
+
+    분량("1인분"), 때/끼니("오늘 점심"), 먹는다는 동사만 있으면 대상이 없는 것으로 봅니다.
+    """
+    for token in text.split():
+        token = _SUBJECT_PARTICLE_RE.sub("", token)
+        if not _SUBJECT_RE.fullmatch(token) or token in _GENERIC_WORDS:
+            continue
+        if _QUANTITY_RE.fullmatch(token) or _EATING_VERB_RE.match(token):
+            continue
+        return True
+    return False
+
+
+def classify(message: BaseMessage) -> Route:
+    """
+    현재 사용자 메시지의 경로를 정합니다.
+
+    Args:
+        message: 이번 턴의 사용자 메시지
+
+    Returns:
+        Route (애매하면 kind=agent)
+    """
+    if not isinstance(message, HumanMessage) or not isinstance(message.content, str):
+        return Route(ROUTE_AGENT, reason="image")
+
+    text = " ".join(message.content.split())
+    if not text or len(text) > MAX_FAST_PATH_CHARS:
+        return Route(ROUTE_AGENT, reason="long")
+    if _AGENT_ONLY_RE.search(text):
+        return Route(ROUTE_AGENT, reason="context")
+    if _FOLLOW_UP_RE.search(text):
+        return Route(ROUTE_AGENT, reason="follow_up")
+
+    intents = [name for name, pattern in TOOL_INTENTS if pattern.search(text)]
+    if not intents:
+        if _GREETING_RE.match(text) and not _FOOD_TALK_RE.search(text):
+            return Route(ROUTE_CHAT, reason="greeting")
+        return Route(ROUTE_AGENT, reason="no_intent")
+    if len(intents) > 1:
+        return Route(ROUTE_AGENT, reason="multi_intent")
+
+    tool = intents[0]
+    query = _strip_request(text)
+    # 대상 여러 개("김치찌개랑 된장찌개")나 비교("떡볶이보다 낮은")는 검색 한 번으로 끝나지 않음
+    if _COMPARISON_RE.search(query):
+        return Route(ROUTE_AGENT, reason="comparison")
+    if _LIST_SEPARATOR_RE.search(query) or any(_joins_nouns(t) for t in query.split()[:-1]):
+        return Route(ROUTE_AGENT, reason="multi_subject")
+    # 의도 키워드 말고 대상(음식/지역)이 있어야 함 ("칼로리는?" 같은 후속 질문은 제외)
+    if not _has_subject(dict(TOOL_INTENTS)[tool].sub(" ", query)):
+        return Route(ROUTE_AGENT, reason="no_subject")
+    return Route(ROUTE_TOOL, tool=tool, args={"query": query}, reason=tool)
+
+
+def tool_call_message(route: Route) -> AIMessage:
+    """라우터가 고른 도구 호출 (LLM 없이 만든 tool_calls 메시지)"""
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": route.tool, "args": route.args, "id": f"call_fast_{uuid.uuid4().hex[:12]}"}],
+    )
+
+
+CHAT_PROMPT = """당신은 한국 음식 전문가 AI 어시스턴트입니다.
+사용자의 인사나 가벼운 대화에 한국어로 짧고 친근하게 (1~3문장) 답하고, 이모지를 적절히 사용하세요.
+음식 사진 분석, 식당/메뉴 검색, 레시피, 영양정보를 도와줄 수 있다고 자연스럽게 안내해도 좋습니다."""
+
+ANSWER_PROMPT = """
+## 빠른 답변
+아래 [도구 결과]는 사용자 질문에 맞춰 이미 실행한 검색 결과입니다.
+추가 검색 없이 이 결과만으로 답변하세요. 결과가 부족하면 그렇다고 말하고 더 구체적으로 물어봐 달라고 안내하세요.
+"""
+
+# 빠른 경로에서 함께 보낼 최근 대화 턴 수 (텍스트만)
+FAST_PATH_HISTORY_TURNS = 2
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        block.get("text", "") for block in content or []
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+def fast_path_messages(
+    system: str,
+    messages: Sequence[BaseMessage],
+    summary: str = "",
+    with_tool_results: bool = False,
+) -> List[BaseMessage]:
+    """
+    빠른 경로 LLM 입력 - 시스템 프롬프트 + 최근 대화(텍스트만) + 이번 턴 도구 결과
+
+    도구 호출/결과 메시지는 텍스트로 바꿔 넣으므로 도구 스키마 없이 호출할 수 있습니다.
+    """
+    turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    start = turn_starts[-(FAST_PATH_HISTORY_TURNS + 1)] if turn_starts else 0
+    current = turn_starts[-1] if turn_starts else len(messages)
+
+    if summary:
+        system += f"\n## 이전 대화 요약\n{summary}\n"
+    if with_tool_results:
+        results = [
+            f"[도구 결과: {m.name}]\n{_text(m.content)}"
+            for m in messages[current:] if isinstance(m, ToolMessage)
+        ]
+        system += ANSWER_PROMPT + "\n\n".join(results)
+
+    prepared: List[BaseMessage] = [SystemMessage(content=system)]
+    for message in messages[start:current + 1]:
+        text = _text(message.content)
+        if isinstance(message, HumanMessage):
+            prepared.append(HumanMessage(content=text or "[이미지]"))
+        elif isinstance(message, AIMessage) and text:
+            prepared.append(AIMessage(content=text))
+    return prepared
+
+
+TIER_FAST = "fast"
+TIER_STRONG = "strong"
+
+# 여러 후보 중 고르거나 비교해야 하는 질문 → 강한 모델
+_DISAMBIGUATE_RE = re.compile(r"비교|차이|어떤\s*게|뭐가\s*(?:더|나아)|중에|골라|어디가\s*(?:더|나아)|왜")
+# 이미지 검색 결과는 후보 여러 개를 원본 이미지와 비교해서 판단해야 함
+_IMAGE_TOOLS = {"search_food_by_image"}
+
+
+@dataclass
+class ModelChoice:
+    """모델 선택 결과"""
+    tier: str
+    reason: str
+
+
+def _has_image(message: BaseMessage) -> bool:
+    content = message.content
+    return isinstance(content, list) and any(
+        isinstance(block, dict) and block.get("type") != "text" for block in content
+    )
+
+
+def choose_model(
+    state: Dict[str, Any],
+    node: str,
+    tool_token_threshold: int,
+    long_message_chars: int,
+) -> ModelChoice:
+    """
+    이번 LLM 호출에 쓸 모델 등급을 고릅니다.
+
+    Args:
+        state: 그래프 상태
+        node: 호출하는 노드 (agent / chat / answer)
+        tool_token_threshold: 이번 턴 도구 결과가 이 토큰 수를 넘으면 strong
+        long_message_chars: 사용자 메시지가 이 글자 수를 넘으면 strong
+
+    Returns:
+        ModelChoice (tier, reason)
+    """
+    messages = state["messages"]
+    turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    if not turn_starts:
+        return ModelChoice(TIER_STRONG, "no_user_message")
+    current = messages[turn_starts[-1]]
+    turn = messages[turn_starts[-1] + 1:]
+
+    if _has_image(current):
+        return ModelChoice(TIER_STRONG, "image")
+    tool_results = [m for m in turn if isinstance(m, ToolMessage)]
+    if any(m.name in _IMAGE_TOOLS for m in tool_results):
+        return ModelChoice(TIER_STRONG, "image_candidates")
+    if sum(estimate_tokens(_text(m.content)) for m in tool_results) > tool_token_threshold:
+        return ModelChoice(TIER_STRONG, "large_tool_output")
+
+    text = _text(current.content)
+    if len(text) > long_message_chars:
+        return ModelChoice(TIER_STRONG, "long_message")
+    if _DISAMBIGUATE_RE.search(text):
+        return ModelChoice(TIER_STRONG, "disambiguation")
+
+    reasons = {"chat": "small_talk", "answer": "tool_summary"}
+    return ModelChoice(TIER_FAST, reasons.get(node, "simple"))
+
+
+# 경로/모델 선택 통계 (프로세스 전체)
+_stats: Dict[str, Dict[str, int]] = {"route": {}, "model": {}}
+_stats_lock = threading.Lock()
+
+
+def record_routing(step: str, decision: str, reason: str, ctx: Optional[Any] = None, **extra: Any):
+    """
+    라우팅 결정 기록 - 이번 턴 RunContext.routing + 프로세스 통계
+
+    Args:
+        step: route(턴 경로) 또는 LLM을 호출한 노드 이름
+        decision: 경로(chat/tool/agent/cache) 또는 모델 등급(fast/strong)
+        reason: 결정 근거
+        ctx: 그래프 밖에서 기록할 때의 RunContext (없으면 현재 graph config에서 찾음)
+    """
+    ctx = ctx or get_run_context()
+    if ctx is not None:
+        with ctx._lock:
+            ctx.routing.append({"step": step, "decision": decision, "reason": reason, **extra})
+    kind = "route" if step == "route" else "model"
+    with _stats_lock:
+        _stats[kind][decision] = _stats[kind].get(decision, 0) + 1
+
+
+def get_routing_stats() -> Dict[str, Dict[str, int]]:
+    """경로별 턴 수 / 모델 등급별 LLM 호출 수"""
+    with _stats_lock:
+        return {kind: dict(counts) for kind, counts in _stats.items()}
@@ -0,0 +1,245 @@
+"""턴(요청) 단위 실행 컨텍스트
+
+에이전트가 턴마다 RunContext를 만들어 graph config의
+configurable["run_context"]에 넣으면, 도구와 서비스는 get_run_context()로
+같은 객체를 꺼내 씁니다. (도구가 스레드 풀에서 실행돼도 config는 전달됨)
+"""
+
+import time
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+try:
+    from langgraph.config import get_config, get_stream_writer
+    LANGGRAPH_AVAILABLE = True
+except ImportError:
+    LANGGRAPH_AVAILABLE = False
+
+
+RUN_CONTEXT_KEY = "run_context"
+
+
+class RequestScope:
+    """요청 범위 메모이제이션 - 같은 키는 턴당 한 번만 계산
+
+    여러 도구가 동시에 같은 키를 요청하면 먼저 온 쪽이 계산하고
+    나머지는 그 결과를 기다립니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, threading.Event] = {}
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """계산이 끝난 값 조회 (없으면 default)"""
+        with self._lock:
+            return self._values.get(key, default)
+
+    def set(self, key: Hashable, value: Any):
+        """값을 직접 저장 (기존 값 교체)"""
+        with self._lock:
+            self._values[key] = value
+
+    def once(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """key에 대한 값을 한 번만 계산해서 반환 (예외는 공유하지 않음)"""
+        while True:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+                event = self._pending.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._pending[key] = event
+                    owner = True
+                else:
+                    owner = False
+
+            if not owner:
+                event.wait()
+                continue  # 계산 실패 시 다음 대기자가 다시 시도
+
+            try:
+                value = compute()
+                with self._lock:
+                    self._values[key] = value
+                return value
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+                event.set()
+
+
+class RunCancelled(Exception):
+    """턴이 취소됨 (클라이언트 연결 종료 등) - 남은 도구 작업 중단용"""
+
+
+class DeadlineExceeded(RunCancelled):
+    """턴의 도구 시간 예산을 다 씀"""
+
+
+# 외부 호출 1회에 최소한으로 필요한 시간 (이보다 적게 남으면 호출하지 않음)
+MIN_CALL_TIMEOUT = 0.5
+
+# 취소/시간 초과로 중단된 작업 수 (프로세스 전체)
+_cancel_stats: Dict[str, int] = {"runs": 0, "aborted_calls": 0, "budget_exhausted": 0}
+_cancel_stats_lock = threading.Lock()
+
+
+def _count_cancel(key: str):
+    with _cancel_stats_lock:
+        _cancel_stats[key] += 1
+
+
+def get_cancel_stats() -> Dict[str, int]:
+    """취소된 턴 수 / 취소로 건너뛴 외부 호출 수 / 시간 예산 초과로 건너뛴 호출 수"""
+    with _cancel_stats_lock:
+        return dict(_cancel_stats)
+
+
+@dataclass
+class RunContext:
+    """한 턴 동안 도구/서비스가 공유하는 상태"""
+    run_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    scope: RequestScope = field(default_factory=RequestScope)
+    # 턴 마감 시각 (time.monotonic 기준, None이면 제한 없음)
+    deadline: Optional[float] = None
+    # 도구가 끝난 뒤 LLM이 답변할 시간으로 남겨둘 초
+    reserve_seconds: float = 0.0
+    # 턴 동안 만든 임시 파일 (턴이 끝나면 API에서 삭제)
+    temp_files: List[str] = field(default_factory=list)
+    # 도구가 publish()로 보낸 구조화 이벤트 (스트림이 아닌 /chat 응답에서 사용)
+    published: List[Dict[str, Any]] = field(default_factory=list)
+    # 도구 출력 토큰 사용량 (턴 예산 계산용) / 도구별 원본·최종 크기 기록
+    tool_tokens: int = 0
+    tool_outputs: List[Dict[str, Any]] = field(default_factory=list)
+    # 빠른 경로/모델 선택 결정 (router.record_routing)
+    routing: List[Dict[str, Any]] = field(default_factory=list)
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _cancel_callbacks: List[Callable[[], None]] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def with_budget(cls, seconds: Optional[float], reserve_seconds: float = 0.0) -> "RunContext":
+        """지금부터 seconds초 뒤가 마감인 컨텍스트 (seconds가 없으면 제한 없음)"""
+        deadline = time.monotonic() + seconds if seconds else None
+        return cls(deadline=deadline, reserve_seconds=reserve_seconds)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """도구가 쓸 수 있는 남은 시간(초). 제한이 없으면 None"""
+        if self.deadline is None:
+            return None
+        return self.deadline - self.reserve_seconds - time.monotonic()
+
+    def cancel(self):
+        """턴 취소 - 등록된 콜백(브라우저 작업 취소 등) 실행"""
+        with self._lock:
+            if self._cancel_event.is_set():
+                return
+            self._cancel_event.set()
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        _count_cancel("runs")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        취소 시 실행할 콜백 등록 (이미 취소됐으면 바로 실행)
+
+        Returns:
+            등록 해제 함수 (작업이 끝나면 호출)
+        """
+        with self._lock:
+            if not self._cancel_event.is_set():
+                self._cancel_callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._cancel_callbacks:
+                self._cancel_callbacks.remove(callback)
+
+
+def get_run_context() -> Optional[RunContext]:
+    """현재 실행 중인 graph config에서 RunContext를 꺼냅니다 (그래프 밖이면 None)."""
+    if not LANGGRAPH_AVAILABLE:
+        return None
+    try:
+        config = get_config()
+    except Exception:
+        return None
+    return (config or {}).get("configurable", {}).get(RUN_CONTEXT_KEY)
+
+
+def raise_if_cancelled():
+    """현재 턴이 취소됐으면 RunCancelled (외부 호출 직전에 사용)"""
+    ctx = get_run_context()
+    if ctx is not None and ctx.cancelled:
+        _count_cancel("aborted_calls")
+        raise RunCancelled(f"취소된 요청입니다 (run_id={ctx.run_id})")
+
+
+def track_temp_file(path: str):
+    """턴이 끝나면 삭제할 임시 파일 등록 (그래프 밖이면 무시)"""
+    ctx = get_run_context()
+    if ctx is not None:
+        ctx.temp_files.append(path)
+
+
+def budget_timeout(default: float) -> float:
+    """
+    외부 호출 타임아웃 - 기본값과 턴의 남은 시간 중 작은 값
+
+    Raises:
+        RunCancelled: 턴이 취소됨
+        DeadlineExceeded: 남은 시간이 MIN_CALL_TIMEOUT보다 적음
+    """
+    raise_if_cancelled()
+    ctx = get_run_context()
+    remaining = ctx.remaining() if ctx is not None else None
+    if remaining is None:
+        return default
+    if remaining < MIN_CALL_TIMEOUT:
+        _count_cancel("budget_exhausted")
+        raise DeadlineExceeded(f"시간 예산 초과 (run_id={ctx.run_id})")
+    return min(default, remaining)
+
+
+def budget_exhausted() -> bool:
+    """남은 시간이 없거나 취소된 턴인지 (도구가 부분 결과로 마무리할지 판단)"""
+    ctx = get_run_context()
+    if ctx is None:
+        return False
+    remaining = ctx.remaining()
+    return ctx.cancelled or (remaining is not None and remaining < MIN_CALL_TIMEOUT)
+
+
+def publish(event_type: str, tool: str, data: Dict[str, Any]):
+    """
+    도구의 구조화 결과(식당 카드, 레시피 요약 등)를 클라이언트로 바로 전송
+
+    스트림에는 {"type": event_type, "tool": tool, ...data} 커스텀 이벤트로 나가고,
+    RunContext.published에도 기록됩니다. (그래프 밖이면 무시)
+    """
+    event = {"type": event_type, "tool": tool, **data}
+    ctx = get_run_context()
+    if ctx is not None:
+        with ctx._lock:
+            ctx.published.append(event)
+    if not LANGGRAPH_AVAILABLE:
+        return
+    try:
+        get_stream_writer()(event)
+    except Exception:
+        pass
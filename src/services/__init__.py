@@ -3,12 +3,24 @@
 from .serper import SerperImageSearcher, get_searcher
 from .kakao import KakaoLocalAPI, get_kakao
 from .summarizer import LocalSummarizer, get_summarizer
+from .page_cache import PageCache, get_page_cache
+from .response_cache import ResponseCache, get_response_cache
+from .image_blobs import ImageBlobStore, get_image_blobs
+from .answer_cache import AnswerCache, get_answer_cache
 
 __all__ = [
     "SerperImageSearcher",
     "KakaoLocalAPI",
     "LocalSummarizer",
+    "PageCache",
+    "ResponseCache",
+    "ImageBlobStore",
+    "AnswerCache",
     "get_searcher",
     "get_kakao",
     "get_summarizer",
+    "get_page_cache",
+    "get_response_cache",
+    "get_image_blobs",
+    "get_answer_cache",
 ]
@@ -0,0 +1,235 @@
+"""답변 캐시 - 자주 묻는 사실 질문("비빔밥 칼로리", "김치찌개 레시피")의 최종 답변 재사용
+
+- 키: 도구 종류 + 정규화한 질문 대상 (띄어쓰기/조사/요청 표현/동의어 정규화)
+- 이미지 없는, 이전 대화를 가리키지 않는 턴만 저장 (라우터가 도구 하나로 판단한 턴)
+- 도구 종류별 TTL + 도구 종류별 무효화
+- 선택: sentence-transformers가 설치돼 있고 ANSWER_CACHE_EMBED_MODEL을 지정하면
+  키가 정확히 같지 않아도 같은 도구 안에서 임베딩 유사도로 찾음
+"""
+
+import os
+import re
+import time
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+
+# 답변 형식(프롬프트)을 바꾸면 올려서 이전 답변을 무효화
+ANSWER_CACHE_VERSION = "1"
+
+# 도구 종류별 TTL 기본값 (초) - 식당 정보는 자주 바뀌고 영양정보는 거의 안 바뀜
+DEFAULT_TOOL_TTLS = {
+    "get_nutrition_info": 7 * 24 * 3600,
+    "search_recipe_online": 3 * 24 * 3600,
+    "search_restaurant_info": 24 * 3600,
+}
+
+# 같은 뜻의 표현 → 대표 표현 (띄어쓰기/조사 제거 후 적용 - "만드는"은 "만드"로 잘려 있을 수 있음)
+_SYNONYMS = [
+    (re.compile(r"만드(?:는)?(?:법|방법)|조리법|요리법|끓이(?:는)?(?:법|방법)"), "레시피"),
+    (re.compile(r"열량|kcal"), "칼로리"),
+    (re.compile(r"영양(?:성분|정보)"), "영양정보"),
+    (re.compile(r"음식점|식당추천"), "맛집"),
+]
+# 키에서 빼는 요청 표현
+_REQUEST_RE = re.compile(
+    r"알려(?:줘|주세요|줄래|주라)|추천(?:해(?:줘|주세요|줄래))?|찾아(?:줘|주세요)|검색(?:해(?:줘|주세요))?|"
+    r"가르쳐(?:줘|주세요)|궁금해요?|어때요?|얼마(?:야|예요|에요|나돼)?|뭐야|있어|해줘|정보|좀"
+)
+_PUNCT_RE = re.compile(r"[^\w\s]")
+# 받침 없는 글자 뒤의 조사 / 받침 있는 글자 뒤의 조사 ('이'는 떡볶이 같은 음식 이름과 헷갈려서 제외)
+_VOWEL_PARTICLES = ("는", "가", "를", "도", "의")
+_CONSONANT_PARTICLES = ("은", "을", "도", "의")
+
+
+def _has_final_consonant(ch: str) -> bool:
+    code = ord(ch) - 0xAC00
+    return 0 <= code < 11172 and code % 28 != 0
+
+
+def _strip_particle(token: str) -> str:
+    """어절 끝 조사 하나 제거 ("비빔밥은" → "비빔밥", "피자는" → "피자")"""
+    if len(token) < 3:
+        return token
+    last, prev = token[-1], token[-2]
+    particles = _CONSONANT_PARTICLES if _has_final_consonant(prev) else _VOWEL_PARTICLES
+    return token[:-1] if last in particles else token
+
+
+def normalize_question(text: str) -> str:
+    """
+    질문 정규화 - 띄어쓰기, 조사, 요청 표현, 동의어 차이를 없앱니다.
+
+    "비빔밥 칼로리 알려줘", "비빔밥은 칼로리 얼마야?", "비빔밥 열량" → "비빔밥칼로리"
+    """
+    text = unicodedata.normalize("NFC", text or "").lower()
+    text = _PUNCT_RE.sub(" ", text)
+    tokens = [_strip_particle(token) for token in text.split()]
+    compact = "".join(tokens)
+    for pattern, canonical in _SYNONYMS:
+        compact = pattern.sub(canonical, compact)
+    return _REQUEST_RE.sub("", compact)
+
+
+@dataclass
+class CachedAnswer:
+    """캐시된 답변 + 함께 보낼 구조화 이벤트 (식당 카드, 레시피 요약)"""
+    answer: str
+    tool: str
+    question: str
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    embedding: Optional[Any] = None
+
+
+class AnswerCache:
+    """답변 캐시 - 메모리 LRU + 도구별 TTL + (선택) 임베딩 유사도 조회"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        tool_ttls: Optional[Dict[str, int]] = None,
+        default_ttl: int = 24 * 3600,
+        embed_model: Optional[str] = None,
+        similarity_threshold: float = 0.92,
+    ):
+        self.max_entries = max_entries
+        self.tool_ttls = {**DEFAULT_TOOL_TTLS, **(tool_ttls or {})}
+        self.default_ttl = default_ttl
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0, "invalidated": 0}
+        )
+        self._embedder = None
+        if embed_model and EMBEDDINGS_AVAILABLE:
+            try:
+                self._embedder = SentenceTransformer(embed_model)
+            except Exception as e:
+                print(f"[AnswerCache] 임베딩 모델 로드 실패, 정규화 키만 사용: {e}")
+
+    @staticmethod
+    def make_key(tool: str, question: str) -> str:
+        return f"{ANSWER_CACHE_VERSION}|{tool}|{normalize_question(question)}"
+
+    def _ttl(self, tool: str) -> int:
+        return self.tool_ttls.get(tool, self.default_ttl)
+
+    def _embed(self, question: str) -> Optional[Any]:
+        if self._embedder is None:
+            return None
+        try:
+            return self._embedder.encode(normalize_question(question), normalize_embeddings=True)
+        except Exception as e:
+            print(f"[AnswerCache] 임베딩 실패: {e}")
+            return None
+
+    def _nearest(self, tool: str, embedding: Any, now: float) -> Optional[CachedAnswer]:
+        """같은 도구의 항목 중 코사인 유사도가 가장 높은 항목 (임계값 이상일 때만)"""
+        best, best_score = None, self.similarity_threshold
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.tool != tool or entry.embedding is None or now - entry.created_at >= self._ttl(tool):
+                    continue
+                score = float((entry.embedding * embedding).sum())
+                if score >= best_score:
+                    best, best_score = entry, score
+        return best
+
+    def get(self, tool: str, question: str) -> Optional[CachedAnswer]:
+        """캐시 조회 (정규화 키 → 임베딩 유사도 순, 만료 항목은 삭제)"""
+        key = self.make_key(tool, question)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.created_at >= self._ttl(tool):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats[tool]["hits"] += 1
+                return entry
+
+        embedding = self._embed(question)
+        entry = self._nearest(tool, embedding, now) if embedding is not None else None
+        with self._lock:
+            self._stats[tool]["semantic_hits" if entry is not None else "misses"] += 1
+        return entry
+
+    def put(self, tool: str, question: str, answer: str, events: Optional[List[Dict[str, Any]]] = None):
+        """답변 저장 (events는 캐시 적중 때 다시 보낼 구조화 이벤트)"""
+        entry = CachedAnswer(
+            answer=answer,
+            tool=tool,
+            question=question,
+            events=list(events or []),
+            embedding=self._embed(question),
+        )
+        key = self.make_key(tool, question)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._stats[tool]["stores"] += 1
+
+    def invalidate(self, tool: Optional[str] = None) -> int:
+        """
+        도구 종류별 무효화 (tool이 없으면 전체)
+
+        Returns:
+            삭제한 항목 수
+        """
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if tool is None or e.tool == tool]
+            for key in keys:
+                tool_name = self._entries.pop(key).tool
+                self._stats[tool_name]["invalidated"] += 1
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 + 도구별 hit/miss/hit_rate"""
+        with self._lock:
+            tools = {}
+            for tool, counts in self._stats.items():
+                hits = counts["hits"] + counts["semantic_hits"]
+                total = hits + counts["misses"]
+                tools[tool] = {**counts, "hit_rate": round(hits / total, 3) if total else 0.0}
+            return {"size": len(self._entries), "embeddings": self._embedder is not None, "tools": tools}
+
+
+def _tool_ttls_from_env() -> Dict[str, int]:
+    """ANSWER_CACHE_TTLS: "도구=초" 쉼표 구분 (예: search_restaurant_info=3600)"""
+    ttls = {}
+    for pair in os.getenv("ANSWER_CACHE_TTLS", "").split(","):
+        name, _, seconds = pair.partition("=")
+        if name.strip() and seconds.strip().isdigit():
+            ttls[name.strip()] = int(seconds)
+    return ttls
+
+
+# 싱글톤 인스턴스
+_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    """답변 캐시 싱글톤 인스턴스 반환"""
+    global _cache
+    if _cache is None:
+        _cache = AnswerCache(
+            max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024")),
+            tool_ttls=_tool_ttls_from_env(),
+            embed_model=os.getenv("ANSWER_CACHE_EMBED_MODEL") or None,
+            similarity_threshold=float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.92")),
+        )
+    return _cache
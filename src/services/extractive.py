@@ -0,0 +1,87 @@
+"""추출 요약 - LLM 없이 문장 점수로 핵심 문장만 남기는 로컬 압축기
+
+문장 분리 → 키워드/위치/구조 점수 → 비슷한 문장 제거 → 목표 길이까지 선택 → 원래 순서로 출력.
+GPU나 외부 서버 없이 밀리초 단위로 동작합니다.
+"""
+
+import re
+from typing import Iterable, List, Set
+
+
+# 문장 경계: 줄바꿈, 또는 숫자가 아닌 글자 뒤의 마침표/물음표/느낌표 + 공백 ("1. 재료"는 자르지 않음)
+_SPLIT_RE = re.compile(r"\n+|(?<=[^\d\s][.!?。])\s+")
+# 도구 결과의 구조 줄: "[1] 식당명", "=== 레시피 1 ===", "주소: ...", "1) ..."
+_HEADER_RE = re.compile(r"^(?:\[|=== |\d+[.)]\s|[^\s:]{1,10}:)")
+_DIGIT_RE = re.compile(r"\d")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """텍스트를 문장/줄 단위로 분리"""
+    return [s.strip() for s in _SPLIT_RE.split(text) if s and s.strip()]
+
+
+def _shingles(sentence: str, n: int = 3) -> Set[str]:
+    """공백을 뺀 글자 n-gram 집합 (유사 문장 비교용)"""
+    compact = _SPACE_RE.sub("", sentence)
+    if len(compact) <= n:
+        return {compact}
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def extract_summary(
+    text: str,
+    target_chars: int,
+    keywords: Iterable[str] = (),
+    dedup_threshold: float = 0.7,
+) -> str:
+    """
+    핵심 문장만 골라 target_chars 안팎으로 줄입니다.
+
+    Args:
+        text: 원문 (도구 결과)
+        target_chars: 목표 길이 (글자 수)
+        keywords: 점수를 올릴 키워드 (도구별 음식/후기 키워드)
+        dedup_threshold: 이미 고른 문장과 글자 3-gram 유사도가 이 값 이상이면 제외
+
+    Returns:
+        고른 문장을 원래 순서대로 줄바꿈으로 이은 텍스트 (원문이 더 짧으면 원문)
+    """
+    if len(text) <= target_chars:
+        return text
+
+    keywords = list(keywords)
+    sentences = split_sentences(text)
+    count = len(sentences)
+    scored = []
+    for i, sentence in enumerate(sentences):
+        score = 2.0 * sum(1 for kw in keywords if kw in sentence)
+        score += 1.0 - i / count  # 도구 결과는 앞쪽에 핵심 정보가 옴
+        if _HEADER_RE.match(sentence):
+            score += 3.0  # 식당명/주소/레시피 제목 같은 구조 줄
+        if _DIGIT_RE.search(sentence):
+            score += 0.5  # 가격, 칼로리, 분량
+        if len(sentence) < 8:
+            score -= 1.0
+        scored.append((score, i, sentence))
+
+    chosen = []
+    chosen_shingles: List[Set[str]] = []
+    total = 0
+    for _, i, sentence in sorted(scored, key=lambda item: (-item[0], item[1])):
+        if total >= target_chars:
+            break
+        shingles = _shingles(sentence)
+        if any(_jaccard(shingles, other) >= dedup_threshold for other in chosen_shingles):
+            continue
+        chosen.append((i, sentence))
+        chosen_shingles.append(shingles)
+        total += len(sentence) + 1
+
+    return "\n".join(sentence for _, sentence in sorted(chosen))
@@ -0,0 +1,198 @@
+"""URL 정규화 + 턴 단위 중복 요청 제거 HTTP 페처
+
+- canonicalize_url: 모바일 페이지 치환, 추적 파라미터 제거, 리다이렉트 메모이제이션
+- fetch_url: 같은 턴 안에서는 정규화된 URL당 최대 한 번만 요청 (본문 바이트를 공유하고 호출자별로 디코딩)
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+from ..runtime import get_run_context, budget_timeout
+
+
+# 검색 결과/공유 링크에 붙는 추적 파라미터
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "igshid", "srsltid", "mc_cid", "mc_eid",
+    "_ga", "trackingCode", "fromRss",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+_REDIRECT_MEMO_SIZE = 2048
+_redirects: "OrderedDict[str, str]" = OrderedDict()
+_redirects_lock = threading.Lock()
+
+
+@dataclass
+class FetchResult:
+    """HTTP 응답 요약 (호출자 인코딩으로 디코딩한 본문)"""
+    url: str
+    status_code: int
+    text: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RawResponse:
+    """디코딩 전 HTTP 응답 (턴 범위에서 URL당 하나를 공유)"""
+    url: str
+    status_code: int
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None  # 응답 헤더/본문으로 추정한 인코딩
+
+    def decode(self, encoding: Optional[str] = None) -> FetchResult:
+        """호출자가 지정한 인코딩(없으면 추정한 인코딩)으로 본문 디코딩"""
+        text = ""
+        if self.status_code == 200 and self.content:
+            try:
+                text = str(self.content, encoding or self.encoding or "utf-8", errors="replace")
+            except LookupError:
+                text = str(self.content, "utf-8", errors="replace")
+        return FetchResult(url=self.url, status_code=self.status_code, text=text, headers=self.headers)
+
+
+def _rewrite_host(host: str, path: str, query: List[Tuple[str, str]]) -> tuple:
+    """사이트별 크롤링에 유리한 주소로 치환"""
+    # 네이버 블로그: 본문이 iframe 밖에 있는 모바일 페이지 사용
+    if host == "blog.naver.com":
+        host = "m.blog.naver.com"
+    if host == "m.blog.naver.com" and path.lower().startswith("/postview"):
+        params = dict(query)
+        blog_id = params.get("blogId")
+        log_no = params.get("logNo")
+        if blog_id and log_no:
+            path = f"/{blog_id}/{log_no}"
+            query = []
+
+    # 만개의레시피: 셀렉터가 데스크톱 페이지 기준
+    if host in ("m.10000recipe.com", "10000recipe.com"):
+        host = "www.10000recipe.com"
+
+    return host, path, query
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL을 정규화합니다. 요청 전에 적용해서 첫 요청부터 최종 주소로 보냅니다.
+
+    Args:
+        url: 원본 URL
+
+    Returns:
+        정규화된 URL (리다이렉트가 기억돼 있으면 최종 주소)
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower()
+    port = parts.port
+    # 같은 키가 여러 번 나와도 값을 모두 유지 (a=1&a=2)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in TRACKING_PARAMS and not k.startswith(TRACKING_PREFIXES)
+    ]
+    path = parts.path or "/"
+
+    host, path, query = _rewrite_host(host, path, query)
+
+    netloc = host
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        netloc = f"{host}:{port}"
+
+    canonical = urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ""))
+
+    with _redirects_lock:
+        target = _redirects.get(canonical)
+        if target:
+            _redirects.move_to_end(canonical)
+            return target
+    return canonical
+
+
+def _remember_redirect(source: str, final_url: str):
+    """리다이렉트 결과를 기억해서 다음부터 최종 주소로 바로 요청"""
+    target = canonicalize_url(final_url)
+    if not target or target == source:
+        return
+    with _redirects_lock:
+        _redirects[source] = target
+        _redirects.move_to_end(source)
+        while len(_redirects) > _REDIRECT_MEMO_SIZE:
+            _redirects.popitem(last=False)
+
+
+def _request(url: str, headers: Dict[str, str], timeout: float) -> RawResponse:
+    # 턴의 남은 시간이 기본 타임아웃보다 적으면 남은 시간까지만 대기
+    resp = requests.get(url, headers=headers, timeout=budget_timeout(timeout))
+    if resp.history and resp.url:
+        _remember_redirect(url, resp.url)
+    ok = resp.status_code == 200
+    return RawResponse(
+        url=url,
+        status_code=resp.status_code,
+        content=resp.content if ok else b"",
+        headers={
+            k: resp.headers[k] for k in ("ETag", "Last-Modified") if resp.headers.get(k)
+        },
+        encoding=(resp.encoding or resp.apparent_encoding) if ok else None,
+    )
+
+
+def fetch_url(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10,
+    encoding: Optional[str] = None,
+    validators: Optional[Dict[str, str]] = None,
+) -> FetchResult:
+    """
+    정규화된 URL로 GET 요청합니다. 그래프 실행 중이면 턴당 한 번만 요청합니다.
+
+    Args:
+        url: 요청 URL (내부에서 정규화)
+        headers: 요청 헤더
+        timeout: 타임아웃(초)
+        encoding: 응답 인코딩 강제 지정
+        validators: 조건부 요청 헤더 (If-None-Match / If-Modified-Since)
+
+    Returns:
+        FetchResult (304면 text가 비어 있음)
+    """
+    url = canonicalize_url(url)
+    request_headers = dict(headers or {})
+    if validators:
+        request_headers.update(validators)
+
+    ctx = get_run_context()
+    if ctx is None:
+        return _request(url, request_headers, timeout).decode(encoding)
+
+    # 정규화된 URL만으로 키를 잡아 도구마다 헤더/인코딩이 달라도 한 번만 요청
+    # (헤더는 먼저 요청한 도구 것을 쓰고, 본문은 바이트로 공유해서 호출자 인코딩으로 디코딩)
+    key = ("fetch", url)
+    cached = ctx.scope.peek(key)
+    if cached is not None and (cached.status_code != 304 or validators):
+        return cached.decode(encoding)
+
+    raw = ctx.scope.once(key, lambda: _request(url, request_headers, timeout))
+
+    # 다른 도구의 조건부 요청이 304였는데 본문이 필요한 경우만 다시 요청
+    if raw.status_code == 304 and not validators:
+        raw = _request(url, dict(headers or {}), timeout)
+        ctx.scope.set(key, raw)
+    return raw.decode(encoding)
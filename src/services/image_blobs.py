@@ -0,0 +1,145 @@
+"""대화 이미지 저장소 - 내용 해시(sha256)로 한 번만 저장
+
+대화 히스토리(체크포인트)에는 base64 대신 이미지 ID만 남기고,
+LLM을 호출할 때 현재 턴의 이미지만 이 저장소에서 꺼내 인라인으로 보냅니다.
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Optional, Dict, Tuple
+
+from .storage import ThreadLocalSQLite
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_blobs (
+    id TEXT PRIMARY KEY,
+    mime_type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_image_blobs_last_access ON image_blobs (last_access);
+"""
+
+
+def image_id(data: bytes) -> str:
+    """이미지 ID (내용 sha256 hex) - 같은 사진은 몇 번 올려도 한 번만 저장"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImageBlobStore:
+    """대화 이미지 SQLite 저장소
+
+    - ID는 내용 해시라 여러 워커가 같은 파일을 공유해도 그대로 재사용
+    - ttl_seconds 동안 조회가 없으면 prune_expired()에서 삭제
+    - 전체 크기가 max_bytes를 넘으면 last_access 기준 LRU 삭제
+    """
+
+    def __init__(
+        self,
+        path: str = "image_blobs.sqlite3",
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_bytes: int = 500 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._db = ThreadLocalSQLite(path, _SCHEMA)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {"stores": 0, "dedup": 0, "hits": 0, "misses": 0, "evictions": 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def put(self, data: bytes, mime_type: str) -> str:
+        """이미지 저장 후 ID 반환 (이미 있으면 접근 시각만 갱신)"""
+        blob_id = image_id(data)
+        now = time.time()
+        conn = self._db.get()
+        cur = conn.execute(
+            "UPDATE image_blobs SET last_access = ? WHERE id = ?", (now, blob_id)
+        )
+        if cur.rowcount:
+            self._count("dedup")
+            return blob_id
+        conn.execute(
+            "INSERT OR IGNORE INTO image_blobs (id, mime_type, data, size, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (blob_id, mime_type, sqlite3.Binary(data), len(data), now, now),
+        )
+        self._count("stores")
+        self._evict(conn)
+        return blob_id
+
+    def get(self, blob_id: str) -> Optional[Tuple[bytes, str]]:
+        """(이미지 바이트, MIME 타입) 조회 (없으면 None)"""
+        try:
+            conn = self._db.get()
+            row = conn.execute(
+                "SELECT data, mime_type FROM image_blobs WHERE id = ?", (blob_id,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE image_blobs SET last_access = ? WHERE id = ?", (time.time(), blob_id)
+                )
+        except sqlite3.Error as e:
+            print(f"[ImageBlobs] 조회 실패: {e}")
+            return None
+        self._count("hits" if row else "misses")
+        return (bytes(row[0]), row[1]) if row else None
+
+    def _evict(self, conn: sqlite3.Connection):
+        """전체 크기가 max_bytes를 넘으면 오래 안 쓴 이미지부터 90%까지 삭제"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM image_blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        rows = conn.execute(
+            "SELECT id, size FROM image_blobs ORDER BY last_access ASC"
+        ).fetchall()
+        for blob_id, size in rows:
+            if total <= target:
+                break
+            conn.execute("DELETE FROM image_blobs WHERE id = ?", (blob_id,))
+            total -= size
+            removed += 1
+        self._count("evictions", removed)
+
+    def prune_expired(self) -> int:
+        """ttl_seconds 동안 조회가 없는 이미지 삭제, 삭제한 개수 반환"""
+        if self.ttl_seconds <= 0:
+            return 0
+        cur = self._db.get().execute(
+            "DELETE FROM image_blobs WHERE last_access < ?", (time.time() - self.ttl_seconds,)
+        )
+        self._count("evictions", cur.rowcount)
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 통계"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+# 싱글톤 인스턴스
+_image_blobs: Optional[ImageBlobStore] = None
+
+
+def get_image_blobs() -> ImageBlobStore:
+    """대화 이미지 저장소 싱글톤 인스턴스 반환"""
+    global _image_blobs
+    if _image_blobs is None:
+        _image_blobs = ImageBlobStore(
+            path=os.getenv("IMAGE_BLOB_PATH", "image_blobs.sqlite3"),
+            ttl_seconds=int(os.getenv("IMAGE_BLOB_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_bytes=int(os.getenv("IMAGE_BLOB_MAX_MB", "500")) * 1024 * 1024,
+        )
+    return _image_blobs
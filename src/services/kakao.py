@@ -3,7 +3,7 @@
 import os
 import re
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 from collections import Counter
 
 try:
@@ -24,6 +24,15 @@ try:
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+from .response_cache import get_response_cache
+from ..runtime import get_run_context, raise_if_cancelled, budget_timeout, RunCancelled
+
+
+# 후기 문장으로 인정하는 키워드 (도구 결과 압축에서도 사용)
+REVIEW_KEYWORDS = ['맛있', '좋', '추천', '또', '최고', '아쉬', '별로', '짜',
+                   '친절', '불친절', '웨이팅', '기다', '양이', '가성비',
+                   '재방문', '단골', '인정', '대박', '실망', '만족', '냄새']
+
 
 class KakaoLocalAPI:
     """카카오 로컬 API를 활용한 식당 정보 검색"""
@@ -37,11 +46,21 @@ class KakaoLocalAPI:
         if not self.api_key:
             return None
 
+        params = {"category_group_code": "FD6", "size": 5}
+        return get_response_cache().get_or_call(
+            "kakao.keyword", query, params, lambda: self._search_keyword(query, params)
+        )
+
+    def _search_keyword(self, query: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """카카오 키워드 검색 API 호출 (캐시 미적용)"""
         headers = {"Authorization": f"KakaoAK {self.api_key}"}
-        params = {"query": query, "category_group_code": "FD6", "size": 5}
 
+        raise_if_cancelled()
         try:
-            response = requests.get(self.base_url, headers=headers, params=params, timeout=10)
+            response = requests.get(
+                self.base_url, headers=headers, params={"query": query, **params},
+                timeout=budget_timeout(10),
+            )
             if response.status_code == 200:
                 return response.json()
         except:
@@ -59,11 +78,22 @@ class KakaoLocalAPI:
         if not api_key:
             return ""
 
+        return get_response_cache().get_or_call(
+            "serper.menu", query, {"gl": "kr", "hl": "ko"},
+            lambda: self._search_menu(query, api_key),
+        )
+
+    def _search_menu(self, query: str, api_key: str) -> str:
+        """Serper 검색 후 스니펫 정리 (캐시 미적용)"""
         headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
         data = {"q": query, "gl": "kr", "hl": "ko"}
 
+        raise_if_cancelled()
         try:
-            response = requests.post("https://google.serper.dev/search", headers=headers, json=data, timeout=10)
+            response = requests.post(
+                "https://google.serper.dev/search", headers=headers, json=data,
+                timeout=budget_timeout(10),
+            )
             if response.status_code != 200:
                 return ""
 
@@ -78,6 +108,45 @@ class KakaoLocalAPI:
         except:
             return ""
 
+    @staticmethod
+    def _run_browser_task(fetch: Callable[[], Awaitable[str]], timeout: float = 45) -> str:
+        """
+        Playwright 코루틴을 이 스레드의 이벤트 루프에서 실행합니다.
+        턴이 취소되거나 시간 예산이 끝나면 작업을 취소해서 브라우저를 바로 닫습니다.
+        (fetch 안에서는 except Exception만 사용 - bare except는 CancelledError까지 잡아서
+        취소 후에도 크롤링이 계속됨)
+        """
+        ctx = get_run_context()
+        try:
+            timeout = budget_timeout(timeout)
+        except RunCancelled:
+            return ""
+
+        async def _main():
+            task = asyncio.ensure_future(fetch())
+            unregister = lambda: None
+            if ctx is not None:
+                loop = asyncio.get_running_loop()
+                unregister = ctx.on_cancel(lambda: loop.call_soon_threadsafe(task.cancel))
+            try:
+                return await asyncio.wait_for(task, timeout)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                return ""
+            finally:
+                unregister()
+
+        try:
+            return asyncio.run(_main())
+        except RuntimeError:
+            # 이미 이벤트 루프가 도는 스레드에서 호출된 경우
+            try:
+                import nest_asyncio
+                nest_asyncio.apply()
+                loop = asyncio.get_event_loop()
+                return loop.run_until_complete(_main())
+            except Exception:
+                return ""
+
     def get_menu_via_playwright(self, place_id: str) -> str:
         """Playwright로 카카오맵에서 메뉴 텍스트 크롤링"""
         if not PLAYWRIGHT_AVAILABLE:
@@ -100,7 +169,7 @@ class KakaoLocalAPI:
                         if menu_tab:
                             await menu_tab.click()
                             await page.wait_for_timeout(2000)
-                    except:
+                    except Exception:
                         pass
 
                     for _ in range(5):
@@ -121,25 +190,17 @@ class KakaoLocalAPI:
                                     text not in seen and '블로그' not in text):
                                     seen.add(text)
                                     menu_lines.append(text)
-                        except:
+                        except Exception:
                             pass
 
-                    menu_text = '\n'.join(menu_lines[:60])
+                    # 메뉴 개수 제한은 도구의 토큰 예산에서 처리
+                    menu_text = '\n'.join(menu_lines)
                     await browser.close()
-            except:
+            except Exception:
                 pass
             return menu_text
 
-        try:
-            return asyncio.run(_fetch_menu())
-        except:
-            try:
-                import nest_asyncio
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                return loop.run_until_complete(_fetch_menu())
-            except:
-                return ""
+        return self._run_browser_task(_fetch_menu)
 
     def get_reviews_via_playwright(self, place_id: str, max_reviews: int = 15) -> str:
         """Playwright로 카카오맵에서 후기 크롤링"""
@@ -171,7 +232,7 @@ class KakaoLocalAPI:
                                 await page.wait_for_timeout(2000)
                                 tab_clicked = True
                                 break
-                        except:
+                        except Exception:
                             continue
 
                     is_blog_fallback = False
@@ -196,14 +257,14 @@ class KakaoLocalAPI:
                         if line == '별점' and i + 1 < len(lines):
                             try:
                                 result["rating"] = float(lines[i + 1])
-                            except:
+                            except Exception:
                                 pass
                         if '후기' in line and i + 1 < len(lines):
                             try:
                                 count = int(lines[i + 1].replace(',', ''))
                                 if count > result["review_count"]:
                                     result["review_count"] = count
-                            except:
+                            except Exception:
                                 pass
 
                     tag_names = ['맛', '가성비', '친절', '분위기', '주차', '청결', '양']
@@ -214,22 +275,18 @@ class KakaoLocalAPI:
                                 try:
                                     count = int(next_line.replace('명', '').replace(',', ''))
                                     result["tags"][line] = count
-                                except:
+                                except Exception:
                                     pass
 
                     reviews = []
                     seen = set()
-                    review_keywords = ['맛있', '좋', '추천', '또', '최고', '아쉬', '별로', '짜',
-                                      '친절', '불친절', '웨이팅', '기다', '양이', '가성비',
-                                      '재방문', '단골', '인정', '대박', '실망', '만족', '냄새']
-
                     for line in lines:
                         if 15 < len(line) < 300 and line not in seen:
                             if line.startswith('http') or '원' in line[:8]:
                                 continue
                             if any(skip in line for skip in ['더보기', '접기', '신고', '공유', '저장', '로그인', '바로가기']):
                                 continue
-                            if any(kw in line for kw in review_keywords):
+                            if any(kw in line for kw in REVIEW_KEYWORDS):
                                 seen.add(line)
                                 reviews.append(line)
                                 if len(reviews) >= max_reviews:
@@ -260,16 +317,7 @@ class KakaoLocalAPI:
 
             return '\n'.join(output) if output else "후기를 찾을 수 없습니다."
 
-        try:
-            return asyncio.run(_fetch_reviews())
-        except:
-            try:
-                import nest_asyncio
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                return loop.run_until_complete(_fetch_reviews())
-            except:
-                return ""
+        return self._run_browser_task(_fetch_reviews)
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,197 @@
+"""내장 한국 음식 영양 DB - 자모 단위 퍼지 매칭 인덱스
+
+자주 묻는 음식(비빔밥, 김치찌개 등)의 칼로리는 웹 검색 없이 바로 응답합니다.
+데이터: src/data/korean_food_nutrition.csv (1인분 대표값, 조리법에 따라 차이 있음)
+"""
+
+import os
+import re
+import csv
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, List, Dict, Set, Tuple
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "korean_food_nutrition.csv"
+
+# 검색어에서 음식명 외의 표현 제거
+_QUERY_NOISE = re.compile(
+    r"(1|한)\s*(인분|그릇|공기|접시|개|줄)|칼로리|열량|kcal|영양\s*(정보|성분)?|"
+    r"탄수화물|단백질|지방|나트륨|성분|몇|얼마(나|야|예요|에요)?|알려\s*(줘|주세요)|"
+    r"궁금해|좀|정도|인가요|나요|\?",
+    re.I,
+)
+_PARTICLE = re.compile(r"(은|는|의|을|를)$")
+_ENDING = re.compile(r"^(야|요|예요|에요|이야|이에요|인지|돼|돼요|되나요|돼\?)$")
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해 (오타/받침 차이 허용용)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(chr(0x1100 + code // 588))
+            out.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                out.append(chr(0x11A7 + code % 28))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def food_key(text: str) -> str:
+    """음식명 정규화 키 (한글/영숫자만, 소문자)"""
+    return re.sub(r"[^0-9a-zA-Z가-힣]", "", text or "").lower()
+
+
+def extract_food_name(query: str) -> str:
+    """'비빔밥 칼로리 알려줘' → '비빔밥'"""
+    text = _QUERY_NOISE.sub(" ", query or "")
+    tokens = [_PARTICLE.sub("", t) for t in text.split() if not _ENDING.match(t)]
+    return food_key("".join(tokens))
+
+
+def _bigrams(jamo: str) -> Set[str]:
+    return {jamo[i:i + 2] for i in range(len(jamo) - 1)} or {jamo}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+@dataclass(frozen=True)
+class NutritionFact:
+    """음식 1회 제공량 기준 영양정보"""
+    name: str
+    serving: str
+    serving_g: float
+    kcal: float
+    carbs_g: float
+    protein_g: float
+    fat_g: float
+    sodium_mg: float
+
+    def to_text(self) -> str:
+        return "\n".join([
+            f"[영양정보: {self.name}]",
+            f"기준: {self.serving} ({self.serving_g:g}g)",
+            f"- 열량: {self.kcal:g} kcal",
+            f"- 탄수화물: {self.carbs_g:g} g",
+            f"- 단백질: {self.protein_g:g} g",
+            f"- 지방: {self.fat_g:g} g",
+            f"- 나트륨: {self.sodium_mg:g} mg",
+            "출처: 내장 한국 음식 영양 DB (식약처 식품영양성분 DB 기반 대표값, 조리법/식당에 따라 차이 있음)",
+        ])
+
+
+@dataclass
+class NutritionMatch:
+    """검색 결과 + 매칭 신뢰도 (0~1)"""
+    fact: NutritionFact
+    score: float
+    matched: str
+
+
+class NutritionIndex:
+    """음식명 → 영양정보 인메모리 인덱스
+
+    - 정확히 일치(이름/별칭): 1.0
+    - 자모 편집거리 유사도: 오타, 받침 차이 (김치찌게 → 김치찌개)
+    - 포함 관계: 앞에 수식어가 붙은 이름 (엄마표 김치찌개 → 김치찌개)
+      이름이 검색어 끝(중심 명사)에 있을 때만 인정하고 CONTAINMENT_MAX_SCORE를 넘지 않음
+      (김치찜 ≠ 김치, 짬뽕밥 ≠ 짬뽕 - 수식어가 양을 바꿀 수 있어 웹 검색으로 확인)
+
+    편집거리는 자모 bigram 겹침이 많은 상위 후보에만 계산합니다.
+    """
+
+    MAX_CANDIDATES = 8
+    # NUTRITION_LOCAL_MIN_SCORE(기본 0.86)보다 낮게 유지
+    CONTAINMENT_MAX_SCORE = 0.85
+
+    def __init__(self, facts: List[NutritionFact], aliases: Dict[str, int]):
+        self.facts = facts
+        self._keys: Dict[str, int] = aliases          # 정규화 키 → fact 번호
+        self._jamo: Dict[str, str] = {k: decompose_jamo(k) for k in aliases}
+        self._postings: Dict[str, List[str]] = defaultdict(list)  # 자모 bigram → 키
+        for key, jamo in self._jamo.items():
+            for gram in _bigrams(jamo):
+                self._postings[gram].append(key)
+
+    @classmethod
+    def load(cls, path: Path = DATA_PATH) -> "NutritionIndex":
+        facts: List[NutritionFact] = []
+        keys: Dict[str, int] = {}
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                fact = NutritionFact(
+                    name=row["name"],
+                    serving=row["serving"],
+                    serving_g=float(row["serving_g"]),
+                    kcal=float(row["kcal"]),
+                    carbs_g=float(row["carbs_g"]),
+                    protein_g=float(row["protein_g"]),
+                    fat_g=float(row["fat_g"]),
+                    sodium_mg=float(row["sodium_mg"]),
+                )
+                facts.append(fact)
+                for name in [row["name"], *filter(None, row["aliases"].split("|"))]:
+                    keys.setdefault(food_key(name), len(facts) - 1)
+        return cls(facts, keys)
+
+    def _score(self, query_key: str, query_jamo: str, key: str) -> float:
+        if query_key == key:
+            return 1.0
+        jamo = self._jamo[key]
+        similarity = 1 - _edit_distance(query_jamo, jamo) / max(len(query_jamo), len(jamo))
+        if query_key.endswith(key):
+            contained = min(0.7 + 0.3 * len(key) / len(query_key), self.CONTAINMENT_MAX_SCORE)
+            similarity = max(similarity, contained)
+        return similarity
+
+    def lookup(self, query: str) -> Optional[NutritionMatch]:
+        """검색어에서 음식명을 뽑아 가장 비슷한 항목 반환"""
+        query_key = extract_food_name(query)
+        if not query_key:
+            return None
+
+        if query_key in self._keys:
+            return NutritionMatch(self.facts[self._keys[query_key]], 1.0, query_key)
+
+        query_jamo = decompose_jamo(query_key)
+        overlap: Dict[str, int] = defaultdict(int)
+        for gram in _bigrams(query_jamo):
+            for key in self._postings.get(gram, ()):
+                overlap[key] += 1
+        candidates = sorted(overlap, key=overlap.__getitem__, reverse=True)[:self.MAX_CANDIDATES]
+        candidates += [key for key in self._keys if query_key.endswith(key) and key not in candidates]
+
+        best: Optional[Tuple[float, int, str]] = None
+        for key in candidates:
+            score = self._score(query_key, query_jamo, key)
+            # 동점이면 더 긴(구체적인) 이름 우선
+            if best is None or (score, len(key)) > (best[0], best[1]):
+                best = (score, len(key), key)
+
+        if best is None:
+            return None
+        return NutritionMatch(self.facts[self._keys[best[2]]], round(best[0], 3), best[2])
+
+
+# 싱글톤 인스턴스
+_index: Optional[NutritionIndex] = None
+
+
+def get_nutrition_db() -> NutritionIndex:
+    """영양 DB 인덱스 싱글톤 반환 (최초 호출 시 CSV 로드)"""
+    global _index
+    if _index is None:
+        _index = NutritionIndex.load(Path(os.getenv("NUTRITION_DB_PATH", str(DATA_PATH))))
+    return _index
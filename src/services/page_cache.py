@@ -0,0 +1,247 @@
+"""크롤링 페이지 디스크 캐시 - 조건부 요청(ETag/Last-Modified) + TTL + LRU 용량 제한"""
+
+import os
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, Callable
+
+from .storage import ThreadLocalSQLite
+from .fetcher import canonicalize_url, fetch_url
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    namespace TEXT NOT NULL,
+    url TEXT NOT NULL,
+    text TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (namespace, url)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access);
+"""
+
+
+@dataclass
+class CachedPage:
+    """캐시된 페이지 (추출된 텍스트)"""
+    url: str
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class PageCache:
+    """추출 텍스트를 URL 단위로 저장하는 SQLite 디스크 캐시
+
+    - namespace: 추출 방식이 도구마다 달라서 (recipe, nutrition, blog) 구분 저장
+    - TTL 이내면 네트워크 요청 없이 반환
+    - TTL이 지나면 If-None-Match / If-Modified-Since로 재검증 (304면 재사용)
+    - 전체 크기가 max_bytes를 넘으면 last_access 기준 LRU 삭제
+    - WAL 모드라 여러 uvicorn 워커가 같은 파일을 공유해도 안전
+    """
+
+    def __init__(
+        self,
+        path: str = "page_cache.sqlite3",
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_bytes: int = 200 * 1024 * 1024,
+        enabled: bool = True,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._db = ThreadLocalSQLite(path, _SCHEMA)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """정규화된 URL을 키로 사용"""
+        return canonicalize_url(url)
+
+    def get(self, namespace: str, url: str) -> Optional[CachedPage]:
+        """캐시 항목 조회 (만료 여부와 무관)"""
+        try:
+            row = self._db.get().execute(
+                "SELECT url, text, etag, last_modified, fetched_at FROM pages "
+                "WHERE namespace = ? AND url = ?",
+                (namespace, self._cache_key(url)),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[PageCache] 조회 실패: {e}")
+            self._count("errors")
+            return None
+        return CachedPage(*row) if row else None
+
+    def put(
+        self,
+        namespace: str,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """추출 텍스트 저장 후 용량 초과 시 LRU 삭제"""
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        try:
+            conn = self._db.get()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(namespace, url, text, etag, last_modified, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (namespace, self._cache_key(url), text, etag, last_modified, now, now, size),
+            )
+            self._count("stores")
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"[PageCache] 저장 실패: {e}")
+            self._count("errors")
+
+    def _touch(self, namespace: str, url: str, revalidated: bool = False):
+        """LRU 접근 시각 갱신 (재검증 성공 시 fetched_at도 갱신)"""
+        now = time.time()
+        try:
+            if revalidated:
+                self._db.get().execute(
+                    "UPDATE pages SET last_access = ?, fetched_at = ? WHERE namespace = ? AND url = ?",
+                    (now, now, namespace, self._cache_key(url)),
+                )
+            else:
+                self._db.get().execute(
+                    "UPDATE pages SET last_access = ? WHERE namespace = ? AND url = ?",
+                    (now, namespace, self._cache_key(url)),
+                )
+        except sqlite3.Error:
+            self._count("errors")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 90%까지 삭제"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = 0
+            rows = conn.execute(
+                "SELECT namespace, url, size FROM pages ORDER BY last_access ASC"
+            ).fetchall()
+            for namespace, url, size in rows:
+                if total <= target:
+                    break
+                conn.execute(
+                    "DELETE FROM pages WHERE namespace = ? AND url = ?", (namespace, url)
+                )
+                total -= size
+                removed += 1
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("evictions", removed)
+
+    def fetch(
+        self,
+        url: str,
+        extract: Callable[[str, str], str],
+        namespace: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        encoding: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        캐시를 거쳐 페이지를 가져오고 추출 텍스트를 반환합니다.
+
+        Args:
+            url: 페이지 URL (내부에서 정규화)
+            extract: (html, url) -> 추출 텍스트. 빈 문자열이면 캐시하지 않음
+            namespace: 추출 방식 구분자
+            headers: 요청 헤더
+            timeout: 요청 타임아웃(초)
+            encoding: 응답 인코딩 강제 지정
+
+        Returns:
+            추출 텍스트. 페이지 로드 실패(200/304 이외) 시 None
+        """
+        url = canonicalize_url(url)
+        entry = self.get(namespace, url) if self.enabled else None
+
+        if entry and time.time() - entry.fetched_at < self.ttl_seconds:
+            self._touch(namespace, url)
+            self._count("hits")
+            return entry.text
+
+        validators = {}
+        if entry:
+            if entry.etag:
+                validators["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                validators["If-Modified-Since"] = entry.last_modified
+
+        resp = fetch_url(
+            url, headers=headers, timeout=timeout, encoding=encoding, validators=validators or None
+        )
+
+        if resp.status_code == 304 and entry:
+            self._touch(namespace, url, revalidated=True)
+            self._count("revalidated")
+            return entry.text
+
+        if resp.status_code != 200:
+            return None
+
+        self._count("misses")
+        text = extract(resp.text, url)
+
+        if text and self.enabled:
+            self.put(
+                namespace,
+                url,
+                text,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+# 싱글톤 인스턴스
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    """페이지 캐시 싱글톤 인스턴스 반환"""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache(
+            path=os.getenv("PAGE_CACHE_PATH", "page_cache.sqlite3"),
+            ttl_seconds=int(os.getenv("PAGE_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_bytes=int(os.getenv("PAGE_CACHE_MAX_MB", "200")) * 1024 * 1024,
+            enabled=os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true",
+        )
+    return _page_cache
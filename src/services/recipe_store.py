@@ -0,0 +1,236 @@
+"""구조화 레시피 저장소 - URL / 음식명으로 색인된 로컬 SQLite"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Optional, List
+
+from .storage import ThreadLocalSQLite
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recipes_name_key ON recipes (name_key);
+CREATE INDEX IF NOT EXISTS idx_recipes_last_access ON recipes (last_access);
+CREATE TABLE IF NOT EXISTS recipe_queries (
+    query_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (query_key, url)
+);
+"""
+
+# 검색어에서 음식명만 남기기 위해 제거하는 표현
+_QUERY_NOISE = re.compile(r"(황금\s*)?레시피|만드는\s*(법|방법)|만들기|요리법|조리법|알려\s*줘|추천")
+
+
+def dish_key(text: str) -> str:
+    """음식명/검색어 정규화 키 (공백, 레시피 관련 표현 제거)"""
+    text = _QUERY_NOISE.sub(" ", text or "")
+    return re.sub(r"[^0-9a-zA-Z가-힣]", "", text).lower()
+
+
+@dataclass
+class StructuredRecipe:
+    """JSON-LD / microdata에서 추출한 레시피"""
+    url: str
+    name: str
+    description: str = ""
+    servings: str = ""
+    total_time: str = ""
+    ingredients: List[str] = field(default_factory=list)
+    steps: List[str] = field(default_factory=list)
+
+    def to_text(self) -> str:
+        """LLM 컨텍스트용 간결한 텍스트"""
+        output = [f"[{self.name}]", f"출처: {self.url}"]
+        if self.description:
+            output.append(f"\n{self.description[:200]}")
+        info = [v for v in (self.servings, self.total_time) if v]
+        if info:
+            output.append(f"({' | '.join(info)})")
+        if self.ingredients:
+            output.append("\n[재료]")
+            for ing in self.ingredients[:20]:
+                output.append(f"  - {ing}")
+        if self.steps:
+            output.append("\n[조리 순서]")
+            for i, step in enumerate(self.steps[:15], 1):
+                if len(step) > 200:
+                    step = step[:200] + "..."
+                output.append(f"  {i}. {step}")
+        return "\n".join(output)
+
+    def to_card(self) -> Dict[str, Any]:
+        """클라이언트 카드용 요약 (재료 일부 + 단계 수)"""
+        return {
+            "name": self.name,
+            "url": self.url,
+            "servings": self.servings,
+            "total_time": self.total_time,
+            "ingredients": self.ingredients[:8],
+            "step_count": len(self.steps),
+        }
+
+
+class RecipeStore:
+    """구조화 레시피 로컬 저장소
+
+    - recipes: URL 기준 본문 + 레시피명 정규화 키 색인
+    - recipe_queries: 검색어 정규화 키 → URL (반복 질문을 검색 없이 응답)
+    - ttl_seconds가 지난 레시피는 조회하지 않고(웹 검색으로 다시 저장), 그동안 조회도 없으면
+      prune_expired()에서 삭제
+    - 레시피 수가 max_entries를 넘으면 last_access 기준 LRU 삭제
+    """
+
+    def __init__(
+        self,
+        path: str = "recipes.sqlite3",
+        enabled: bool = True,
+        ttl_seconds: int = 30 * 24 * 3600,
+        max_entries: int = 5000,
+    ):
+        self.path = path
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._db = ThreadLocalSQLite(path, _SCHEMA)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {"stores": 0, "evictions": 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def put(self, recipe: StructuredRecipe, query: Optional[str] = None):
+        """레시피 저장 (검색어가 있으면 별칭으로 연결)"""
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            conn = self._db.get()
+            conn.execute(
+                "INSERT OR REPLACE INTO recipes (url, name, name_key, data, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (recipe.url, recipe.name, dish_key(recipe.name),
+                 json.dumps(asdict(recipe), ensure_ascii=False), now, now),
+            )
+            self._count("stores")
+            if query:
+                self.add_alias(query, recipe.url)
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"[RecipeStore] 저장 실패: {e}")
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, where: str, params: tuple) -> int:
+        """조건에 맞는 레시피와 그 별칭 삭제, 삭제한 레시피 수 반환"""
+        conn.execute(
+            f"DELETE FROM recipe_queries WHERE url IN (SELECT url FROM recipes WHERE {where})", params
+        )
+        return conn.execute(f"DELETE FROM recipes WHERE {where}", params).rowcount
+
+    def _evict(self, conn: sqlite3.Connection):
+        """레시피 수가 max_entries를 넘으면 오래 안 쓴 레시피부터 90%까지 삭제"""
+        total = conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+        if total <= self.max_entries:
+            return
+        excess = total - int(self.max_entries * 0.9)
+        removed = self._delete(
+            conn,
+            "url IN (SELECT url FROM recipes ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        self._count("evictions", removed)
+
+    def prune_expired(self) -> int:
+        """ttl_seconds 동안 조회가 없는 레시피 삭제, 삭제한 개수 반환"""
+        if not self.enabled or self.ttl_seconds <= 0:
+            return 0
+        removed = self._delete(self._db.get(), "last_access < ?", (time.time() - self.ttl_seconds,))
+        self._count("evictions", removed)
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 통계"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def add_alias(self, query: str, url: str):
+        """검색어 → 레시피 URL 연결"""
+        key = dish_key(query)
+        if not self.enabled or not key:
+            return
+        try:
+            self._db.get().execute(
+                "INSERT OR IGNORE INTO recipe_queries (query_key, url) "
+                "SELECT ?, url FROM recipes WHERE url = ?",
+                (key, url),
+            )
+        except sqlite3.Error as e:
+            print(f"[RecipeStore] 별칭 저장 실패: {e}")
+
+    def get(self, url: str) -> Optional[StructuredRecipe]:
+        """URL로 조회"""
+        if not self.enabled:
+            return None
+        try:
+            row = self._db.get().execute(
+                "SELECT data FROM recipes WHERE url = ?", (url,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return StructuredRecipe(**json.loads(row[0])) if row else None
+
+    def find(self, query: str, limit: int = 3) -> List[StructuredRecipe]:
+        """검색어 별칭 또는 레시피명이 일치하는 레시피 조회 (ttl_seconds가 지난 레시피 제외)"""
+        key = dish_key(query)
+        if not self.enabled or not key:
+            return []
+        fresh_after = time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0
+        try:
+            conn = self._db.get()
+            rows = conn.execute(
+                "SELECT r.url, r.data FROM recipes r "
+                "WHERE (r.url IN (SELECT url FROM recipe_queries WHERE query_key = ?) "
+                "       OR r.name_key = ?) "
+                "  AND r.created_at >= ? "
+                "ORDER BY r.last_access DESC LIMIT ?",
+                (key, key, fresh_after, limit),
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE recipes SET last_access = ? WHERE url = ?",
+                    [(time.time(), url) for url, _ in rows],
+                )
+        except sqlite3.Error as e:
+            print(f"[RecipeStore] 조회 실패: {e}")
+            return []
+        return [StructuredRecipe(**json.loads(data)) for _, data in rows]
+
+
+# 싱글톤 인스턴스
+_store: Optional[RecipeStore] = None
+
+
+def get_recipe_store() -> RecipeStore:
+    """레시피 저장소 싱글톤 인스턴스 반환"""
+    global _store
+    if _store is None:
+        _store = RecipeStore(
+            path=os.getenv("RECIPE_STORE_PATH", "recipes.sqlite3"),
+            enabled=os.getenv("RECIPE_STORE_ENABLED", "true").lower() == "true",
+            ttl_seconds=int(os.getenv("RECIPE_STORE_TTL_SECONDS", str(30 * 24 * 3600))),
+            max_entries=int(os.getenv("RECIPE_STORE_MAX_ENTRIES", "5000")),
+        )
+    return _store
@@ -0,0 +1,186 @@
+"""외부 API 응답 캐시 - 정규화된 쿼리 키 + TTL + LRU + 선택적 SQLite 영속화"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from typing import Optional, Dict, Any, Callable, Tuple
+
+from .storage import ThreadLocalSQLite
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """쿼리 정규화 (NFC, 소문자, 공백 정리)"""
+    query = unicodedata.normalize("NFC", query or "")
+    return " ".join(query.lower().split())
+
+
+class ResponseCache:
+    """카카오/Serper 응답 캐시
+
+    - 키: endpoint + 정규화된 쿼리 + 파라미터
+    - 메모리 LRU (max_entries) + TTL
+    - persist_path가 있으면 SQLite에도 저장해서 재시작/다른 워커와 공유
+    - endpoint별 hit/miss 통계
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: int = 6 * 3600,
+        persist_path: Optional[str] = None,
+        endpoint_ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.endpoint_ttls = endpoint_ttls or {}
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._db = ThreadLocalSQLite(persist_path, _SCHEMA) if persist_path else None
+
+    def _ttl(self, endpoint: str) -> int:
+        return self.endpoint_ttls.get(endpoint, self.ttl_seconds)
+
+    @staticmethod
+    def make_key(endpoint: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        params_str = json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+        return f"{endpoint}|{normalize_query(query)}|{params_str}"
+
+    def get(self, endpoint: str, key: str) -> Optional[Any]:
+        """캐시 조회 (만료 항목은 삭제)"""
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                created_at, _, value = item
+                if now - created_at < self._ttl(endpoint):
+                    self._entries.move_to_end(key)
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+        if self._db is None:
+            return None
+
+        try:
+            row = self._db.get().execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or now - row[1] >= self._ttl(endpoint):
+            return None
+
+        value = json.loads(row[0])
+        self._remember(key, endpoint, value, row[1])
+        return copy.deepcopy(value)
+
+    def _remember(self, key: str, endpoint: str, value: Any, created_at: float):
+        with self._lock:
+            self._entries[key] = (created_at, endpoint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, endpoint: str, key: str, value: Any):
+        """캐시 저장 (value는 JSON 직렬화 가능해야 함)"""
+        now = time.time()
+        self._remember(key, endpoint, copy.deepcopy(value), now)
+
+        if self._db is None:
+            return
+        try:
+            conn = self._db.get()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, created_at) VALUES (?, ?, ?, ?)",
+                (key, endpoint, json.dumps(value, ensure_ascii=False), now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (now - max([self.ttl_seconds, *self.endpoint_ttls.values()]),),
+            )
+        except sqlite3.Error as e:
+            print(f"[ResponseCache] 저장 실패: {e}")
+
+    def get_or_call(
+        self,
+        endpoint: str,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        call: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        캐시에 있으면 반환, 없으면 call() 결과를 캐시 후 반환합니다.
+
+        Args:
+            endpoint: 통계/TTL 구분용 이름 (예: "kakao.keyword")
+            query: 검색어
+            params: 쿼리 외 요청 파라미터
+            call: 실제 API 호출
+            cacheable: 결과를 캐시할지 판단 (실패 응답 제외용)
+        """
+        if not self.enabled:
+            return call()
+        key = self.make_key(endpoint, query, params)
+        cached = self.get(endpoint, key)
+        with self._lock:
+            self._stats[endpoint]["hits" if cached is not None else "misses"] += 1
+        if cached is not None:
+            return cached
+
+        value = call()
+        if cacheable(value):
+            self.put(endpoint, key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 + endpoint별 hit/miss/hit_rate"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, counts in self._stats.items():
+                total = counts["hits"] + counts["misses"]
+                endpoints[endpoint] = {
+                    **counts,
+                    "hit_rate": round(counts["hits"] / total, 3) if total else 0.0,
+                }
+            return {"size": len(self._entries), "endpoints": endpoints}
+
+
+# 싱글톤 인스턴스
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """API 응답 캐시 싱글톤 인스턴스 반환"""
+    global _cache
+    if _cache is None:
+        persist = os.getenv("API_CACHE_PERSIST", "false").lower() == "true"
+        _cache = ResponseCache(
+            max_entries=int(os.getenv("API_CACHE_MAX_ENTRIES", "2048")),
+            ttl_seconds=int(os.getenv("API_CACHE_TTL_SECONDS", str(6 * 3600))),
+            persist_path=os.getenv("API_CACHE_PATH", "api_cache.sqlite3") if persist else None,
+            endpoint_ttls={
+                # 식당 정보는 자주 바뀌지 않음
+                "kakao.keyword": int(os.getenv("KAKAO_CACHE_TTL_SECONDS", str(24 * 3600))),
+            },
+            enabled=os.getenv("API_CACHE_ENABLED", "true").lower() == "true",
+        )
+    return _cache
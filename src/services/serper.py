@@ -18,6 +18,9 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+from .response_cache import get_response_cache
+from ..runtime import raise_if_cancelled, budget_timeout, DeadlineExceeded, track_temp_file
+
 
 class SerperImageSearcher:
     """Serper.dev를 활용한 이미지 검색기
@@ -68,6 +71,7 @@ class SerperImageSearcher:
                 import tempfile
                 temp_file = tempfile.NamedTemporaryFile(suffix='.jpeg', delete=False)
                 img.save(temp_file.name, format='JPEG', quality=90)
+                track_temp_file(temp_file.name)
                 return temp_file.name
 
         except Exception:
@@ -88,6 +92,7 @@ class SerperImageSearcher:
         ]
 
         for upload_func in upload_services:
+            raise_if_cancelled()
             try:
                 url = upload_func(file_path)
                 if url:
@@ -107,7 +112,7 @@ class SerperImageSearcher:
                 'image': image_data,
                 'expiration': 600,
             },
-            timeout=30
+            timeout=budget_timeout(30)
         )
 
         if response.status_code == 200:
@@ -122,7 +127,7 @@ class SerperImageSearcher:
                 'https://freeimage.host/api/1/upload',
                 data={'key': '6d207e02198a847aa98d0a2a901485a5'},
                 files={'source': f},
-                timeout=30
+                timeout=budget_timeout(30)
             )
 
         if response.status_code == 200:
@@ -137,7 +142,7 @@ class SerperImageSearcher:
                 'https://litterbox.catbox.moe/resources/internals/api.php',
                 data={'reqtype': 'fileupload', 'time': '1h'},
                 files={'fileToUpload': f},
-                timeout=60
+                timeout=budget_timeout(60)
             )
 
         if response.status_code == 200:
@@ -162,6 +167,7 @@ class SerperImageSearcher:
         if not REQUESTS_AVAILABLE:
             return {"error": "requests 라이브러리가 설치되지 않았습니다."}
 
+        raise_if_cancelled()
         if self.serpapi_key:
             try:
                 params = {
@@ -171,7 +177,7 @@ class SerperImageSearcher:
                     "hl": "ko",
                     "country": "kr"
                 }
-                response = requests.get(self.serpapi_url, params=params, timeout=30)
+                response = requests.get(self.serpapi_url, params=params, timeout=budget_timeout(30))
                 response.raise_for_status()
                 result = response.json()
 
@@ -195,7 +201,7 @@ class SerperImageSearcher:
         data = {"url": image_url, "gl": "kr", "hl": "ko"}
 
         try:
-            response = requests.post(self.lens_url, headers=headers, json=data, timeout=30)
+            response = requests.post(self.lens_url, headers=headers, json=data, timeout=budget_timeout(30))
             response.raise_for_status()
             result = response.json()
             return {
@@ -205,6 +211,8 @@ class SerperImageSearcher:
             }
         except requests.RequestException as e:
             return {"error": f"API 요청 실패: {str(e)}"}
+        except DeadlineExceeded:
+            return {"error": "시간 제한 초과"}
 
     def search_with_combined(self, image_url: str) -> Dict[str, Any]:
         """여러 검색 방법을 조합하여 최상의 결과 반환"""
@@ -218,6 +226,14 @@ class SerperImageSearcher:
         if not self.api_key:
             return {"error": "SERPER_API_KEY가 설정되지 않았습니다."}
 
+        return get_response_cache().get_or_call(
+            "serper.search", query, {"gl": "kr", "hl": "ko"},
+            lambda: self._search_text(query),
+            cacheable=lambda result: "error" not in result,
+        )
+
+    def _search_text(self, query: str) -> Dict[str, Any]:
+        """Serper 텍스트 검색 API 호출 (캐시 미적용)"""
         headers = {
             "X-API-KEY": self.api_key,
             "Content-Type": "application/json"
@@ -225,7 +241,7 @@ class SerperImageSearcher:
         data = {"q": query, "gl": "kr", "hl": "ko"}
 
         try:
-            response = requests.post(self.search_url, headers=headers, json=data, timeout=30)
+            response = requests.post(self.search_url, headers=headers, json=data, timeout=budget_timeout(30))
             response.raise_for_status()
             result = response.json()
             return {
@@ -234,6 +250,8 @@ class SerperImageSearcher:
             }
         except requests.RequestException as e:
             return {"error": f"API 요청 실패: {str(e)}"}
+        except DeadlineExceeded:
+            return {"error": "시간 제한 초과"}
 
 
 # 싱글톤 인스턴스
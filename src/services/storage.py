@@ -0,0 +1,61 @@
+"""로컬 SQLite 저장소 공통 유틸리티
+
+여러 uvicorn 워커(프로세스)와 도구 스레드가 같은 파일을 공유할 수 있도록
+WAL 모드 + busy_timeout으로 연결을 엽니다.
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict
+
+# 프로젝트 루트의 .cache 디렉토리 (환경 변수로 변경 가능)
+DEFAULT_CACHE_DIR = Path(
+    os.getenv("FOOD_AGENT_CACHE_DIR", str(Path(__file__).parent.parent.parent / ".cache"))
+)
+
+
+def resolve_cache_path(path: str) -> str:
+    """상대 경로는 캐시 디렉토리 기준으로 변환하고, 상위 디렉토리를 생성합니다."""
+    resolved = Path(path)
+    if not resolved.is_absolute():
+        resolved = DEFAULT_CACHE_DIR / resolved
+    resolved.parent.mkdir(parents=True, exist_ok=True)
+    return str(resolved)
+
+
+def open_sqlite(path: str, busy_timeout_ms: int = 5000) -> sqlite3.Connection:
+    """WAL 모드 SQLite 연결을 엽니다."""
+    conn = sqlite3.connect(
+        resolve_cache_path(path),
+        timeout=busy_timeout_ms / 1000,
+        isolation_level=None,  # autocommit - 트랜잭션은 명시적으로 BEGIN
+        check_same_thread=False,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    return conn
+
+
+class ThreadLocalSQLite:
+    """스레드별 SQLite 연결 관리 (도구가 스레드 풀에서 실행되므로)"""
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready: Dict[str, bool] = {}
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_sqlite(self.path)
+            with self._schema_lock:
+                if not self._schema_ready.get(self.path):
+                    conn.executescript(self.schema)
+                    self._schema_ready[self.path] = True
+            self._local.conn = conn
+        return conn
@@ -2,11 +2,16 @@
 
 import os
 import time
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from dataclasses import dataclass, replace
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -20,6 +25,7 @@ class SummaryResult:
     summary: str
     latency_ms: float
     compression_ratio: float
+    cached: bool = False
 
 
 # 도구별 요약 프롬프트
@@ -35,7 +41,7 @@ TOOL_PROMPTS = {
 - 식당명, 주소, 전화번호
 - 대표 메뉴와 가격 (상위 5개)
 - 영업시간 (있다면)
-- [MAP:...] 태그는 그대로 유지
+- 카카오맵 링크(http://place.map.kakao.com/...)는 그대로 유지
 
 불필요한 설명이나 반복은 제외하세요.""",
 
@@ -66,9 +72,213 @@ TOOL_PROMPTS = {
 DEFAULT_PROMPT = """다음 내용에서 핵심 정보만 간결하게 추출하세요.
 불필요한 반복, 광고, 서론은 제외하고 사실 정보만 포함하세요."""
 
+# 프롬프트를 바꾸면 올려서 이전 요약 캐시를 무효화
+PROMPT_VERSION = "1"
+
+
+def _unchanged(text: str) -> SummaryResult:
+    """요약하지 않은 결과 (원문 그대로)"""
+    return SummaryResult(
+        original_length=len(text),
+        summary_length=len(text),
+        summary=text,
+        latency_ms=0,
+        compression_ratio=1.0,
+    )
+
+
+class SummaryCache:
+    """요약 결과 LRU 캐시 - (도구 이름, 프롬프트 버전, 원문 해시) 기준
+
+    같은 페이지를 다시 크롤링한 결과처럼 원문이 같으면 요약을 다시 하지 않습니다.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], SummaryResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(tool_name: str, text: str) -> Tuple[str, str, str]:
+        return tool_name, PROMPT_VERSION, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[SummaryResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        return replace(result, latency_ms=0, cached=True)
+
+    def put(self, key: Tuple[str, str, str], result: SummaryResult):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+class SummarizerEndpoint:
+    """요약 서버 하나 (vLLM 레플리카) - 상태와 처리 중 요청 수"""
+
+    def __init__(self, base_url: str, api_key: str, request_timeout: float):
+        self.base_url = base_url
+        # 재시도는 풀에서 다른 엔드포인트로 하므로 클라이언트 자체 재시도는 끔
+        self.client = OpenAI(base_url=base_url, api_key=api_key, timeout=request_timeout, max_retries=0)
+        self.async_client = AsyncOpenAI(
+            base_url=base_url, api_key=api_key, timeout=request_timeout, max_retries=0
+        )
+        self.healthy = False
+        self.in_flight = 0
+        self.failures = 0
+        self.last_error = ""
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class EndpointPool:
+    """요약 서버 풀 - 백그라운드 헬스 체크 + 처리 중 요청이 가장 적은 서버로 라우팅
+
+    - 첫 사용 때 한 번 동기로 전체 헬스 체크를 하고, 이후에는 데몬 스레드가
+      health_interval초마다 다시 확인합니다 (일시 장애 후 자동 복구).
+    - 요청이 실패한 서버는 바로 unhealthy로 표시하고 다음 헬스 체크 때 복구합니다.
+    - 정상 서버가 하나도 없으면 요청을 보내지 않고 바로 실패합니다.
+    """
+
+    def __init__(
+        self,
+        base_urls: List[str],
+        api_key: str,
+        request_timeout: float = 10.0,
+        probe_timeout: float = 2.0,
+        health_interval: float = 15.0,
+    ):
+        self.base_urls = base_urls
+        self.api_key = api_key
+        self.request_timeout = request_timeout
+        self.probe_timeout = probe_timeout
+        self.health_interval = health_interval
+        self.endpoints: List[SummarizerEndpoint] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._ready = threading.Event()  # 첫 헬스 체크 완료 (그 전에 온 호출은 대기)
+        self._stop = threading.Event()
+
+    def start(self) -> bool:
+        """클라이언트 생성 + 첫 헬스 체크 + 백그라운드 체크 시작 (한 번만)
+
+        첫 헬스 체크가 끝나기 전에 들어온 호출은 끝날 때까지 기다립니다
+        (모든 서버가 아직 unhealthy인 상태를 보고 요약을 건너뛰지 않도록).
+        """
+        with self._lock:
+            first = not self._started
+            self._started = True
+            if first:
+                if not OPENAI_AVAILABLE:
+                    print("[Summarizer] openai 패키지가 설치되지 않음")
+                    self._ready.set()
+                    return False
+                self.endpoints = [
+                    SummarizerEndpoint(url, self.api_key, self.request_timeout) for url in self.base_urls
+                ]
+        if not first:
+            self._ready.wait()
+            return bool(self.endpoints)
+
+        try:
+            self.check_all()
+        finally:
+            self._ready.set()
+        if self.health_interval > 0:
+            threading.Thread(target=self._health_loop, name="summarizer-health", daemon=True).start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            self.check_all()
+
+    def probe(self, endpoint: SummarizerEndpoint) -> bool:
+        """models.list()로 서버 상태 확인 (요청은 락 밖에서, 상태 갱신은 락 안에서)"""
+        with self._lock:
+            failures = endpoint.failures
+        try:
+            endpoint.client.with_options(timeout=self.probe_timeout).models.list()
+            error = None
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            was_healthy, had_error = endpoint.healthy, bool(endpoint.last_error)
+            if error is not None:
+                endpoint.healthy = False
+                endpoint.last_error = str(error)
+            elif endpoint.failures == failures:
+                # 체크 도중 요청이 실패했으면(mark_failed) 그 표시를 되돌리지 않고 다음 체크에서 복구
+                endpoint.healthy = True
+                endpoint.last_error = ""
+            healthy = endpoint.healthy
+
+        if error is not None and (was_healthy or not had_error):
+            print(f"[Summarizer] vLLM 서버 연결 실패: {endpoint.base_url} ({error})")
+        elif healthy and not was_healthy:
+            print(f"[Summarizer] vLLM 서버 연결 성공: {endpoint.base_url}")
+        return healthy
+
+    def check_all(self):
+        for endpoint in self.endpoints:
+            self.probe(endpoint)
+
+    def any_healthy(self) -> bool:
+        return any(endpoint.healthy for endpoint in self.endpoints)
+
+    def mark_failed(self, endpoint: SummarizerEndpoint, error: Exception):
+        """요청 실패 → 다음 헬스 체크에서 복구될 때까지 라우팅 제외"""
+        with self._lock:
+            endpoint.healthy = False
+            endpoint.failures += 1
+            endpoint.last_error = str(error)
+
+    @contextmanager
+    def acquire(self, exclude: Tuple[SummarizerEndpoint, ...] = ()) -> Iterator[Optional[SummarizerEndpoint]]:
+        """처리 중 요청이 가장 적은 정상 서버 (없으면 None)"""
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.healthy and e not in exclude]
+            endpoint = min(candidates, key=lambda e: e.in_flight) if candidates else None
+            if endpoint is not None:
+                endpoint.in_flight += 1
+        try:
+            yield endpoint
+        finally:
+            if endpoint is not None:
+                with self._lock:
+                    endpoint.in_flight -= 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
+
 
 class LocalSummarizer:
-    """vLLM 기반 로컬 요약 서비스"""
+    """vLLM 기반 로컬 요약 서비스 (여러 레플리카를 EndpointPool로 분산)"""
 
     def __init__(
         self,
@@ -77,43 +287,26 @@ class LocalSummarizer:
         model: str = "LGAI-EXAONE/EXAONE-3.5-7.8B-Instruct-AWQ",
         enabled: bool = True,
         min_length_to_summarize: int = 1000,  # 이 길이 이상일 때만 요약
+        cache_size: int = 256,
+        base_urls: Optional[List[str]] = None,
+        request_timeout: float = 10.0,
+        health_interval: float = 15.0,
     ):
-        self.base_url = base_url
+        self.base_urls = base_urls or [base_url]
         self.api_key = api_key
         self.model = model
         self.enabled = enabled
         self.min_length = min_length_to_summarize
-        self.client: Optional[OpenAI] = None
-        self._initialized = False
-
-    def _init_client(self) -> bool:
-        """클라이언트 초기화 (lazy)"""
-        if self._initialized:
-            return self.client is not None
-
-        self._initialized = True
-
-        if not OPENAI_AVAILABLE:
-            print("[Summarizer] openai 패키지가 설치되지 않음")
-            return False
-
-        try:
-            self.client = OpenAI(
-                base_url=self.base_url,
-                api_key=self.api_key,
-            )
-            # 연결 테스트
-            self.client.models.list()
-            print(f"[Summarizer] vLLM 서버 연결 성공: {self.base_url}")
-            return True
-        except Exception as e:
-            print(f"[Summarizer] vLLM 서버 연결 실패: {e}")
-            self.client = None
-            return False
+        self.cache = SummaryCache(cache_size)
+        self.pool = EndpointPool(
+            self.base_urls, api_key,
+            request_timeout=request_timeout,
+            health_interval=health_interval,
+        )
 
     def is_available(self) -> bool:
-        """서비스 사용 가능 여부"""
-        return self.enabled and self._init_client()
+        """서비스 사용 가능 여부 (정상 서버가 하나라도 있는지, 첫 호출 때만 동기 헬스 체크)"""
+        return self.enabled and self.pool.start() and self.pool.any_healthy()
 
     def should_summarize(self, text: str) -> bool:
         """요약이 필요한지 판단"""
@@ -136,54 +329,115 @@ class LocalSummarizer:
         Returns:
             SummaryResult 객체
         """
-        original_length = len(tool_result)
-
         # 요약 불필요하거나 서비스 사용 불가
         if not self.should_summarize(tool_result) or not self.is_available():
-            return SummaryResult(
-                original_length=original_length,
-                summary_length=original_length,
-                summary=tool_result,
-                latency_ms=0,
-                compression_ratio=1.0,
-            )
+            return _unchanged(tool_result)
 
-        # 도구별 프롬프트 선택
-        system_prompt = TOOL_PROMPTS.get(tool_name, DEFAULT_PROMPT)
+        key = self.cache.key(tool_name, tool_result)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
 
         start_time = time.time()
+        request = self._request(tool_name, tool_result, max_tokens)
+        tried: Tuple[SummarizerEndpoint, ...] = ()
+        for _ in self.pool.endpoints:
+            with self.pool.acquire(exclude=tried) as endpoint:
+                if endpoint is None:
+                    break
+                try:
+                    response = endpoint.client.chat.completions.create(**request)
+                except Exception as e:
+                    print(f"[Summarizer] 요약 실패 ({endpoint.base_url}): {e}")
+                    self.pool.mark_failed(endpoint, e)
+                    tried += (endpoint,)
+                    continue
+            return self._finish(key, tool_result, response, start_time)
+
+        return _unchanged(tool_result)
+
+    async def asummarize(
+        self,
+        tool_name: str,
+        tool_result: str,
+        max_tokens: int = 500,
+    ) -> SummaryResult:
+        """summarize()의 비동기 버전 (AsyncOpenAI - 여러 결과를 동시에 요약할 때 사용)"""
+        if not self.enabled or not self.should_summarize(tool_result):
+            return _unchanged(tool_result)
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": tool_result},
-                ],
-                max_tokens=max_tokens,
-                temperature=0.3,  # 요약은 낮은 temperature
-            )
-
-            summary = response.choices[0].message.content
-            latency_ms = (time.time() - start_time) * 1000
-
-            return SummaryResult(
-                original_length=original_length,
-                summary_length=len(summary),
-                summary=summary,
-                latency_ms=latency_ms,
-                compression_ratio=len(summary) / original_length if original_length > 0 else 1.0,
-            )
+        key = self.cache.key(tool_name, tool_result)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
 
-        except Exception as e:
-            print(f"[Summarizer] 요약 실패: {e}")
-            return SummaryResult(
-                original_length=original_length,
-                summary_length=original_length,
-                summary=tool_result,
-                latency_ms=0,
-                compression_ratio=1.0,
-            )
+        if not await asyncio.to_thread(self.is_available):
+            return _unchanged(tool_result)
+
+        start_time = time.time()
+        request = self._request(tool_name, tool_result, max_tokens)
+        tried: Tuple[SummarizerEndpoint, ...] = ()
+        for _ in self.pool.endpoints:
+            with self.pool.acquire(exclude=tried) as endpoint:
+                if endpoint is None:
+                    break
+                try:
+                    response = await endpoint.async_client.chat.completions.create(**request)
+                except Exception as e:
+                    print(f"[Summarizer] 요약 실패 ({endpoint.base_url}): {e}")
+                    self.pool.mark_failed(endpoint, e)
+                    tried += (endpoint,)
+                    continue
+            return self._finish(key, tool_result, response, start_time)
+
+        return _unchanged(tool_result)
+
+    async def asummarize_many(
+        self,
+        items: List[Tuple[str, str]],
+        max_tokens: int = 500,
+    ) -> List[SummaryResult]:
+        """
+        (도구 이름, 도구 결과) 여러 개를 동시에 요약합니다.
+
+        Returns:
+            items와 같은 순서의 SummaryResult 리스트 (같은 입력은 한 번만 요약)
+        """
+        unique = list(dict.fromkeys(items))
+        results = await asyncio.gather(*(
+            self.asummarize(tool_name, tool_result, max_tokens)
+            for tool_name, tool_result in unique
+        ))
+        by_item = dict(zip(unique, results))
+        return [by_item[item] for item in items]
+
+    def _request(self, tool_name: str, tool_result: str, max_tokens: int) -> Dict[str, Any]:
+        """chat.completions 요청 인자 (도구별 프롬프트 선택)"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": TOOL_PROMPTS.get(tool_name, DEFAULT_PROMPT)},
+                {"role": "user", "content": tool_result},
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.3,  # 요약은 낮은 temperature
+        }
+
+    def _finish(self, key, tool_result: str, response, start_time: float) -> SummaryResult:
+        """응답 → SummaryResult 변환 후 캐시에 저장"""
+        summary = response.choices[0].message.content or ""
+        if not summary:
+            return _unchanged(tool_result)
+        original_length = len(tool_result)
+        result = SummaryResult(
+            original_length=original_length,
+            summary_length=len(summary),
+            summary=summary,
+            latency_ms=(time.time() - start_time) * 1000,
+            compression_ratio=len(summary) / original_length if original_length > 0 else 1.0,
+        )
+        self.cache.put(key, result)
+        return result
 
 
 # 싱글톤 인스턴스
@@ -194,10 +448,16 @@ def get_summarizer() -> LocalSummarizer:
     """요약 서비스 싱글톤 인스턴스 반환"""
     global _summarizer
     if _summarizer is None:
+        # VLLM_BASE_URLS(쉼표 구분)가 있으면 여러 레플리카, 없으면 VLLM_BASE_URL 하나
+        base_urls = [url.strip() for url in os.getenv("VLLM_BASE_URLS", "").split(",") if url.strip()]
         _summarizer = LocalSummarizer(
             base_url=os.getenv("VLLM_BASE_URL", "http://localhost:8081/v1"),
+            base_urls=base_urls or None,
             api_key=os.getenv("VLLM_API_KEY", "local-vllm-key"),
             enabled=os.getenv("ENABLE_LOCAL_SUMMARIZER", "false").lower() == "true",
             min_length_to_summarize=int(os.getenv("SUMMARIZE_MIN_LENGTH", "1000")),
+            cache_size=int(os.getenv("SUMMARIZER_CACHE_SIZE", "256")),
+            request_timeout=float(os.getenv("SUMMARIZER_REQUEST_TIMEOUT", "10")),
+            health_interval=float(os.getenv("SUMMARIZER_HEALTH_INTERVAL", "15")),
         )
     return _summarizer
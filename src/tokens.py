@@ -0,0 +1,117 @@
+"""빠른 토큰 수 추정 (토크나이저 없이 문자 종류별 계수 사용)
+
+한글은 음절 하나가 대략 토큰 하나, 영문/숫자/기호는 4글자에 토큰 하나 정도로 셉니다.
+정확한 값이 아니라 예산 비교용 상한 추정치입니다.
+도구 결과는 fit_sections()로 섹션 우선순위에 따라 토큰 예산 안으로 자릅니다.
+"""
+
+import re
+from typing import Any, Iterable, List, Tuple
+
+from langchain_core.messages import BaseMessage
+
+
+# 이미지 한 장을 LLM 입력 토큰으로 환산한 값 (저해상도 기준)
+IMAGE_TOKENS = 300
+# 메시지마다 붙는 역할/구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+# 글자 하나가 토큰 하나 이상인 문자 (한글 음절/자모, 가나, CJK 한자)
+_WIDE_RE = re.compile("[\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f\u3040-\u30ff\u4e00-\u9fff]")
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트 토큰 수 추정"""
+    if not text:
+        return 0
+    wide = len(_WIDE_RE.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def _content_tokens(content: Any) -> int:
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    total = 0
+    for block in content or []:
+        if isinstance(block, str):
+            total += estimate_tokens(block)
+        elif isinstance(block, dict):
+            if block.get("type") == "text":
+                total += estimate_tokens(block.get("text", ""))
+            else:
+                total += IMAGE_TOKENS
+    return total
+
+
+def estimate_message_tokens(messages: Iterable[BaseMessage]) -> int:
+    """메시지 목록 토큰 수 추정 (도구 호출 인자 포함)"""
+    total = 0
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS + _content_tokens(message.content)
+        for call in getattr(message, "tool_calls", None) or []:
+            total += estimate_tokens(call.get("name", "")) + estimate_tokens(str(call.get("args", "")))
+    return total
+
+
+# 잘린 섹션 끝에 붙이는 표시
+TRUNCATION_MARKER = "…(생략)"
+# 이보다 적게 남은 섹션은 자르지 않고 통째로 뺌
+MIN_SECTION_TOKENS = 20
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    줄 단위로 앞에서부터 max_tokens 안에 들어가는 만큼만 남깁니다.
+
+    마지막 줄이 넘치면 그 줄은 글자 단위로 자르고 TRUNCATION_MARKER를 붙입니다.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    room = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    if room <= 0:
+        return ""
+
+    kept = []
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if cost > room:
+            cut = line[:len(line) * room // cost]
+            while cut and estimate_tokens(cut) > room:
+                cut = cut[:-1]
+            if cut.strip():
+                kept.append(cut)
+            break
+        kept.append(line)
+        room -= cost
+    kept.append(TRUNCATION_MARKER)
+    return "\n".join(kept)
+
+
+def fit_sections(sections: List[Tuple[int, str]], budget: int, keep_priority: int = 0) -> str:
+    """
+    (우선순위, 텍스트) 섹션들을 토큰 예산에 맞춰 합칩니다.
+
+    우선순위가 keep_priority 이하인 섹션(식당명/링크, [IMAGE:] 태그 등)은 예산과 관계없이
+    통째로 남깁니다 - 태그 중간에서 잘리지 않도록. 예산이 모자라면 나머지 섹션을 먼저
+    빼고, 그래도 넘치는 만큼은 호출 측이 초과분으로 기록합니다.
+    나머지는 우선순위 숫자가 작은 섹션부터 예산을 배정하고, 같은 우선순위끼리는 짧은
+    섹션부터 남은 예산을 똑같이 나눕니다 (블로그 여러 개 중 첫 번째가 예산을 다 쓰지 않도록).
+    예산을 다 못 받은 섹션은 앞부분만 남기고, 출력은 원래 섹션 순서를 유지합니다.
+    """
+    costs = [estimate_tokens(text) + 1 for _, text in sections]
+    allowed = [costs[i] if p <= keep_priority else 0 for i, (p, _) in enumerate(sections)]
+    remaining = budget - sum(allowed)
+    for priority in sorted({p for p, _ in sections if p > keep_priority}):
+        group = sorted((i for i, (p, _) in enumerate(sections) if p == priority), key=lambda i: costs[i])
+        for left, i in zip(range(len(group), 0, -1), group):
+            allowed[i] = min(costs[i], max(remaining, 0) // left)
+            remaining -= allowed[i]
+
+    parts = []
+    for i, (_, text) in enumerate(sections):
+        if allowed[i] >= costs[i]:
+            parts.append(text)
+        elif allowed[i] >= MIN_SECTION_TOKENS:
+            parts.append(truncate_to_tokens(text, allowed[i] - 1))
+    return "\n".join(p for p in parts if p)
@@ -0,0 +1,91 @@
+"""도구 출력 토큰 예산
+
+도구는 결과를 (우선순위, 텍스트) 섹션 목록으로 만들고 fit_tool_output()으로 합칩니다.
+예산은 도구별 예산(settings.tool_token_budgets)과 이번 턴에 남은 예산
+(settings.turn_tool_token_budget - 앞서 실행된 도구 출력) 중 작은 값입니다.
+턴 예산을 다 쓰면 필수 섹션만 남기고, 필수 섹션이 예산을 넘긴 만큼은 초과분으로 기록합니다.
+
+섹션 우선순위 (숫자가 작을수록 먼저 남김):
+    0: 식당명/주소/링크, [IMAGE:] 태그, 답변 지시문처럼 빠지면 안 되는 내용 (자르지 않음)
+    1: 검색 결과 목록, 평점/후기 요약
+    2: 메뉴판, 레시피/영양 본문, 블로그 본문처럼 길고 잘라도 되는 내용
+"""
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+from .config import settings
+from .runtime import get_run_context
+from .tokens import estimate_tokens, fit_sections
+
+
+PRIORITY_ESSENTIAL = 0
+PRIORITY_SUMMARY = 1
+PRIORITY_DETAIL = 2
+
+# 도구별 누적 통계 (프로세스 전체)
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _reserve(tool_name: str) -> int:
+    """이번 호출에 쓸 예산을 턴 사용량에 미리 잡아둠 (병렬 도구끼리 예산을 겹쳐 쓰지 않도록)"""
+    budget = settings.tool_token_budgets.get(tool_name, settings.tool_token_budget_default)
+    ctx = get_run_context()
+    if ctx is None:
+        return budget
+    with ctx._lock:
+        budget = min(budget, max(settings.turn_tool_token_budget - ctx.tool_tokens, 0))
+        ctx.tool_tokens += budget
+    return budget
+
+
+def _record(tool_name: str, budget: int, original: int, final: int):
+    overrun = max(final - budget, 0)
+    if overrun:
+        print(f"[ToolBudget] {tool_name}: 필수 섹션이 예산 초과 ({final}/{budget} 토큰)")
+    ctx = get_run_context()
+    if ctx is not None:
+        with ctx._lock:
+            ctx.tool_tokens -= budget - final  # 안 쓴 예산 반환 (초과분은 추가 사용)
+            ctx.tool_outputs.append({
+                "tool": tool_name,
+                "budget_tokens": budget,
+                "original_tokens": original,
+                "final_tokens": final,
+                "overrun_tokens": overrun,
+            })
+    with _stats_lock:
+        stats = _stats.setdefault(
+            tool_name,
+            {"calls": 0, "trimmed": 0, "overruns": 0, "original_tokens": 0, "final_tokens": 0},
+        )
+        stats["calls"] += 1
+        stats["trimmed"] += int(final < original)
+        stats["overruns"] += int(overrun > 0)
+        stats["original_tokens"] += original
+        stats["final_tokens"] += final
+
+
+def fit_tool_output(tool_name: str, sections: List[Tuple[int, str]]) -> str:
+    """
+    도구 결과 섹션을 토큰 예산에 맞춰 합칩니다.
+
+    Args:
+        tool_name: 도구 이름 (예산 조회/통계용)
+        sections: (우선순위, 텍스트) 목록 - 출력은 이 순서를 유지
+
+    Returns:
+        예산 안으로 줄인 도구 결과
+    """
+    budget = _reserve(tool_name)
+    original = sum(estimate_tokens(text) + 1 for _, text in sections)
+    text = fit_sections(sections, budget, keep_priority=PRIORITY_ESSENTIAL)
+    _record(tool_name, budget, original, estimate_tokens(text))
+    return text
+
+
+def get_tool_budget_stats() -> Dict[str, Any]:
+    """도구별 호출 수 / 잘린 횟수 / 예산 초과 횟수 / 원본·최종 토큰 합계"""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
@@ -11,38 +11,42 @@ try:
 except ImportError:
     pass
 
-from ..services import get_searcher
+from ..services import get_searcher, get_page_cache
+from ..runtime import budget_exhausted
+from ..tool_budget import fit_tool_output, PRIORITY_ESSENTIAL, PRIORITY_SUMMARY, PRIORITY_DETAIL
+
+
+# 블로그 본문에서 음식 관련 문장을 고르는 키워드 (도구 결과 압축에서도 사용)
+FOOD_KEYWORDS = ['주문', '시켰', '먹었', '메뉴', '맛있', '바삭', '쫄깃', '토핑', '소스', '가격', '원']
+
+
+def _extract_blog_sentences(html: str, url: str) -> str:
+    """블로그 HTML에서 음식 관련 문장만 추출"""
+    text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
+    text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = ' '.join(text.split())
+
+    sentences = re.split(r'[.!?。]', text)
+
+    relevant_sentences = []
+    for sentence in sentences:
+        if any(kw in sentence for kw in FOOD_KEYWORDS):
+            if 20 < len(sentence) < 200:
+                relevant_sentences.append(sentence.strip())
+
+    return ' '.join(relevant_sentences[:10])
 
 
 def extract_blog_content(url: str) -> Dict[str, Any]:
-    """블로그 페이지에서 음식 관련 본문 텍스트 추출"""
+    """블로그 페이지에서 음식 관련 본문 텍스트 추출 (디스크 캐시 경유)"""
     result = {"url": url, "content": ""}
 
     try:
-        if 'blog.naver.com' in url and 'm.blog' not in url:
-            url = url.replace('blog.naver.com', 'm.blog.naver.com')
-
         headers = {'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X)'}
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            return result
-
-        text = response.text
-        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-        text = re.sub(r'<[^>]+>', ' ', text)
-        text = ' '.join(text.split())
-
-        food_keywords = ['주문', '시켰', '먹었', '메뉴', '맛있', '바삭', '쫄깃', '토핑', '소스', '가격', '원']
-        sentences = re.split(r'[.!?。]', text)
-
-        relevant_sentences = []
-        for sentence in sentences:
-            if any(kw in sentence for kw in food_keywords):
-                if 20 < len(sentence) < 200:
-                    relevant_sentences.append(sentence.strip())
-
-        result["content"] = ' '.join(relevant_sentences[:10])
+        result["content"] = get_page_cache().fetch(
+            url, _extract_blog_sentences, namespace="blog", headers=headers, timeout=10
+        ) or ""
     except:
         pass
 
@@ -98,13 +102,14 @@ def search_food_by_image(image_source: str) -> str:
     # 🔥 실시간 업데이트: 검색 완료
     writer({"tool": "search_food_by_image", "status": "검색 결과 분석 중..."})
 
-    output = []
+    # (우선순위, 텍스트) 섹션 - 토큰 예산을 넘으면 블로그 본문부터 줄임
+    sections = []
     blog_links = []
     thumbnails = []
 
     visual = result.get("visual_matches", [])
     if visual:
-        output.append("[검색 결과]")
+        lines = ["[검색 결과]"]
         for i, v in enumerate(visual[:10], 1):
             title = v.get("title", "")
             snippet = v.get("snippet", "")
@@ -115,36 +120,40 @@ def search_food_by_image(image_source: str) -> str:
                 line = f"{i}. {title}"
                 if snippet:
                     line += f" - {snippet[:100]}"
-                output.append(line)
+                lines.append(line)
 
             if thumbnail and len(thumbnails) < 3:
                 thumbnails.append(thumbnail)
 
             if link and ('blog.naver.com' in link or 'tistory.com' in link):
                 blog_links.append(link)
+        sections.append((PRIORITY_SUMMARY, "\n".join(lines)))
 
     if thumbnails:
-        output.append("\n[검색 결과 이미지]")
-        for url in thumbnails:
-            output.append(f"[IMAGE:{url}]")
+        image_tags = "\n".join(f"[IMAGE:{url}]" for url in thumbnails)
+        sections.append((PRIORITY_ESSENTIAL, f"\n[검색 결과 이미지]\n{image_tags}"))
 
     if blog_links:
-        output.append("\n[블로그 본문 (메뉴 판단 참고용)]")
+        sections.append((PRIORITY_SUMMARY, "\n[블로그 본문 (메뉴 판단 참고용)]"))
         for i, link in enumerate(blog_links[:3], 1):
+            if budget_exhausted():
+                # 시간 예산이 끝나면 블로그 본문 없이 검색 결과로 판단
+                break
             blog_data = extract_blog_content(link)
             if blog_data["content"]:
-                output.append(f"\n--- 블로그 {i} ---")
-                output.append(blog_data["content"][:1000])
+                sections.append((PRIORITY_DETAIL, f"\n--- 블로그 {i} ---\n{blog_data['content']}"))
 
     texts = result.get("text", [])
     if texts:
         text_list = [t.get("text", "") for t in texts[:5] if t.get("text")]
         if text_list:
-            output.append(f"\n[이미지 텍스트] {', '.join(text_list)}")
+            sections.append((PRIORITY_SUMMARY, f"\n[이미지 텍스트] {', '.join(text_list)}"))
 
-    output.append("\n[판단 요청]")
-    output.append("1. 원본 이미지를 기반으로 검색 결과 제목, 블로그 본문을 참고하세요.")
-    output.append("2. 음식 이름만 물어보면: '~로 보입니다' + 식당이 보이면 '혹시 OO에서 드셨나요?'")
-    output.append("3. 식당/메뉴명까지 물어보면: 가능성 있는 식당 2~3곳을 후보로 나열하세요.")
+    sections.append((PRIORITY_ESSENTIAL, "\n".join([
+        "\n[판단 요청]",
+        "1. 원본 이미지를 기반으로 검색 결과 제목, 블로그 본문을 참고하세요.",
+        "2. 음식 이름만 물어보면: '~로 보입니다' + 식당이 보이면 '혹시 OO에서 드셨나요?'",
+        "3. 식당/메뉴명까지 물어보면: 가능성 있는 식당 2~3곳을 후보로 나열하세요.",
+    ])))
 
-    return "\n".join(output) if output else "검색 결과 없음"
+    return fit_tool_output("search_food_by_image", sections)
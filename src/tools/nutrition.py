@@ -1,5 +1,7 @@
 """영양정보 검색 도구"""
 
+import os
+
 from langchain_core.tools import tool
 from langgraph.config import get_stream_writer
 
@@ -15,40 +17,62 @@ try:
 except ImportError:
     BS4_AVAILABLE = False
 
-from ..services import get_searcher
+from ..services import get_searcher, get_page_cache
+from ..services.nutrition_db import get_nutrition_db
+from ..runtime import budget_exhausted
+from ..tool_budget import fit_tool_output, PRIORITY_ESSENTIAL, PRIORITY_SUMMARY, PRIORITY_DETAIL
 
 
-def _crawl_nutrition_page(url: str) -> str:
-    """영양정보 페이지 본문 크롤링"""
-    if not BS4_AVAILABLE:
+# 내장 영양 DB 매칭 신뢰도가 이 값 이상이면 웹 검색 생략
+LOCAL_MIN_SCORE = float(os.getenv("NUTRITION_LOCAL_MIN_SCORE", "0.86"))
+LOCAL_ENABLED = os.getenv("NUTRITION_LOCAL_ENABLED", "true").lower() == "true"
+
+
+def _lookup_local(query: str) -> str:
+    """내장 영양 DB에서 신뢰도 높은 항목을 찾으면 결과 텍스트 반환"""
+    if not LOCAL_ENABLED:
         return ""
 
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    match = get_nutrition_db().lookup(query)
+    if not match or match.score < LOCAL_MIN_SCORE:
+        return ""
+
+    output = [f"[검색: {query}]", match.fact.to_text()]
+    if match.score < 1.0:
+        output.append(f"(검색어를 '{match.fact.name}' 항목으로 매칭, 신뢰도 {match.score:.2f})")
+    return "\n".join(output)
 
-        if 'blog.naver.com' in url and 'm.blog' not in url:
-            url = url.replace('blog.naver.com', 'm.blog.naver.com')
 
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.encoding = 'utf-8'
+def _extract_nutrition_text(html: str, url: str) -> str:
+    """영양정보 페이지 HTML에서 본문 텍스트 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
 
-        if resp.status_code != 200:
-            return ""
+    for tag in soup(['script', 'style']):
+        tag.decompose()
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+    if soup.body:
+        text = soup.body.get_text(separator='\n')
+        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        return '\n'.join(lines)
 
-        for tag in soup(['script', 'style']):
-            tag.decompose()
+    return ""
 
-        if soup.body:
-            text = soup.body.get_text(separator='\n')
-            lines = [l.strip() for l in text.split('\n') if l.strip()]
-            return '\n'.join(lines)[:2000]
 
-    except:
+def _crawl_nutrition_page(url: str) -> str:
+    """영양정보 페이지 본문 크롤링 (디스크 캐시 경유)"""
+    if not BS4_AVAILABLE:
         return ""
 
-    return ""
+    try:
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+        return get_page_cache().fetch(
+            url, _extract_nutrition_text, namespace="nutrition",
+            headers=headers, timeout=10, encoding='utf-8'
+        ) or ""
+
+    except:
+        return ""
 
 
 @tool
@@ -66,6 +90,11 @@ def get_nutrition_info(query: str) -> str:
     writer = get_stream_writer()
     writer({"tool": "get_nutrition_info", "status": "영양 정보 검색 중..."})
 
+    local_result = _lookup_local(query)
+    if local_result:
+        writer({"tool": "get_nutrition_info", "status": "분석 완료!"})
+        return local_result
+
     searcher = get_searcher()
     search_result = searcher.search_text(query)
 
@@ -79,19 +108,26 @@ def get_nutrition_info(query: str) -> str:
 
     writer({"tool": "get_nutrition_info", "status": f"검색 결과 {len(organic)}개 분석 중..."})
 
-    output = [f"[검색: {query}]"]
-
-    for item in organic[:3]:
+    # 페이지 본문은 토큰 예산 안에서 페이지끼리 나눠 가짐
+    sections = [(PRIORITY_ESSENTIAL, f"[검색: {query}]")]
+
+    for i, item in enumerate(organic[:3]):
+        if budget_exhausted():
+            # 시간 예산이 끝나면 남은 결과는 검색 스니펫으로 대신
+            sections.append((PRIORITY_SUMMARY, "\n[시간 제한으로 일부 결과는 검색 요약만 포함]"))
+            for rest in organic[i:3]:
+                if rest.get("snippet"):
+                    sections.append((PRIORITY_SUMMARY, f"- {rest.get('title', '')}: {rest['snippet']}"))
+            break
         title = item.get("title", "")
         link = item.get("link", "")
 
         content = _crawl_nutrition_page(link)
 
         if content:
-            output.append(f"\n=== {title} ===")
-            output.append(f"출처: {link}")
-            output.append(content)
+            sections.append((PRIORITY_SUMMARY, f"\n=== {title} ===\n출처: {link}"))
+            sections.append((PRIORITY_DETAIL, content))
 
     writer({"tool": "get_nutrition_info", "status": "분석 완료!"})
 
-    return "\n".join(output)
+    return fit_tool_output("get_nutrition_info", sections)
@@ -1,5 +1,11 @@
 """레시피 검색 도구"""
 
+import os
+import re
+import json
+import html as html_lib
+from typing import Optional, List, Any, Dict, Iterator
+
 from langchain_core.tools import tool
 from langgraph.config import get_stream_writer
 
@@ -15,84 +21,258 @@ try:
 except ImportError:
     BS4_AVAILABLE = False
 
-from ..services import get_searcher
+from ..services import get_searcher, get_page_cache
+from ..services.fetcher import canonicalize_url
+from ..services.recipe_store import StructuredRecipe, get_recipe_store
+from ..runtime import budget_exhausted, publish
+from ..tool_budget import fit_tool_output, PRIORITY_ESSENTIAL, PRIORITY_DETAIL
+
+
+# 저장소에 이 개수 이상 있으면 웹 검색 없이 응답 (웹 검색과 같은 3개가 모여야 대체)
+STORE_MIN_RESULTS = int(os.getenv("RECIPE_STORE_MIN_RESULTS", "3"))
+
+_JSONLD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I
+)
+_MICRODATA_RE = re.compile(r'itemtype=["\']https?://schema\.org/Recipe["\']', re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _clean(text: Any) -> str:
+    """HTML 태그/엔티티 제거 + 공백 정리"""
+    if not isinstance(text, str):
+        return ""
+    text = html_lib.unescape(_TAG_RE.sub(' ', text))
+    return ' '.join(text.split())
+
+
+def _iter_jsonld_nodes(data: Any) -> Iterator[dict]:
+    """JSON-LD 문서의 모든 노드 순회 (@graph, 리스트 포함)"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_jsonld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_jsonld_nodes(data["@graph"])
+
+
+def _instruction_texts(value: Any) -> List[str]:
+    """recipeInstructions (문자열 / HowToStep / HowToSection) → 단계 리스트"""
+    if isinstance(value, str):
+        return [line for line in (_clean(l) for l in re.split(r'\n|<br\s*/?>|</li>', value)) if line]
+    if isinstance(value, dict):
+        if "itemListElement" in value:
+            return _instruction_texts(value["itemListElement"])
+        text = _clean(value.get("text") or value.get("name"))
+        return [text] if text else []
+    if isinstance(value, list):
+        steps = []
+        for item in value:
+            steps.extend(_instruction_texts(item))
+        return steps
+    return []
+
+
+def _from_jsonld(page: str, url: str) -> Optional[StructuredRecipe]:
+    for block in _JSONLD_RE.findall(page):
+        try:
+            data = json.loads(block.strip(), strict=False)
+        except ValueError:
+            continue
+        for node in _iter_jsonld_nodes(data):
+            node_type = node.get("@type")
+            types = node_type if isinstance(node_type, list) else [node_type]
+            if "Recipe" not in types:
+                continue
+
+            ingredients = node.get("recipeIngredient") or node.get("ingredients") or []
+            if isinstance(ingredients, str):
+                ingredients = [ingredients]
+            servings = node.get("recipeYield", "")
+            if isinstance(servings, list):
+                servings = servings[0] if servings else ""
+
+            recipe = StructuredRecipe(
+                url=url,
+                name=_clean(node.get("name")) or url,
+                description=_clean(node.get("description")),
+                servings=_clean(str(servings)) if servings else "",
+                total_time=_clean(node.get("totalTime") or node.get("cookTime") or ""),
+                ingredients=[i for i in (_clean(x) for x in ingredients) if i],
+                steps=_instruction_texts(node.get("recipeInstructions")),
+            )
+            if recipe.ingredients or recipe.steps:
+                return recipe
+    return None
+
+
+# 닫는 태그가 없는 요소 (itemprop 값은 content 속성에만 있음)
+_VOID_TAGS = {"meta", "link", "img", "br", "hr", "input", "source"}
+_tag_patterns: Dict[str, "re.Pattern"] = {}
+
+
+def _tag_pattern(tag: str) -> "re.Pattern":
+    """같은 이름의 여는/닫는 태그 패턴 (대소문자 무시, 태그별로 한 번만 컴파일)"""
+    pattern = _tag_patterns.get(tag)
+    if pattern is None:
+        pattern = _tag_patterns[tag] = re.compile(r'<(/?)%s\b[^>]*?(/?)>' % re.escape(tag), re.I)
+    return pattern
+
+
+def _element_inner(page: str, tag: str, start: int) -> Optional[str]:
+    """여는 태그 끝(start)부터 중첩 깊이를 세어 짝이 맞는 닫는 태그까지의 내용"""
+    depth = 1
+    for m in _tag_pattern(tag).finditer(page, start):
+        if m.group(1):
+            depth -= 1
+            if depth == 0:
+                return page[start:m.start()]
+        elif not m.group(2):
+            depth += 1
+    return None
+
+
+def _microdata_values(page: str, prop: str) -> List[str]:
+    """itemprop 값 추출 (content 속성 우선, 없으면 같은 요소 안쪽 텍스트)"""
+    values = []
+    pattern = re.compile(r'<(\w+)([^>]*\bitemprop=["\'](?:%s)["\'][^>]*)>' % prop, re.I)
+    for m in pattern.finditer(page):
+        tag, attrs = m.group(1).lower(), m.group(2)
+        content = re.search(r'\bcontent=["\']([^"\']*)["\']', attrs)
+        if content:
+            values.append(_clean(content.group(1)))
+            continue
+        if tag in _VOID_TAGS or attrs.rstrip().endswith('/'):
+            continue
+        inner = _element_inner(page, tag, m.end())
+        if inner is not None:
+            values.append(_clean(inner))
+    return [v for v in values if v]
+
 
+def _from_microdata(page: str, url: str) -> Optional[StructuredRecipe]:
+    match = _MICRODATA_RE.search(page)
+    if not match:
+        return None
+    scope = page[match.start():]
 
-def _crawl_recipe_fast(url: str) -> str:
-    """requests로 빠른 레시피 크롤링"""
+    names = _microdata_values(scope, "name")
+    recipe = StructuredRecipe(
+        url=url,
+        name=names[0] if names else url,
+        servings=next(iter(_microdata_values(scope, "recipeYield")), ""),
+        total_time=next(iter(_microdata_values(scope, "totalTime|cookTime")), ""),
+        ingredients=_microdata_values(scope, "recipeIngredient|ingredients"),
+        steps=_microdata_values(scope, "recipeInstructions"),
+    )
+    return recipe if recipe.ingredients or recipe.steps else None
+
+
+def _extract_structured_recipe(page: str, url: str) -> Optional[StructuredRecipe]:
+    """JSON-LD / microdata Recipe 빠른 추출 (soup 생성 없이 정규식으로 처리)"""
+    if 'Recipe' not in page:
+        return None
+    return _from_jsonld(page, url) or _from_microdata(page, url)
+
+
+def _extract_recipe(html: str, url: str, query: Optional[str] = None) -> str:
+    """레시피 페이지 HTML에서 본문 추출 (빈 문자열이면 추출 실패)"""
+    # 구조화 데이터가 있으면 재료/순서만 저장(검색어 별칭 포함)하고 바로 반환
+    structured = _extract_structured_recipe(html, url)
+    if structured:
+        get_recipe_store().put(structured, query)
+        return structured.to_text()
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 만개의레시피
+    if '10000recipe.com' in url:
+        output = []
+
+        title_el = soup.select_one('.view2_summary h3, .view2_summary_tit')
+        if title_el:
+            output.append(f"[{title_el.get_text(strip=True)}]")
+
+        output.append(f"출처: {url}")
+
+        desc_el = soup.select_one('.view2_summary_in')
+        if desc_el:
+            output.append(f"\n{desc_el.get_text(strip=True)}")
+
+        info_els = soup.select('.view2_summary_info span')
+        if info_els:
+            info_text = ' | '.join([el.get_text(strip=True) for el in info_els])
+            output.append(f"({info_text})")
+
+        ingredients = []
+        for li in soup.select('.ready_ingre3 li'):
+            text = li.get_text(strip=True).replace('구매', '').strip()
+            if text:
+                ingredients.append(text)
+        if ingredients:
+            output.append("\n[재료]")
+            for ing in ingredients[:20]:
+                output.append(f"  - {ing}")
+
+        steps = []
+        for step in soup.select('.view_step_cont'):
+            text = step.get_text(strip=True)
+            if text:
+                steps.append(text)
+        if steps:
+            output.append("\n[조리 순서]")
+            for i, step in enumerate(steps[:15], 1):
+                if len(step) > 200:
+                    step = step[:200] + "..."
+                output.append(f"  {i}. {step}")
+
+        return "\n".join(output)
+
+    # 네이버 블로그 / 티스토리 / 기타
+    if 'm.blog.naver.com' in url:
+        content = soup.select_one('.se-main-container, #postViewArea, .post-view')
+    else:
+        content = soup.select_one('article, .post-content, .entry-content, main, .content')
+        if not content:
+            content = soup.body
+
+    if content:
+        text = content.get_text(separator='\n')
+        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        body_text = '\n'.join(lines)
+        return f"[레시피]\n출처: {url}\n\n{body_text}"
+
+    return ""
+
+
+def _crawl_recipe_fast(url: str, query: Optional[str] = None) -> str:
+    """requests로 빠른 레시피 크롤링 (디스크 캐시 경유)"""
     if not BS4_AVAILABLE:
         return "BeautifulSoup 라이브러리가 필요합니다."
 
+    # 모바일 주소 치환 등은 요청 전에 정규화 단계에서 처리
+    url = canonicalize_url(url)
+
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.encoding = 'utf-8'
+        text = get_page_cache().fetch(
+            url,
+            lambda html, page_url: _extract_recipe(html, page_url, query),
+            namespace="recipe",
+            headers=headers,
+            timeout=10,
+            encoding='utf-8',
+        )
 
-        if resp.status_code != 200:
+        if text is None:
             return f"페이지 로드 실패: {url}"
-
-        soup = BeautifulSoup(resp.text, 'html.parser')
-
-        # 만개의레시피
-        if '10000recipe.com' in url:
-            output = []
-
-            title_el = soup.select_one('.view2_summary h3, .view2_summary_tit')
-            if title_el:
-                output.append(f"[{title_el.get_text(strip=True)}]")
-
-            output.append(f"출처: {url}")
-
-            desc_el = soup.select_one('.view2_summary_in')
-            if desc_el:
-                output.append(f"\n{desc_el.get_text(strip=True)}")
-
-            info_els = soup.select('.view2_summary_info span')
-            if info_els:
-                info_text = ' | '.join([el.get_text(strip=True) for el in info_els])
-                output.append(f"({info_text})")
-
-            ingredients = []
-            for li in soup.select('.ready_ingre3 li'):
-                text = li.get_text(strip=True).replace('구매', '').strip()
-                if text:
-                    ingredients.append(text)
-            if ingredients:
-                output.append("\n[재료]")
-                for ing in ingredients[:20]:
-                    output.append(f"  - {ing}")
-
-            steps = []
-            for step in soup.select('.view_step_cont'):
-                text = step.get_text(strip=True)
-                if text:
-                    steps.append(text)
-            if steps:
-                output.append("\n[조리 순서]")
-                for i, step in enumerate(steps[:15], 1):
-                    if len(step) > 200:
-                        step = step[:200] + "..."
-                    output.append(f"  {i}. {step}")
-
-            return "\n".join(output)
-
-        # 네이버 블로그 / 티스토리 / 기타
-        else:
-            if 'blog.naver.com' in url and 'm.blog.naver.com' not in url:
-                url = url.replace('blog.naver.com', 'm.blog.naver.com')
-                resp = requests.get(url, headers=headers, timeout=10)
-                soup = BeautifulSoup(resp.text, 'html.parser')
-                content = soup.select_one('.se-main-container, #postViewArea, .post-view')
-            else:
-                content = soup.select_one('article, .post-content, .entry-content, main, .content')
-                if not content:
-                    content = soup.body
-
-            if content:
-                text = content.get_text(separator='\n')
-                lines = [l.strip() for l in text.split('\n') if l.strip()]
-                body_text = '\n'.join(lines)[:3500]
-                return f"[레시피]\n출처: {url}\n\n{body_text}"
+        if text:
+            # 페이지 캐시 적중이면 추출 단계를 건너뛰므로 여기서 검색어와 연결
+            # (구조화 레시피로 저장된 페이지면 다음 질문은 저장소에서 응답)
+            if query:
+                get_recipe_store().add_alias(query, url)
+            return text
 
     except Exception as e:
         return f"크롤링 실패: {str(e)}\nURL: {url}"
@@ -114,6 +294,15 @@ def search_recipe_online(query: str) -> str:
     writer = get_stream_writer()
     writer({"tool": "search_recipe_online", "status": "레시피 검색 중..."})
 
+    stored = get_recipe_store().find(query, limit=3)
+    if stored and len(stored) >= STORE_MIN_RESULTS:
+        writer({"tool": "search_recipe_online", "status": "저장된 레시피 불러오는 중..."})
+        sections = [(PRIORITY_ESSENTIAL, f"[검색: {query}]")]
+        for i, recipe in enumerate(stored, 1):
+            sections.append((PRIORITY_DETAIL, f"\n=== 레시피 {i} ===\n{recipe.to_text()}"))
+        publish("recipe_summaries", "search_recipe_online", {"recipes": [r.to_card() for r in stored]})
+        return fit_tool_output("search_recipe_online", sections)
+
     searcher = get_searcher()
     search_result = searcher.search_text(query)
 
@@ -126,10 +315,23 @@ def search_recipe_online(query: str) -> str:
         return f"'{query}' 검색 결과가 없습니다."
 
     writer({"tool": "search_recipe_online", "status": "레시피 페이지 분석 중..."})
-    output = [f"[검색: {query}]"]
+    # 레시피 본문은 토큰 예산 안에서 레시피끼리 나눠 가짐 (제목/출처가 앞에 있어 잘려도 남음)
+    sections = [(PRIORITY_ESSENTIAL, f"[검색: {query}]")]
+    cards = []
     for i, item in enumerate(organic[:3], 1):
+        if i > 1 and budget_exhausted():
+            # 시간 예산이 끝나면 지금까지 가져온 레시피로 응답
+            sections.append((PRIORITY_ESSENTIAL, "\n[시간 제한으로 일부 레시피만 포함]"))
+            break
         link = item.get("link", "")
-        recipe_data = _crawl_recipe_fast(link)
-        output.append(f"\n=== 레시피 {i} ===\n{recipe_data}")
+        recipe_data = _crawl_recipe_fast(link, query)
+        sections.append((PRIORITY_DETAIL, f"\n=== 레시피 {i} ===\n{recipe_data}"))
+        # 구조화 데이터가 있던 페이지는 저장소에 들어가 있으므로 카드로 전송
+        structured = get_recipe_store().get(canonicalize_url(link)) if link else None
+        if structured:
+            cards.append(structured.to_card())
+
+    if cards:
+        publish("recipe_summaries", "search_recipe_online", {"recipes": cards})
 
-    return "\n".join(output)
+    return fit_tool_output("search_recipe_online", sections)
@@ -10,6 +10,8 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 from ..services import get_kakao
+from ..runtime import publish
+from ..tool_budget import fit_tool_output, PRIORITY_ESSENTIAL, PRIORITY_SUMMARY, PRIORITY_DETAIL
 
 
 @tool
@@ -37,52 +39,65 @@ def search_restaurant_info(query: str) -> str:
         place_url = first_place.get("place_url", "")
         place_id = kakao.get_place_id_from_url(place_url) if place_url else None
 
+        cards = []
         coords_list = []
 
         for i, place in enumerate(result["documents"][:3], 1):
-            output.append(f"[{i}] {place.get('place_name', '')}")
-            output.append(f"   주소: {place.get('road_address_name', '') or place.get('address_name', '')}")
-            output.append(f"   전화: {place.get('phone', '')}")
-            output.append(f"   카테고리: {place.get('category_name', '')}")
+            name = place.get('place_name', '')
+            address = place.get('road_address_name', '') or place.get('address_name', '')
+            phone = place.get('phone', '')
             p_url = place.get('place_url', '')
+            output.append(f"[{i}] {name}")
+            output.append(f"   주소: {address}")
+            output.append(f"   전화: {phone}")
+            output.append(f"   카테고리: {place.get('category_name', '')}")
             if p_url:
                 output.append(f"   🗺️ 지도: {p_url}")
             output.append("")
 
             x = place.get('x', '')
             y = place.get('y', '')
-            name = place.get('place_name', '')
-            address = place.get('road_address_name', '') or place.get('address_name', '')
-            phone = place.get('phone', '')
             category = place.get('category_name', '').split(' > ')[-1] if place.get('category_name') else ''
-            place_url = place.get('place_url', '')
+            cards.append({
+                "name": name,
+                "address": address,
+                "phone": phone,
+                "category": category,
+                "place_url": p_url,
+                "lat": y,
+                "lng": x,
+            })
             if x and y:
-                info = f"{name}|{address}|{phone}|{category}|{place_url}"
+                info = f"{name}|{address}|{phone}|{category}|{p_url}"
                 coords_list.append(f"{y},{x},{info}")
 
-        if coords_list:
-            coords_str = ";".join(coords_list)
-            output.insert(0, f"[MAP:{coords_str}]")
+        # 카드/지도는 도구에서 바로 전송 (LLM이 [MAP:] 태그를 옮겨 적을 필요 없음)
+        publish("restaurant_cards", "search_restaurant_info", {
+            "restaurants": cards,
+            "map_url": ";".join(coords_list) or None,
+        })
 
     menu_text = ""
     if place_id and PLAYWRIGHT_AVAILABLE:
         writer({"tool": "search_restaurant_info", "status": "메뉴 정보 수집 중..."})
         menu_text = kakao.get_menu_via_playwright(place_id)
 
+    # 식당 정보는 항상 남기고, 토큰 예산을 넘으면 메뉴판 뒷부분부터 줄임
+    sections = [(PRIORITY_ESSENTIAL, "\n".join(output))] if output else []
     if menu_text:
-        output.append("[메뉴판]")
-        output.append(menu_text)
+        sections.append((PRIORITY_SUMMARY, "[메뉴판]"))
+        sections.append((PRIORITY_DETAIL, menu_text))
     else:
         writer({"tool": "search_restaurant_info", "status": "메뉴 검색 중..."})
         menu_info = kakao.search_menu_via_serper(query)
         if menu_info:
-            output.append("[메뉴 검색 결과]")
-            output.append(menu_info)
+            sections.append((PRIORITY_SUMMARY, "[메뉴 검색 결과]"))
+            sections.append((PRIORITY_DETAIL, menu_info))
 
-    if not output:
+    if not sections:
         return f"'{query}' 검색 결과 없음"
 
-    return "\n".join(output)
+    return fit_tool_output("search_restaurant_info", sections)
 
 
 @tool
@@ -116,20 +131,20 @@ def get_restaurant_reviews(restaurant_name: str) -> str:
     if not place_id:
         return f"'{restaurant_name}' 후기 페이지를 찾을 수 없습니다."
 
-    reviews_text = kakao.get_reviews_via_playwright(place_id, max_reviews=15)
-
-    output = []
-    output.append(f"[{place_name} 후기]")
-    output.append(f"📍 주소: {address}")
-    output.append(f"🔗 카카오맵: {place_url}")
-    output.append("")
-
-    if reviews_text:
-        output.append("📝 방문자 후기:")
-        output.append(reviews_text)
-        output.append("")
-        output.append("[요약 요청] 위 후기들을 분석해서 장점, 단점, 추천 메뉴 등을 요약해주세요.")
-    else:
-        output.append("후기를 찾을 수 없습니다.")
-
-    return "\n".join(output)
+    # 후기 개수는 토큰 예산이 정함 (넉넉히 모은 뒤 예산을 넘는 뒷부분을 잘라냄)
+    reviews_text = kakao.get_reviews_via_playwright(place_id, max_reviews=30)
+
+    header = "\n".join([
+        f"[{place_name} 후기]",
+        f"📍 주소: {address}",
+        f"🔗 카카오맵: {place_url}",
+        "",
+    ])
+    if not reviews_text:
+        return f"{header}\n후기를 찾을 수 없습니다."
+
+    return fit_tool_output("get_restaurant_reviews", [
+        (PRIORITY_ESSENTIAL, f"{header}\n📝 방문자 후기:"),
+        (PRIORITY_SUMMARY, reviews_text),
+        (PRIORITY_ESSENTIAL, "\n[요약 요청] 위 후기들을 분석해서 장점, 단점, 추천 메뉴 등을 요약해주세요."),
+    ])
@@ -0,0 +1,159 @@
+"""답변 캐시 테스트 - 정규화 키, TTL/무효화, 세션 간 공유 범위"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import src.agent as agent_module
+from src.agent import KoreanFoodAgent
+from src.services.answer_cache import AnswerCache, normalize_question
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("비빔밥 칼로리 알려줘", "비빔밥칼로리"),
+    ("비빔밥은 칼로리 얼마야?", "비빔밥칼로리"),
+    ("비빔밥 열량", "비빔밥칼로리"),
+    ("김치 찌개 만드는 법", "김치찌개레시피"),
+    ("김치찌개 레시피 좀 알려주세요", "김치찌개레시피"),
+    ("떡볶이 칼로리", "떡볶이칼로리"),  # '이'는 조사로 자르지 않음
+])
+def test_normalize_question(question, expected):
+    assert normalize_question(question) == expected
+
+
+def test_key_includes_tool():
+    assert AnswerCache.make_key("get_nutrition_info", "비빔밥 열량") == AnswerCache.make_key(
+        "get_nutrition_info", "비빔밥은 칼로리 얼마야?"
+    )
+    assert AnswerCache.make_key("get_nutrition_info", "비빔밥") != AnswerCache.make_key(
+        "search_recipe_online", "비빔밥"
+    )
+
+
+def test_ttl_invalidate_and_stats():
+    cache = AnswerCache(tool_ttls={"get_nutrition_info": 60})
+    cache.put("get_nutrition_info", "비빔밥 칼로리", "560kcal")
+    cache.put("search_recipe_online", "김치찌개 레시피", "재료: 김치")
+
+    assert cache.get("get_nutrition_info", "비빔밥 열량").answer == "560kcal"
+    cache._entries[AnswerCache.make_key("get_nutrition_info", "비빔밥 칼로리")].created_at -= 61  # TTL 경과
+    assert cache.get("get_nutrition_info", "비빔밥 열량") is None
+
+    assert cache.invalidate("search_recipe_online") == 1
+    assert cache.get("search_recipe_online", "김치찌개 레시피") is None
+
+    stats = cache.stats()
+    assert stats["size"] == 0
+    assert stats["tools"]["get_nutrition_info"]["hits"] == 1
+    assert stats["tools"]["get_nutrition_info"]["misses"] == 1
+    assert stats["tools"]["search_recipe_online"]["invalidated"] == 1
+
+
+class FakeGraph:
+    """thread별 상태만 들고 있는 그래프 대역 - invoke는 도구 하나 + 답변으로 턴을 끝냄"""
+
+    def __init__(self):
+        self.threads = {}
+        self.invocations = 0
+
+    def _values(self, config):
+        return self.threads.setdefault(config["configurable"]["thread_id"], {"messages": []})
+
+    def get_state(self, config):
+        return SimpleNamespace(values=self._values(config))
+
+    def update_state(self, config, values, as_node=None):
+        self._values(config)["messages"].extend(values["messages"])
+
+    def invoke(self, inputs, config):
+        self.invocations += 1
+        values = self._values(config)
+        turn = len([m for m in values["messages"] if isinstance(m, HumanMessage)])
+        call = {"name": "get_nutrition_info", "args": {"food_name": "비빔밥"}, "id": f"call_{turn}"}
+        values["messages"].extend(inputs["messages"] + [
+            AIMessage(content="", tool_calls=[call]),
+            ToolMessage(content="비빔밥 560kcal", tool_call_id=call["id"], name="get_nutrition_info"),
+            AIMessage(content=f"{config['configurable']['thread_id']} 답변 {turn}"),
+        ])
+        return values
+
+    async def aget_state(self, config):
+        return self.get_state(config)
+
+    async def aupdate_state(self, config, values, as_node=None):
+        self.update_state(config, values, as_node)
+
+    async def ainvoke(self, inputs, config):
+        return self.invoke(inputs, config)
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """같은 답변 캐시와 그래프를 공유하는 세션 핸들 생성기"""
+    graph, cache = FakeGraph(), AnswerCache()
+    monkeypatch.setattr(agent_module, "get_answer_cache", lambda: cache)
+    monkeypatch.setattr(agent_module.settings, "answer_cache_enabled", True)
+    monkeypatch.setattr(agent_module.settings, "fast_path_enabled", True)
+
+    def make(thread_id):
+        session = KoreanFoodAgent.__new__(KoreanFoodAgent)
+        session.agent = graph
+        session.thread_id = thread_id
+        return session
+
+    return graph, cache, make
+
+
+def test_answer_with_history_is_not_shared(sessions):
+    graph, cache, make = sessions
+    talking = make("talking")
+    graph.threads["talking"] = {"messages": [HumanMessage(content="나 채식주의자야"), AIMessage(content="알겠어요")]}
+
+    # 이전 대화가 있는 세션의 답변은 저장하지 않음
+    assert talking.chat("비빔밥 칼로리") == "talking 답변 1"
+    assert cache.stats()["size"] == 0
+
+    # 새 세션은 캐시를 쓰지 않고 직접 답변 → 히스토리 없는 답변이므로 저장
+    assert make("fresh").chat("비빔밥 칼로리") == "fresh 답변 0"
+    assert graph.invocations == 2
+    assert cache.stats()["size"] == 1
+
+    # 다른 새 세션은 캐시 적중 (그래프 실행 없이 히스토리에만 기록)
+    other = make("other")
+    assert other.chat("비빔밥 열량 알려줘") == "fresh 답변 0"
+    assert graph.invocations == 2
+    assert [type(m) for m in graph.threads["other"]["messages"]] == [HumanMessage, AIMessage]
+
+    # 이전 대화가 있는 세션은 캐시된 답변을 받지 않음
+    assert talking.chat("비빔밥 칼로리") == "talking 답변 2"
+    assert graph.invocations == 3
+
+
+def test_summary_counts_as_history(sessions):
+    graph, cache, make = sessions
+    graph.threads["folded"] = {"messages": [], "summary": "사용자는 저염식을 원함"}
+
+    make("folded").chat("비빔밥 칼로리")
+    assert cache.stats()["size"] == 0
+
+
+async def test_async_lookup_and_store_run_off_the_event_loop(sessions, monkeypatch):
+    graph, cache, make = sessions
+    loop_thread = threading.get_ident()
+    threads = []
+    for name in ("get", "put"):
+        original = getattr(cache, name)
+
+        def traced(*args, _original=original, **kwargs):
+            threads.append(threading.get_ident())
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(cache, name, traced)
+
+    assert await make("first").achat("비빔밥 칼로리") == "first 답변 0"
+    assert await make("second").achat("비빔밥 칼로리") == "first 답변 0"
+
+    assert len(threads) == 3  # 조회(miss) → 저장 → 조회(hit)
+    assert loop_thread not in threads
@@ -0,0 +1,44 @@
+"""메모리 체크포인터 thread별 크기 집계 테스트"""
+
+import operator
+from typing import Annotated, List, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from src.checkpoint import SizedMemorySaver, _stored_size
+
+
+class _State(TypedDict):
+    items: Annotated[List[str], operator.add]
+
+
+def _graph(saver):
+    graph = StateGraph(_State)
+    graph.add_node("echo", lambda state: {"items": ["x" * 500]})
+    graph.add_edge(START, "echo")
+    graph.add_edge("echo", END)
+    return graph.compile(checkpointer=saver)
+
+
+def _walk_size(saver: SizedMemorySaver, thread_id: str) -> int:
+    """공유 storage 전체를 순회한 크기 (집계 결과 검증용)"""
+    total = _stored_size(dict(saver.storage.get(thread_id, {})))
+    for store in (saver.blobs, saver.writes):
+        total += sum(_stored_size(v) for k, v in store.items() if k[0] == thread_id)
+    return total
+
+
+def test_thread_bytes_tracks_writes_per_thread():
+    saver = SizedMemorySaver()
+    app = _graph(saver)
+    for thread_id, turns in (("a", 3), ("b", 1)):
+        for _ in range(turns):
+            app.invoke({"items": ["질문"]}, {"configurable": {"thread_id": thread_id}})
+
+    assert saver.thread_bytes("a") == _walk_size(saver, "a")
+    assert saver.thread_bytes("b") == _walk_size(saver, "b")
+    assert saver.thread_bytes("a") > saver.thread_bytes("b") > 0
+
+    saver.delete_thread("a")
+    assert saver.thread_bytes("a") == 0
+    assert saver.thread_bytes("b") == _walk_size(saver, "b")
@@ -0,0 +1,36 @@
+"""URL 정규화 + 턴 단위 중복 요청 제거 테스트"""
+
+from src.runtime import RunContext
+from src.services import fetcher
+from src.services.fetcher import RawResponse, canonicalize_url, fetch_url
+
+
+def test_canonicalize_keeps_repeated_params():
+    assert canonicalize_url("https://example.com/p?b=2&a=2&a=1&utm_source=x") == \
+        "https://example.com/p?a=1&a=2&b=2"
+
+
+def test_canonicalize_naver_blog_mobile():
+    assert canonicalize_url("https://blog.naver.com/PostView.naver?blogId=cook&logNo=42&fbclid=z") == \
+        "https://m.blog.naver.com/cook/42"
+
+
+def test_fetch_once_per_url_and_decode_per_caller(monkeypatch):
+    ctx = RunContext()
+    calls = []
+
+    def fake_request(url, headers, timeout):
+        calls.append(headers.get("User-Agent"))
+        return RawResponse(url=url, status_code=200, content="김치찌개".encode("utf-8"), encoding="ISO-8859-1")
+
+    monkeypatch.setattr(fetcher, "get_run_context", lambda: ctx)
+    monkeypatch.setattr(fetcher, "_request", fake_request)
+
+    # 이미지 검색(모바일 UA, 인코딩 추정)과 레시피 크롤러(데스크톱 UA, utf-8)가 같은 글을 요청
+    mobile = fetch_url("https://blog.naver.com/cook/42", headers={"User-Agent": "mobile"})
+    desktop = fetch_url("https://m.blog.naver.com/cook/42?utm_source=x", headers={"User-Agent": "desktop"}, encoding="utf-8")
+
+    assert calls == ["mobile"]
+    assert mobile.text == "김치찌개".encode("utf-8").decode("ISO-8859-1")
+    assert desktop.text == "김치찌개"
+
@@ -0,0 +1,135 @@
+"""Playwright 크롤링 취소/시간 예산 테스트 (가짜 브라우저 사용)"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src import runtime
+from src.runtime import RunContext
+from src.services import kakao as kakao_module
+from src.services.kakao import KakaoLocalAPI
+
+
+class _FakeElement:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def evaluate_handle(self, script):
+        self.calls.append(time.monotonic())
+        await asyncio.sleep(0.02)
+        return self
+
+    async def inner_text(self):
+        return "김치찌개 9,000원"
+
+
+class _FakePage:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def query_selector(self, selector):
+        return None
+
+    async def query_selector_all(self, selector):
+        # 요소마다 await가 있어 다 돌면 약 4초
+        return [_FakeElement(self.calls) for _ in range(200)]
+
+    async def evaluate(self, script):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        await asyncio.sleep(ms / 10000)
+
+
+class _FakeBrowser:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def new_page(self):
+        return _FakePage(self.calls)
+
+    async def close(self):
+        pass
+
+
+class _FakePlaywright:
+    def __init__(self, calls):
+        self.chromium = self
+        self.calls = calls
+
+    async def launch(self, **kwargs):
+        return _FakeBrowser(self.calls)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    calls = []
+    state = {"ctx": None}
+    monkeypatch.setattr(kakao_module, "PLAYWRIGHT_AVAILABLE", True)
+    monkeypatch.setattr(kakao_module, "async_playwright", lambda: _FakePlaywright(calls), raising=False)
+    monkeypatch.setattr(kakao_module, "get_run_context", lambda: state["ctx"])
+    monkeypatch.setattr(runtime, "get_run_context", lambda: state["ctx"])
+    return calls, state
+
+
+def test_cancel_stops_menu_crawl(fake_browser):
+    calls, state = fake_browser
+    ctx = state["ctx"] = RunContext()
+    result = {}
+
+    worker = threading.Thread(
+        target=lambda: result.setdefault("menu", KakaoLocalAPI(api_key="x").get_menu_via_playwright("1"))
+    )
+    worker.start()
+    while not calls:
+        time.sleep(0.01)
+    ctx.cancel()
+    cancelled_at = time.monotonic()
+    worker.join(timeout=2)
+
+    assert not worker.is_alive()
+    assert result["menu"] == ""
+    # 취소 후에는 요소 순회가 멈춤 (진행 중이던 호출 하나까지만)
+    assert len([t for t in calls if t > cancelled_at]) <= 1
+
+
+def test_deadline_ends_review_crawl(fake_browser, monkeypatch):
+    calls, state = fake_browser
+    state["ctx"] = RunContext.with_budget(1.0)
+
+    async def slow_reviews():
+        # 요소마다 await하는 루프 - 예외를 삼켜도 CancelledError는 통과해야 함
+        for _ in range(200):
+            try:
+                calls.append(time.monotonic())
+                await asyncio.sleep(0.05)
+            except Exception:
+                continue
+        return "완료"
+
+    started = time.monotonic()
+    assert KakaoLocalAPI._run_browser_task(slow_reviews) == ""
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.5  # wait_for가 마감 시각에 반환
+    assert calls[-1] - started < 1.1
+
+
+def test_deadline_ends_menu_crawl(fake_browser):
+    calls, state = fake_browser
+    state["ctx"] = RunContext.with_budget(1.0)
+
+    started = time.monotonic()
+    assert KakaoLocalAPI(api_key="x").get_menu_via_playwright("1") == ""
+    assert time.monotonic() - started < 1.5
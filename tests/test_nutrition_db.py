@@ -0,0 +1,54 @@
+"""내장 영양 DB 매칭 테스트"""
+
+import pytest
+
+from src.services.nutrition_db import NutritionIndex, extract_food_name, get_nutrition_db
+from src.tools.nutrition import LOCAL_MIN_SCORE
+
+
+@pytest.fixture(scope="module")
+def db():
+    return get_nutrition_db()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("비빔밥 칼로리 알려줘", "비빔밥"),
+    ("김치찌개 1인분 칼로리", "김치찌개"),
+    ("김치찌게 열량", "김치찌개"),       # 오타
+    ("된장찌게 칼로리", "된장찌개"),
+    ("만두국 칼로리", "만둣국"),          # 사이시옷 차이
+])
+def test_confident_matches(db, query, expected):
+    match = db.lookup(query)
+    assert match.fact.name == expected
+    assert match.score >= LOCAL_MIN_SCORE
+
+
+@pytest.mark.parametrize("query, wrong", [
+    ("김치찜", "배추김치"),
+    ("김치국", "배추김치"),
+    ("치킨무", "후라이드치킨"),
+    ("짬뽕밥", "짬뽕"),
+    ("라면땅", "라면"),
+    ("만두국", "고기만두"),
+    ("떡국떡", "떡국"),
+])
+def test_containment_is_not_a_confident_match(db, query, wrong):
+    match = db.lookup(query)
+    assert match is None or match.fact.name != wrong or match.score < LOCAL_MIN_SCORE
+
+
+@pytest.mark.parametrize("query, head", [
+    ("엄마표 김치찌개", "김치찌개"),
+    ("전주비빔밥", "비빔밥"),
+    ("해물짬뽕", "짬뽕"),
+])
+def test_head_noun_containment_goes_to_web(db, query, head):
+    # 중심 명사가 같으면 후보로는 찾지만 웹 검색을 건너뛸 만큼 확신하지 않음
+    match = db.lookup(query)
+    assert match.matched == head
+    assert match.score <= NutritionIndex.CONTAINMENT_MAX_SCORE < LOCAL_MIN_SCORE
+
+
+def test_extract_food_name():
+    assert extract_food_name("비빔밥은 칼로리 얼마야?") == "비빔밥"
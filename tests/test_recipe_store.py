@@ -0,0 +1,86 @@
+"""구조화 레시피 저장소 테스트 - TTL/LRU 정리, 페이지 캐시 적중 시 별칭 연결, microdata 추출"""
+
+import json
+import time
+
+import pytest
+
+from src.services import page_cache as page_cache_module
+from src.services.fetcher import FetchResult
+from src.services.page_cache import PageCache
+from src.services.recipe_store import RecipeStore, StructuredRecipe
+from src.tools import recipe as recipe_tool
+
+
+def _recipe(url: str, name: str = "김치찌개") -> StructuredRecipe:
+    return StructuredRecipe(url=url, name=name, ingredients=["김치", "돼지고기"], steps=["끓인다"])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RecipeStore(path=str(tmp_path / "recipes.sqlite3"), max_entries=10, ttl_seconds=3600)
+
+
+def test_store_min_results_defaults_to_web_search_size():
+    assert recipe_tool.STORE_MIN_RESULTS == 3
+
+
+def test_evicts_least_recently_used(store):
+    for i in range(11):
+        store.put(_recipe(f"https://example.com/{i}", f"요리{i}"), query=f"요리{i} 레시피")
+    # 90%까지 줄이면서 가장 오래 안 쓴 레시피부터 삭제 (별칭도 함께)
+    assert store.get("https://example.com/0") is None
+    assert store.get("https://example.com/10") is not None
+    assert store.find("요리0 레시피") == []
+    assert store.stats()["evictions"] == 2
+
+
+def test_expired_recipes_are_not_served_and_pruned(store):
+    store.put(_recipe("https://example.com/old"), query="김치찌개")
+    conn = store._db.get()
+    stale = time.time() - 7200
+    conn.execute("UPDATE recipes SET created_at = ?, last_access = ?", (stale, stale))
+
+    assert store.find("김치찌개") == []
+    assert store.prune_expired() == 1
+    assert store.get("https://example.com/old") is None
+
+
+def test_page_cache_hit_records_alias(tmp_path, store, monkeypatch):
+    url = "https://www.example.com/recipe/1"
+    html = '<script type="application/ld+json">%s</script>' % json.dumps({
+        "@type": "Recipe", "name": "돼지고기 김치찌개",
+        "recipeIngredient": ["김치"], "recipeInstructions": ["끓인다"],
+    })
+    requests_made = []
+
+    def fake_fetch(url, **kwargs):
+        requests_made.append(url)
+        return FetchResult(url=url, status_code=200, text=html)
+
+    monkeypatch.setattr(page_cache_module, "fetch_url", fake_fetch)
+    monkeypatch.setattr(recipe_tool, "get_page_cache", lambda: PageCache(path=str(tmp_path / "pages.sqlite3")))
+    monkeypatch.setattr(recipe_tool, "get_recipe_store", lambda: store)
+
+    recipe_tool._crawl_recipe_fast(url, "김치찌개 끓이는 법")
+    recipe_tool._crawl_recipe_fast(url, "백종원 김치찌개")
+
+    assert len(requests_made) == 1  # 두 번째는 페이지 캐시 적중
+    assert [r.url for r in store.find("백종원 김치찌개")] == [url]
+
+
+def test_microdata_nested_elements():
+    page = (
+        '<DIV itemscope itemtype="https://schema.org/Recipe">'
+        '<h1 itemprop="name">된장찌개</h1>'
+        '<meta itemprop="recipeYield" content="2인분">'
+        '<ul><li itemprop="recipeIngredient">된장</li><li itemprop="recipeIngredient">두부</li></ul>'
+        '<div itemprop="recipeInstructions"><div>물을 끓인다</div><div>된장을 푼다</div></div>'
+        '</DIV>'
+    )
+    recipe = recipe_tool._from_microdata(page, "https://example.com/r")
+
+    assert recipe.name == "된장찌개"
+    assert recipe.servings == "2인분"
+    assert recipe.ingredients == ["된장", "두부"]
+    assert recipe.steps == ["물을 끓인다 된장을 푼다"]  # 안쪽 div에서 잘리지 않음
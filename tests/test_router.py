@@ -0,0 +1,77 @@
+"""턴 경로 라우터 테스트 (규칙 표)"""
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.router import ROUTE_AGENT, ROUTE_CHAT, ROUTE_TOOL, classify
+
+
+NUTRITION = "get_nutrition_info"
+RECIPE = "search_recipe_online"
+RESTAURANT = "search_restaurant_info"
+
+
+@pytest.mark.parametrize("message, kind, tool, query", [
+    # 도구 하나로 끝나는 질문
+    ("김치찌개 칼로리", ROUTE_TOOL, NUTRITION, "김치찌개 칼로리"),
+    ("비빔밥은 칼로리 얼마야?", ROUTE_TOOL, NUTRITION, "비빔밥은 칼로리"),
+    ("사과 칼로리", ROUTE_TOOL, NUTRITION, "사과 칼로리"),
+    ("또띠아 칼로리", ROUTE_TOOL, NUTRITION, "또띠아 칼로리"),
+    ("하이라이스 칼로리", ROUTE_TOOL, NUTRITION, "하이라이스 칼로리"),
+    ("된장찌개 끓이는 법", ROUTE_TOOL, RECIPE, "된장찌개 끓이는 법"),
+    ("강남역 맛집 추천해줘", ROUTE_TOOL, RESTAURANT, "강남역 맛집"),
+    # 앞의 인사는 검색어에서 제외
+    ("감사합니다 김치찌개 칼로리 알려줘", ROUTE_TOOL, NUTRITION, "김치찌개 칼로리"),
+    ("hello! 떡볶이 레시피", ROUTE_TOOL, RECIPE, "떡볶이 레시피"),
+    ("Thanks, 비빔밥 칼로리", ROUTE_TOOL, NUTRITION, "비빔밥 칼로리"),
+    # 잡담
+    ("안녕하세요", ROUTE_CHAT, None, None),
+    ("hi", ROUTE_CHAT, None, None),
+    ("고마워", ROUTE_CHAT, None, None),
+    # 영어 인사는 단어 단위로만 ("high"는 인사가 아님)
+    ("high protein 식단 짜줘", ROUTE_AGENT, None, None),
+    # 앞 대화를 이어받는 후속 질문
+    ("그럼 단백질은?", ROUTE_AGENT, None, None),
+    ("그리고 나트륨은?", ROUTE_AGENT, None, None),
+    ("또 맛집 추천해줘", ROUTE_AGENT, None, None),
+    ("칼로리는?", ROUTE_AGENT, None, None),
+    ("음식 칼로리 알려줘", ROUTE_AGENT, None, None),
+    # 음식 이름 없이 분량/때/끼니만 있는 질문
+    ("1인분 칼로리", ROUTE_AGENT, None, None),
+    ("오늘 점심 칼로리", ROUTE_AGENT, None, None),
+    ("한 그릇 칼로리 얼마야?", ROUTE_AGENT, None, None),
+    ("한그릇 열량", ROUTE_AGENT, None, None),
+    ("100g 칼로리", ROUTE_AGENT, None, None),
+    ("어제 먹은 거 칼로리", ROUTE_AGENT, None, None),
+    ("근처 맛집 추천해줘", ROUTE_AGENT, None, None),
+    # 분량이 붙어도 음식 이름이 있으면 도구로
+    ("삼겹살 1인분 칼로리", ROUTE_TOOL, NUTRITION, "삼겹살 1인분 칼로리"),
+    ("두부 칼로리", ROUTE_TOOL, NUTRITION, "두부 칼로리"),
+    ("한우 칼로리", ROUTE_TOOL, NUTRITION, "한우 칼로리"),
+    ("반찬 레시피", ROUTE_TOOL, RECIPE, "반찬 레시피"),
+    ("그 식당 후기", ROUTE_AGENT, None, None),
+    # 대상 여러 개 / 비교
+    ("김치찌개랑 된장찌개 칼로리", ROUTE_AGENT, None, None),
+    ("비빔밥과 김치 칼로리", ROUTE_AGENT, None, None),
+    ("피자와 치킨 칼로리", ROUTE_AGENT, None, None),
+    ("라면하고 김밥 칼로리", ROUTE_AGENT, None, None),
+    ("김치찌개, 된장찌개 칼로리", ROUTE_AGENT, None, None),
+    ("떡볶이보다 칼로리 낮은 메뉴", ROUTE_AGENT, None, None),
+    ("단백질 많은 음식", ROUTE_AGENT, None, None),
+    # 여러 의도 / 긴 메시지 / 이미지
+    ("김치찌개 레시피랑 칼로리", ROUTE_AGENT, None, None),
+    ("점심으로 김치찌개를 먹었는데 저녁에는 뭘 먹으면 좋을지 칼로리 기준으로 알려줘", ROUTE_AGENT, None, None),
+])
+def test_classify(message, kind, tool, query):
+    route = classify(HumanMessage(content=message))
+    assert (route.kind, route.tool) == (kind, tool), route.reason
+    if query is not None:
+        assert route.args["query"] == query
+
+
+def test_image_message_goes_to_agent():
+    message = HumanMessage(content=[
+        {"type": "text", "text": "이거 칼로리"},
+        {"type": "image_url", "image_url": {"url": "data:image/jpeg;base64,AAAA"}},
+    ])
+    assert classify(message).kind == ROUTE_AGENT
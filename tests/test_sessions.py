@@ -0,0 +1,51 @@
+"""세션 관리 테스트 - 축출한 세션은 락을 푼 뒤 정리"""
+
+from api.sessions import SessionManager
+
+
+class FakeAgent:
+    def __init__(self, manager_ref, size=0):
+        self.manager_ref = manager_ref
+        self.size = size
+        self.closed_with_lock = None
+
+    def close(self, forget=False):
+        self.closed_with_lock = self.manager_ref[0]._lock.locked()
+
+    def estimate_memory_bytes(self):
+        return self.size
+
+
+def _manager(**limits):
+    ref, agents = [], {}
+
+    def factory(session_id):
+        agents[session_id] = FakeAgent(ref, size=100)
+        return agents[session_id]
+
+    manager = SessionManager(factory, **limits)
+    ref.append(manager)
+    return manager, agents
+
+
+def test_capacity_eviction_closes_outside_lock():
+    manager, agents = _manager(max_sessions=1)
+    manager.acquire("a")
+    manager.release("a")
+    manager.acquire("b")
+
+    assert "a" not in manager
+    assert agents["a"].closed_with_lock is False
+    assert manager.stats()["evictions"]["capacity"] == 1
+
+
+def test_memory_eviction_closes_outside_lock():
+    manager, agents = _manager(max_total_bytes=150)
+    manager.acquire("a")
+    manager.release("a")
+    manager.acquire("b")
+    manager.release("b")
+
+    assert "a" not in manager and "b" in manager
+    assert agents["a"].closed_with_lock is False
+    assert manager.stats()["evictions"]["memory"] == 1
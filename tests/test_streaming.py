@@ -0,0 +1,60 @@
+"""SSE 텍스트 병합 + 미디어 태그 파서 테스트"""
+
+import json
+
+from api.streaming import MediaTagParser, TextCoalescer, coalesce_text, sse_event
+
+
+def _decode(frames):
+    return [json.loads(frame[len(b"data: "):].decode("utf-8")) for frame in frames]
+
+
+def test_size_flush_before_tag_keeps_text():
+    # 64자를 넘는 청크가 [MAP:] 태그로 끝나면 add()가 만든 프레임을 잃지 않아야 함
+    coalescer, tags = TextCoalescer(max_chars=64), MediaTagParser()
+    text = "가" * 70
+    events = _decode(coalesce_text(coalescer, tags, text + "[MAP:37.5,127.0,식당]"))
+
+    assert events == [
+        {"type": "text", "content": text},
+        {"type": "map", "map_url": "37.5,127.0,식당"},
+    ]
+    assert not coalescer.pending
+
+
+def test_buffered_text_flushes_before_tag_event():
+    coalescer, tags = TextCoalescer(max_chars=64), MediaTagParser()
+    assert coalesce_text(coalescer, tags, "맛집은 ") == []
+    events = _decode(coalesce_text(coalescer, tags, "여기예요 [IMAGE:https://img.example.com/a.jpg] 끝"))
+
+    # 태그가 닫힌 청크의 텍스트는 모두 이벤트보다 먼저 전송
+    assert events == [
+        {"type": "text", "content": "맛집은 여기예요  끝"},
+        {"type": "image", "url": "https://img.example.com/a.jpg"},
+    ]
+    assert not coalescer.pending
+
+
+def test_tag_split_across_chunks():
+    tags = MediaTagParser()
+    assert tags.feed("지도 [MA") == ("지도 ", [])
+    assert tags.feed("P:1,2,가게") == ("", [])
+    assert tags.feed("] 입니다") == (" 입니다", [{"type": "map", "map_url": "1,2,가게"}])
+
+
+def test_non_tag_brackets_pass_through():
+    tags = MediaTagParser()
+    assert tags.feed("[참고] 내용 [IMAGE:local.png]") == ("[참고] 내용 [IMAGE:local.png]", [])
+    assert tags.flush() == ""
+
+
+def test_only_first_map_is_emitted():
+    tags = MediaTagParser()
+    _, first = tags.feed("[MAP:1,2,a]")
+    _, second = tags.feed("[MAP:3,4,b]")
+    assert first == [{"type": "map", "map_url": "1,2,a"}] and second == []
+
+
+def test_sse_event_keeps_utf8():
+    assert sse_event({"type": "text", "content": "김치"}) == \
+        'data: {"type": "text", "content": "김치"}\n\n'.encode("utf-8")
@@ -0,0 +1,73 @@
+"""요약 서버 풀 테스트 - 첫 헬스 체크 대기, 헬스 체크와 요청 실패 표시의 경합"""
+
+import time
+import threading
+from types import SimpleNamespace
+
+from src.services import summarizer as summarizer_module
+from src.services.summarizer import EndpointPool
+
+
+class FakeEndpoint(summarizer_module.SummarizerEndpoint):
+    """models.list()가 gate가 열릴 때까지 멈추는 엔드포인트"""
+
+    def __init__(self, base_url, api_key, request_timeout):
+        self.base_url = base_url
+        self.healthy = False
+        self.in_flight = 0
+        self.failures = 0
+        self.last_error = ""
+        self.gate = threading.Event()
+        self.probing = threading.Event()
+        models = SimpleNamespace(list=self._list)
+        self.client = SimpleNamespace(with_options=lambda **kwargs: SimpleNamespace(models=models))
+
+    def _list(self):
+        self.probing.set()
+        assert self.gate.wait(5)
+
+
+def _pool(monkeypatch):
+    monkeypatch.setattr(summarizer_module, "SummarizerEndpoint", FakeEndpoint)
+    return EndpointPool(["http://vllm-a/v1"], "key", health_interval=0)
+
+
+def test_concurrent_start_waits_for_first_probe(monkeypatch):
+    pool = _pool(monkeypatch)
+    first = threading.Thread(target=pool.start)
+    first.start()
+    while not pool.endpoints:
+        time.sleep(0.001)
+    endpoint = pool.endpoints[0]
+    assert endpoint.probing.wait(5)
+
+    seen = []
+    waiter = threading.Thread(target=lambda: seen.append(pool.start() and pool.any_healthy()))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()  # 첫 헬스 체크가 끝날 때까지 대기
+
+    endpoint.gate.set()
+    first.join(5)
+    waiter.join(5)
+    assert seen == [True]
+
+
+def test_probe_does_not_undo_mark_failed(monkeypatch):
+    pool = _pool(monkeypatch)
+    endpoint = FakeEndpoint("http://vllm-a/v1", "key", 1.0)
+    pool.endpoints = [endpoint]
+
+    result = []
+    probe = threading.Thread(target=lambda: result.append(pool.probe(endpoint)))
+    probe.start()
+    assert endpoint.probing.wait(5)
+    pool.mark_failed(endpoint, RuntimeError("timeout"))  # 헬스 체크 도중 요청 실패
+    endpoint.gate.set()
+    probe.join(5)
+
+    assert result == [False]
+    assert not endpoint.healthy and endpoint.last_error == "timeout"
+
+    assert pool.probe(endpoint)  # 다음 체크에서 복구
+    assert endpoint.healthy
@@ -0,0 +1,78 @@
+"""도구 출력 토큰 예산 테스트 - fit_sections 우선순위/필수 섹션 보존, 턴 예산"""
+
+import pytest
+
+from src import tool_budget
+from src.config import settings
+from src.runtime import RunContext
+from src.tokens import TRUNCATION_MARKER, estimate_tokens, fit_sections
+from src.tool_budget import PRIORITY_DETAIL, PRIORITY_ESSENTIAL, PRIORITY_SUMMARY, fit_tool_output
+
+
+IMAGE_BLOCK = "[검색 결과 이미지]\n" + "\n".join(
+    f"[IMAGE:https://img.example.com/{i}/bibimbap.jpg]" for i in range(5)
+)
+
+
+def test_everything_fits():
+    sections = [(PRIORITY_ESSENTIAL, "제목"), (PRIORITY_DETAIL, "본문")]
+    assert fit_sections(sections, 100) == "제목\n본문"
+
+
+def test_detail_truncated_before_summary():
+    sections = [
+        (PRIORITY_ESSENTIAL, "[검색: 김치찌개]"),
+        (PRIORITY_DETAIL, "가" * 500),
+        (PRIORITY_SUMMARY, "나" * 50),
+    ]
+    text = fit_sections(sections, 200)
+    assert text.startswith("[검색: 김치찌개]\n가")
+    assert text.endswith("나" * 50)
+    assert TRUNCATION_MARKER in text
+    assert estimate_tokens(text) <= 200
+
+
+def test_same_priority_shares_budget():
+    sections = [(PRIORITY_DETAIL, "가" * 400), (PRIORITY_DETAIL, "나" * 400)]
+    first, second = fit_sections(sections, 300).split(TRUNCATION_MARKER)[:2]
+    assert abs(first.count("가") - second.count("나")) < 10
+
+
+def test_essential_never_truncated_inside_tag():
+    sections = [
+        (PRIORITY_SUMMARY, "블로그 요약 " * 40),
+        (PRIORITY_ESSENTIAL, IMAGE_BLOCK),
+    ]
+    text = fit_sections(sections, 30)
+    assert text == IMAGE_BLOCK  # 예산이 모자라면 낮은 우선순위부터 빠짐
+
+
+def test_zero_budget_keeps_only_essentials():
+    sections = [(PRIORITY_ESSENTIAL, "[1] 진미식당\n   🗺️ 지도: https://place.map.kakao.com/123"),
+                (PRIORITY_DETAIL, "메뉴판 " * 100)]
+    assert fit_sections(sections, 0) == sections[0][1]
+
+
+@pytest.fixture
+def run_context(monkeypatch):
+    ctx = RunContext()
+    monkeypatch.setattr(tool_budget, "get_run_context", lambda: ctx)
+    monkeypatch.setattr(settings, "turn_tool_token_budget", 300)
+    monkeypatch.setattr(settings, "tool_token_budget_default", 1200)
+    monkeypatch.setattr(settings, "tool_token_budgets", {})
+    return ctx
+
+
+def test_turn_budget_is_a_bound_and_overrun_is_reported(run_context):
+    fit_tool_output("search_recipe_online", [(PRIORITY_DETAIL, "가" * 1000)])
+    assert run_context.tool_tokens <= 300
+
+    # 턴 예산을 다 쓴 뒤에는 필수 섹션만 (자르지 않고) 남기고 초과분 기록
+    text = fit_tool_output("search_food_by_image", [
+        (PRIORITY_ESSENTIAL, IMAGE_BLOCK),
+        (PRIORITY_DETAIL, "블로그 본문 " * 100),
+    ])
+    assert text == IMAGE_BLOCK
+    first, second = run_context.tool_outputs
+    assert second["budget_tokens"] == 300 - first["final_tokens"]
+    assert second["overrun_tokens"] == estimate_tokens(IMAGE_BLOCK) - second["budget_tokens"] > 0